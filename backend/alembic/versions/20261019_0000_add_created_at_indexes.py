@@ -0,0 +1,35 @@
+"""Add created_at indexes to users and transactions
+
+Revision ID: add_created_at_indexes
+Revises: add_paid_by
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_created_at_indexes'
+down_revision: Union[str, None] = 'add_paid_by'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_created_at', 'users', ['created_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_transactions_created_at', 'transactions', ['created_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_transactions_created_at', table_name='transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_created_at', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,50 @@
+"""Add trigram search and keyset pagination indexes for the admin listings
+
+Revision ID: add_admin_search_indexes
+Revises: add_created_at_indexes
+Create Date: 2026-10-19 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_admin_search_indexes'
+down_revision: Union[str, None] = 'add_created_at_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_trgm', 'users', ['email'],
+            postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_users_name_trgm', 'users', ['name'],
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_couples_created_at', 'couples', ['created_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_transactions_user_id_created_at', 'transactions', ['user_id', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_transactions_user_id_created_at', table_name='transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_couples_created_at', table_name='couples', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_name_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_email_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
+    # pg_trgm is left installed; other objects may depend on it
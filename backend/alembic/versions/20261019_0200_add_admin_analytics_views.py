@@ -0,0 +1,89 @@
+"""Add materialized views for the admin growth and engagement analytics
+
+Revision ID: add_admin_analytics_views
+Revises: add_admin_search_indexes
+Create Date: 2026-10-19 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_admin_analytics_views'
+down_revision: Union[str, None] = 'add_admin_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Created empty so the migration does not scan the tables; the first
+    # scheduled refresh populates them (see app/utils/admin_analytics.py).
+    # Days are UTC, like the admin statistics.
+
+    # One row per day since the first signup, including days without activity.
+    # Active users are the users who recorded a transaction that day.
+    op.execute("""
+        CREATE MATERIALIZED VIEW admin_daily_metrics AS
+        WITH signups AS (
+            SELECT (created_at AT TIME ZONE 'UTC')::date AS day, count(*) AS signups
+            FROM users GROUP BY 1
+        ), couples_formed AS (
+            SELECT (created_at AT TIME ZONE 'UTC')::date AS day, count(*) AS couples_formed
+            FROM couples GROUP BY 1
+        ), activity AS (
+            SELECT (created_at AT TIME ZONE 'UTC')::date AS day,
+                   count(*) AS transactions,
+                   count(DISTINCT user_id) AS active_users
+            FROM transactions GROUP BY 1
+        ), days AS (
+            SELECT generate_series(
+                (SELECT min(day) FROM signups),
+                (now() AT TIME ZONE 'UTC')::date,
+                interval '1 day'
+            )::date AS day
+        )
+        SELECT
+            d.day,
+            coalesce(s.signups, 0) AS signups,
+            coalesce(c.couples_formed, 0) AS couples_formed,
+            coalesce(a.transactions, 0) AS transactions,
+            coalesce(a.active_users, 0) AS active_users
+        FROM days d
+        LEFT JOIN signups s USING (day)
+        LEFT JOIN couples_formed c USING (day)
+        LEFT JOIN activity a USING (day)
+        WITH NO DATA
+    """)
+
+    # Users of each signup month (cohort) active n months later
+    op.execute("""
+        CREATE MATERIALIZED VIEW admin_retention_cohorts AS
+        WITH cohorts AS (
+            SELECT id AS user_id, date_trunc('month', created_at AT TIME ZONE 'UTC')::date AS cohort
+            FROM users
+        ), activity AS (
+            SELECT DISTINCT user_id, date_trunc('month', created_at AT TIME ZONE 'UTC')::date AS month
+            FROM transactions
+        )
+        SELECT
+            c.cohort,
+            ((extract(year FROM a.month) - extract(year FROM c.cohort)) * 12
+                + extract(month FROM a.month) - extract(month FROM c.cohort))::int AS month_offset,
+            count(*) AS active_users
+        FROM cohorts c
+        JOIN activity a ON a.user_id = c.user_id AND a.month >= c.cohort
+        GROUP BY 1, 2
+        WITH NO DATA
+    """)
+
+    # REFRESH ... CONCURRENTLY needs a unique index
+    op.create_index('ux_admin_daily_metrics_day', 'admin_daily_metrics', ['day'], unique=True)
+    op.create_index(
+        'ux_admin_retention_cohorts_cohort_offset', 'admin_retention_cohorts', ['cohort', 'month_offset'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS admin_retention_cohorts')
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS admin_daily_metrics')
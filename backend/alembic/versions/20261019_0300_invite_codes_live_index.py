@@ -0,0 +1,47 @@
+"""Make invite codes unique among live codes only and index their expiry
+
+Revision ID: invite_codes_live_index
+Revises: add_admin_analytics_views
+Create Date: 2026-10-19 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'invite_codes_live_index'
+down_revision: Union[str, None] = 'add_admin_analytics_views'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_invite_codes_live_code', 'invite_codes', ['code'], unique=True,
+            postgresql_where=sa.text('NOT used'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_invite_codes_expires_at', 'invite_codes', ['expires_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_invite_codes_code', table_name='invite_codes', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    # Used codes may share a code with a later one; keep the most recent
+    op.execute("""
+        DELETE FROM invite_codes a USING invite_codes b
+        WHERE a.code = b.code AND a.created_at < b.created_at
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_invite_codes_code', 'invite_codes', ['code'], unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_invite_codes_expires_at', table_name='invite_codes', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ux_invite_codes_live_code', table_name='invite_codes', postgresql_concurrently=True, if_exists=True)
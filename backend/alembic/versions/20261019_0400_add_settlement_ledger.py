@@ -0,0 +1,53 @@
+"""Add settlement ledger of split expenses per couple member and month
+
+Revision ID: add_settlement_ledger
+Revises: invite_codes_live_index
+Create Date: 2026-10-19 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_settlement_ledger'
+down_revision: Union[str, None] = 'invite_codes_live_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'settlement_ledger',
+        sa.Column('couple_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('my_paid', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('partner_paid', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['couple_id'], ['couples.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('couple_id', 'user_id', 'month')
+    )
+
+    # Backfill from the existing split expenses
+    op.execute("""
+        INSERT INTO settlement_ledger (couple_id, user_id, month, my_paid, partner_paid)
+        SELECT
+            couple_id,
+            user_id,
+            date_trunc('month', date::timestamp)::date,
+            coalesce(sum(paid) FILTER (WHERE paid_by_user_id = user_id), 0),
+            coalesce(sum(paid) FILTER (WHERE paid_by_user_id <> user_id), 0)
+        FROM (
+            SELECT couple_id, user_id, date, paid_by_user_id,
+                   coalesce(nullif(original_amount, 0), amount * 2) AS paid
+            FROM transactions
+            WHERE couple_id IS NOT NULL AND is_split AND type = 'expense' AND paid_by_user_id IS NOT NULL
+        ) AS split
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('settlement_ledger')
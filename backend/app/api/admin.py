@@ -1,16 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
-from datetime import datetime
+from typing import Literal, Optional, List
+from datetime import date, datetime, timedelta, timezone
 import uuid
 
 from app.database import get_db
 from app.models.user import User
 from app.models.couple import Couple
 from app.models.transaction import Transaction
-from app.core.dependencies import get_admin_user
+from app.core.dependencies import get_admin_user, invalidate_user_cache, user_cache_stats
+from app.core.admission import admission_stats
+from app.core.replicas import get_read_db
+from app.core.security import revoke_user_tokens, token_cache_stats
+from app.core import scheduler
+from app.utils import admin_analytics, admin_stats
+from app.utils.pagination import escape_like, estimated_total, keyset_page
 
 router = APIRouter()
 
@@ -46,8 +52,10 @@ class UserListResponse(BaseModel):
     """Paginated user list response"""
     users: List[AdminUserResponse]
     total: int
+    total_estimated: bool = False  # Planner estimate, or a lower bound for large filtered results
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class CoupleResponse(BaseModel):
@@ -64,8 +72,10 @@ class CoupleListResponse(BaseModel):
     """Paginated couple list response"""
     couples: List[CoupleResponse]
     total: int
+    total_estimated: bool = False  # Planner estimate, or a lower bound for large filtered results
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class TransactionResponse(BaseModel):
@@ -85,8 +95,10 @@ class TransactionListResponse(BaseModel):
     """Paginated transaction list response"""
     transactions: List[TransactionResponse]
     total: int
+    total_estimated: bool = False  # Planner estimate, or a lower bound for large filtered results
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class AdminStats(BaseModel):
@@ -96,54 +108,146 @@ class AdminStats(BaseModel):
     total_transactions: int
     users_this_month: int
     transactions_this_month: int
-    total_income: float
-    total_expense: float
+    total_income: Optional[float]
+    total_expense: Optional[float]
+    estimated: bool = False  # Totals are planner estimates and sums are not known yet
+    refreshed_at: Optional[datetime] = None
+
+
+class AnalyticsPoint(BaseModel):
+    """One bucket of an analytics series"""
+    period: date  # First day of the bucket
+    value: float
+    rate: Optional[float] = None  # Couples only: share of users in a couple at the end of the bucket
+
+
+class AnalyticsSeries(BaseModel):
+    """Time-bucketed analytics series"""
+    metric: str
+    bucket: str
+    start_date: date
+    end_date: date
+    points: List[AnalyticsPoint]
+    refreshed_at: Optional[datetime] = None
+
+
+class RetentionCohort(BaseModel):
+    """Users who signed up in one month"""
+    cohort: date
+    size: int
+    retention: List[float]  # Share of the cohort active 0, 1, 2, ... months after signing up
+
+
+class RetentionResponse(BaseModel):
+    """Monthly retention cohorts"""
+    start_date: date
+    end_date: date
+    cohorts: List[RetentionCohort]
+    refreshed_at: Optional[datetime] = None
 
 
 # ==================== Stats Endpoint ====================
 
 @router.get("/stats", response_model=AdminStats)
 async def get_admin_stats(
+    admin: User = Depends(get_admin_user)
+):
+    """Get admin dashboard statistics, as last computed by the periodic refresh"""
+    stats = await admin_stats.get_cached_stats()
+    if stats is None:
+        # Not computed yet (fresh deploy, Redis flushed): answer from catalog
+        # estimates now and compute the exact figures in the background
+        scheduler.trigger(admin_stats.JOB_NAME)
+        stats = await run_in_threadpool(admin_stats.estimate_stats)
+    return AdminStats(**stats)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    admin: User = Depends(get_admin_user)
+):
+    """Get cache hit ratios for the worker serving this request"""
+    return {
+        "user_cache": user_cache_stats(),
+        "token_cache": token_cache_stats(),
+    }
+
+
+@router.get("/admission/stats")
+async def get_admission_stats(
+    admin: User = Depends(get_admin_user)
+):
+    """Get queue depth and shed counts per priority class for the worker serving this request"""
+    return admission_stats()
+
+
+# ==================== Analytics ====================
+
+def _date_range(start_date: Optional[date], end_date: Optional[date], default_days: int):
+    end_date = end_date or datetime.now(timezone.utc).date()
+    start_date = start_date or end_date - timedelta(days=default_days - 1)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date"
+        )
+    return start_date, end_date
+
+
+def _not_ready() -> HTTPException:
+    # Fresh deploy: the views exist but have never been refreshed
+    scheduler.trigger(admin_analytics.JOB_NAME)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Analytics are being prepared, try again later",
+        headers={"Retry-After": "60"}
+    )
+
+
+@router.get("/analytics/retention", response_model=RetentionResponse)
+async def get_retention(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    months: int = Query(12, ge=0, le=36),
     admin: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get admin dashboard statistics"""
-
-    # Get current month start
-    now = datetime.now()
-    month_start = datetime(now.year, now.month, 1)
-
-    # Total counts
-    total_users = db.query(func.count(User.id)).scalar()
-    total_couples = db.query(func.count(Couple.id)).scalar()
-    total_transactions = db.query(func.count(Transaction.id)).scalar()
-
-    # This month counts
-    users_this_month = db.query(func.count(User.id)).filter(
-        User.created_at >= month_start
-    ).scalar()
-
-    transactions_this_month = db.query(func.count(Transaction.id)).filter(
-        Transaction.created_at >= month_start
-    ).scalar()
-
-    # Total amounts
-    total_income = db.query(func.coalesce(func.sum(Transaction.amount), 0)).filter(
-        Transaction.type == "income"
-    ).scalar()
-
-    total_expense = db.query(func.coalesce(func.sum(Transaction.amount), 0)).filter(
-        Transaction.type == "expense"
-    ).scalar()
-
-    return AdminStats(
-        total_users=total_users,
-        total_couples=total_couples,
-        total_transactions=total_transactions,
-        users_this_month=users_this_month,
-        transactions_this_month=transactions_this_month,
-        total_income=float(total_income),
-        total_expense=float(total_expense)
+    """Get monthly signup cohorts and their retention, from the analytics views"""
+    start_date, end_date = _date_range(start_date, end_date, default_days=365)
+    try:
+        cohorts = admin_analytics.retention(db, start_date, end_date, months)
+    except admin_analytics.AnalyticsNotReady:
+        raise _not_ready()
+    return RetentionResponse(
+        start_date=start_date,
+        end_date=end_date,
+        cohorts=cohorts,
+        refreshed_at=await admin_analytics.get_refreshed_at()
+    )
+
+
+@router.get("/analytics/{metric}", response_model=AnalyticsSeries)
+async def get_analytics_series(
+    metric: Literal["signups", "active-users", "transactions", "couples"],
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get daily signups, active users, transactions or couples formed, from the analytics views"""
+    start_date, end_date = _date_range(start_date, end_date, default_days=30)
+    try:
+        points = admin_analytics.series(db, metric, bucket, start_date, end_date)
+    except admin_analytics.AnalyticsNotReady:
+        raise _not_ready()
+    return AnalyticsSeries(
+        metric=metric,
+        bucket=bucket,
+        start_date=start_date,
+        end_date=end_date,
+        points=points,
+        refreshed_at=await admin_analytics.get_refreshed_at()
     )
 
 
@@ -153,29 +257,33 @@ async def get_admin_stats(
 async def list_users(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
     admin: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List all users with pagination and search"""
 
     query = db.query(User)
 
     if search:
-        search_filter = f"%{search}%"
+        # Served by the pg_trgm indexes on email and name; backslash is the default LIKE escape
+        search_filter = f"%{escape_like(search)}%"
         query = query.filter(
             (User.email.ilike(search_filter)) |
             (User.name.ilike(search_filter))
         )
 
-    total = query.count()
-    users = query.order_by(User.created_at.desc()).offset(offset).limit(limit).all()
+    total, total_estimated = estimated_total(db, query, "users", filtered=bool(search))
+    users, next_cursor = keyset_page(query, User, limit, cursor, offset)
 
     return UserListResponse(
         users=[AdminUserResponse.model_validate(u) for u in users],
         total=total,
+        total_estimated=total_estimated,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
 
 
@@ -183,7 +291,7 @@ async def list_users(
 async def get_user(
     user_id: uuid.UUID,
     admin: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get specific user by ID"""
 
@@ -236,6 +344,7 @@ async def update_user(
 
     db.commit()
     db.refresh(user)
+    await invalidate_user_cache(str(user.id))
 
     return AdminUserResponse.model_validate(user)
 
@@ -264,6 +373,8 @@ async def delete_user(
 
     db.delete(user)
     db.commit()
+    await invalidate_user_cache(str(user_id))
+    await revoke_user_tokens(str(user_id))
 
     return {"message": "User deleted successfully"}
 
@@ -274,13 +385,17 @@ async def delete_user(
 async def list_couples(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     admin: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List all couples with pagination"""
 
-    total = db.query(func.count(Couple.id)).scalar()
-    couples = db.query(Couple).order_by(Couple.created_at.desc()).offset(offset).limit(limit).all()
+    query = db.query(Couple)
+    total, total_estimated = estimated_total(db, query, "couples", filtered=False)
+    # Both partners come back in the same query instead of two lookups per row
+    query = query.options(joinedload(Couple.user1), joinedload(Couple.user2))
+    couples, next_cursor = keyset_page(query, Couple, limit, cursor, offset)
 
     couple_responses = []
     for couple in couples:
@@ -296,8 +411,10 @@ async def list_couples(
     return CoupleListResponse(
         couples=couple_responses,
         total=total,
+        total_estimated=total_estimated,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
 
 
@@ -307,14 +424,15 @@ async def list_couples(
 async def list_all_transactions(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     user_id: Optional[uuid.UUID] = None,
     type: Optional[str] = None,
     admin: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List all transactions with pagination and filters"""
 
-    query = db.query(Transaction).join(User)
+    query = db.query(Transaction).join(Transaction.user)
 
     if user_id:
         query = query.filter(Transaction.user_id == user_id)
@@ -322,8 +440,10 @@ async def list_all_transactions(
     if type:
         query = query.filter(Transaction.type == type)
 
-    total = query.count()
-    transactions = query.order_by(Transaction.created_at.desc()).offset(offset).limit(limit).all()
+    total, total_estimated = estimated_total(db, query, "transactions", filtered=bool(user_id or type))
+    # The user is already joined for the filter; load it from the same rows
+    query = query.options(contains_eager(Transaction.user))
+    transactions, next_cursor = keyset_page(query, Transaction, limit, cursor, offset)
 
     transaction_responses = []
     for t in transactions:
@@ -342,6 +462,8 @@ async def list_all_transactions(
     return TransactionListResponse(
         transactions=transaction_responses,
         total=total,
+        total_estimated=total_estimated,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
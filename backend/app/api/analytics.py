@@ -6,7 +6,6 @@ from datetime import date, datetime
 from decimal import Decimal
 from collections import defaultdict
 
-from app.database import get_db
 from app.models.user import User
 from app.models.couple import Couple
 from app.models.transaction import Transaction
@@ -23,6 +22,8 @@ from app.schemas.analytics import (
 )
 from app.schemas.transaction import TransactionSummary
 from app.core.dependencies import get_current_user
+from app.core.replicas import get_read_db
+from app.core.etag import conditional_get
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -62,13 +63,13 @@ def get_transactions_query(db: Session, user: User, scope: str):
     return query
 
 
-@router.get("/category-analysis", response_model=CategoryAnalysis)
+@router.get("/category-analysis", response_model=CategoryAnalysis, dependencies=[Depends(conditional_get)])
 async def get_category_analysis(
     start_date: date,
     end_date: date,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get category-wise analysis of transactions"""
 
@@ -134,12 +135,12 @@ async def get_category_analysis(
     )
 
 
-@router.get("/monthly-trends", response_model=List[MonthlyTrend])
+@router.get("/monthly-trends", response_model=List[MonthlyTrend], dependencies=[Depends(conditional_get)])
 async def get_monthly_trends(
     year: int,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get monthly trends for a year"""
 
@@ -183,13 +184,13 @@ async def get_monthly_trends(
     return trends
 
 
-@router.get("/yearly-trends", response_model=List[YearlyTrend])
+@router.get("/yearly-trends", response_model=List[YearlyTrend], dependencies=[Depends(conditional_get)])
 async def get_yearly_trends(
     start_year: int,
     end_year: int,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get yearly trends across multiple years"""
 
@@ -217,13 +218,13 @@ async def get_yearly_trends(
     return trends
 
 
-@router.get("/report/monthly", response_model=ReportData)
+@router.get("/report/monthly", response_model=ReportData, dependencies=[Depends(conditional_get)])
 async def get_monthly_report(
     year: int,
     month: int,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get comprehensive monthly report"""
 
@@ -333,10 +334,10 @@ async def get_monthly_report(
     )
 
 
-@router.get("/savings", response_model=SavingsData)
+@router.get("/savings", response_model=SavingsData, dependencies=[Depends(conditional_get)])
 async def get_savings(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get cumulative savings/balance for personal and couple"""
 
@@ -429,12 +430,12 @@ async def get_savings(
     )
 
 
-@router.get("/report/yearly", response_model=ReportData)
+@router.get("/report/yearly", response_model=ReportData, dependencies=[Depends(conditional_get)])
 async def get_yearly_report(
     year: int,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get comprehensive yearly report"""
 
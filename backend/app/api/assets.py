@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
@@ -11,6 +11,8 @@ from app.database import get_db
 from app.models.user import User
 from app.models.asset import Asset
 from app.core.dependencies import get_current_user
+from app.core.etag import conditional_get
+from app.core.serialization import model_response
 
 router = APIRouter()
 
@@ -62,6 +64,9 @@ class AssetTypesResponse(BaseModel):
     types: List[dict]
 
 
+ASSET_LIST_ADAPTER = TypeAdapter(List[AssetResponse])
+
+
 # ==================== API Endpoints ====================
 
 @router.get("/types", response_model=AssetTypesResponse)
@@ -113,8 +118,9 @@ async def create_asset(
     )
 
 
-@router.get("/", response_model=List[AssetResponse])
+@router.get("/", response_model=List[AssetResponse], dependencies=[Depends(conditional_get)])
 async def get_assets(
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -124,7 +130,7 @@ async def get_assets(
         Asset.user_id == current_user.id
     ).order_by(Asset.created_at.desc()).all()
 
-    return [
+    return model_response(ASSET_LIST_ADAPTER, [
         AssetResponse(
             id=asset.id,
             name=asset.name,
@@ -136,10 +142,10 @@ async def get_assets(
             updated_at=asset.updated_at
         )
         for asset in assets
-    ]
+    ], response)
 
 
-@router.get("/{asset_id}", response_model=AssetResponse)
+@router.get("/{asset_id}", response_model=AssetResponse, dependencies=[Depends(conditional_get)])
 async def get_asset(
     asset_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
@@ -1,44 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from fastapi.responses import RedirectResponse, JSONResponse
 from sqlalchemy.orm import Session
-from authlib.integrations.starlette_client import OAuth
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
 from pydantic import BaseModel, EmailStr, Field
-from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
-import httpx
+from functools import lru_cache
 import uuid
 import json
 import redis
 import os
-import shutil
-from pathlib import Path
 
 from app.database import get_db
 from app.models.user import User
 from app.models.couple import Couple
 from app.schemas.user import UserResponse
-from app.core.security import create_session, delete_session, get_redis_client, create_tokens, verify_token
+from app.core.security import create_session, delete_session, get_redis_client, create_tokens, verify_token, revoke_user_tokens
 from app.core.dependencies import get_current_user, invalidate_user_cache
+from app.core.passwords import hash_password, verify_and_update_password
+from app.utils.avatars import ImageTooLarge, InvalidImage, remove_avatar_files, save_avatar
 from app.config import settings
 
 router = APIRouter()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# OAuth configuration
-oauth = OAuth()
-oauth.register(
-    name='google',
-    client_id=settings.GOOGLE_CLIENT_ID,
-    client_secret=settings.GOOGLE_CLIENT_SECRET,
-    server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-    client_kwargs={
-        'scope': 'openid email profile'
-    }
-)
+
+@lru_cache(maxsize=None)
+def get_oauth():
+    """OAuth registry, built on first use (authlib and httpx are slow to import)"""
+    from authlib.integrations.starlette_client import OAuth
+
+    oauth = OAuth()
+    oauth.register(
+        name='google',
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+        client_kwargs={
+            'scope': 'openid email profile'
+        }
+    )
+    return oauth
+
 
 # LINE OAuth URLs (manual handling due to authlib compatibility issues)
 LINE_AUTHORIZE_URL = 'https://access.line.me/oauth2/v2.1/authorize'
@@ -92,14 +95,6 @@ class RefreshTokenRequest(BaseModel):
 
 # ==================== Helper Functions ====================
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 def create_password_reset_token(email: str) -> str:
     expire = datetime.utcnow() + timedelta(hours=settings.PASSWORD_RESET_TOKEN_EXPIRE_HOURS)
     to_encode = {"sub": email, "exp": expire, "type": "password_reset"}
@@ -116,7 +111,7 @@ def verify_password_reset_token(token: str) -> str | None:
         return None
 
 
-def store_pending_oauth(provider: str, user_info: dict) -> str:
+async def store_pending_oauth(provider: str, user_info: dict) -> str:
     """Store OAuth info temporarily for registration flow"""
     pending_id = str(uuid.uuid4())
     redis_client = get_redis_client()
@@ -124,23 +119,23 @@ def store_pending_oauth(provider: str, user_info: dict) -> str:
         "provider": provider,
         "user_info": user_info
     }
-    redis_client.setex(f"pending_oauth:{pending_id}", 600, json.dumps(data))  # 10 minutes TTL
+    await redis_client.setex(f"pending_oauth:{pending_id}", 600, json.dumps(data))  # 10 minutes TTL
     return pending_id
 
 
-def get_pending_oauth(pending_id: str) -> dict | None:
+async def get_pending_oauth(pending_id: str) -> dict | None:
     """Retrieve pending OAuth info"""
     redis_client = get_redis_client()
-    data = redis_client.get(f"pending_oauth:{pending_id}")
+    data = await redis_client.get(f"pending_oauth:{pending_id}")
     if data:
         return json.loads(data)
     return None
 
 
-def delete_pending_oauth(pending_id: str):
+async def delete_pending_oauth(pending_id: str):
     """Delete pending OAuth info"""
     redis_client = get_redis_client()
-    redis_client.delete(f"pending_oauth:{pending_id}")
+    await redis_client.delete(f"pending_oauth:{pending_id}")
 
 
 def send_password_reset_email(email: str, token: str):
@@ -179,13 +174,13 @@ async def register(data: RegisterRequest, db: Session = Depends(get_db)):
     # Check for pending OAuth registration
     oauth_info = None
     if data.oauth_pending_id:
-        oauth_info = get_pending_oauth(data.oauth_pending_id)
+        oauth_info = await get_pending_oauth(data.oauth_pending_id)
 
     # Create user
     user = User(
         email=data.email,
         name=data.name,
-        password_hash=get_password_hash(data.password) if data.password else None,
+        password_hash=await hash_password(data.password) if data.password else None,
         email_verified=False
     )
 
@@ -203,7 +198,7 @@ async def register(data: RegisterRequest, db: Session = Depends(get_db)):
         if user_info.get("picture"):
             user.picture_url = user_info.get("picture")
 
-        delete_pending_oauth(data.oauth_pending_id)
+        await delete_pending_oauth(data.oauth_pending_id)
 
     db.add(user)
     db.commit()
@@ -237,12 +232,18 @@ async def login(data: LoginRequest, db: Session = Depends(get_db)):
             detail="メールアドレスまたはパスワードが正しくありません"
         )
 
-    if not verify_password(data.password, user.password_hash):
+    is_valid, new_hash = await verify_and_update_password(data.password, user.password_hash)
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="メールアドレスまたはパスワードが正しくありません"
         )
 
+    # Transparently upgrade hashes created with old cost parameters
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
+
     # Create JWT tokens
     tokens = create_tokens(str(user.id))
 
@@ -264,7 +265,7 @@ async def login(data: LoginRequest, db: Session = Depends(get_db)):
 @router.post("/refresh")
 async def refresh_token(data: RefreshTokenRequest, db: Session = Depends(get_db)):
     """Refresh access token using refresh token"""
-    payload = verify_token(data.refresh_token, token_type="refresh")
+    payload = await verify_token(data.refresh_token, token_type="refresh")
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -323,9 +324,12 @@ async def confirm_password_reset(data: PasswordResetConfirm, db: Session = Depen
             detail="ユーザーが見つかりません"
         )
 
-    user.password_hash = get_password_hash(data.new_password)
+    user.password_hash = await hash_password(data.new_password)
     db.commit()
 
+    # Sign out every device that was using the old password
+    await revoke_user_tokens(str(user.id))
+
     return {"message": "パスワードを更新しました"}
 
 
@@ -335,7 +339,7 @@ async def confirm_password_reset(data: PasswordResetConfirm, db: Session = Depen
 async def get_oauth_pending_info(pending_id: str):
     """Get pending OAuth registration info"""
 
-    oauth_info = get_pending_oauth(pending_id)
+    oauth_info = await get_pending_oauth(pending_id)
     if not oauth_info:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -357,14 +361,14 @@ async def get_oauth_pending_info(pending_id: str):
 async def google_login(request: Request):
     """Initiate Google OAuth flow"""
     redirect_uri = settings.GOOGLE_REDIRECT_URI
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 
 @router.get("/google/callback")
 async def google_callback(request: Request, db: Session = Depends(get_db)):
     """Handle Google OAuth callback"""
     try:
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
         user_info = token.get('userinfo')
 
         if not user_info:
@@ -400,7 +404,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
                 db.commit()
             else:
                 # New user - redirect to registration
-                pending_id = store_pending_oauth("google", {
+                pending_id = await store_pending_oauth("google", {
                     "sub": google_id,
                     "email": email,
                     "name": name,
@@ -439,7 +443,7 @@ async def line_login(request: Request):
     # Generate state for CSRF protection
     state = str(uuid.uuid4())
     redis_client = get_redis_client()
-    redis_client.setex(f"line_state:{state}", 600, "valid")  # 10 minutes TTL
+    await redis_client.setex(f"line_state:{state}", 600, "valid")  # 10 minutes TTL
 
     # Build authorization URL
     params = {
@@ -474,14 +478,15 @@ async def line_callback(request: Request, code: str = None, state: str = None, e
             detail="Missing code or state parameter"
         )
 
-    # Verify state
+    # Verify state (GETDEL consumes it in the same round-trip)
     redis_client = get_redis_client()
-    if not redis_client.get(f"line_state:{state}"):
+    if not await redis_client.getdel(f"line_state:{state}"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid state parameter"
         )
-    redis_client.delete(f"line_state:{state}")
+
+    import httpx
 
     try:
         # Exchange code for token
@@ -559,7 +564,7 @@ async def line_callback(request: Request, code: str = None, state: str = None, e
                         user.picture_url = picture_url
                     db.commit()
                 else:
-                    pending_id = store_pending_oauth("line", {
+                    pending_id = await store_pending_oauth("line", {
                         "sub": line_id,
                         "email": email,
                         "name": name,
@@ -569,7 +574,7 @@ async def line_callback(request: Request, code: str = None, state: str = None, e
                         url=f"{settings.FRONTEND_URL}/register?oauth_pending={pending_id}"
                     )
             else:
-                pending_id = store_pending_oauth("line", {
+                pending_id = await store_pending_oauth("line", {
                     "sub": line_id,
                     "name": name,
                     "picture": picture_url
@@ -638,7 +643,7 @@ async def update_user_profile(
 
     db.commit()
     db.refresh(current_user)
-    invalidate_user_cache(str(current_user.id))
+    await invalidate_user_cache(str(current_user.id))
     return current_user
 
 
@@ -657,41 +662,25 @@ async def upload_avatar(
             detail="画像ファイル（JPEG, PNG, GIF, WebP）のみアップロード可能です"
         )
 
-    # Validate file size (max 5MB)
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
-
-    if file_size > 5 * 1024 * 1024:  # 5MB
+    # Size check, hashing and resizing run in a worker thread, off the event loop
+    try:
+        picture_url = await save_avatar(file.file, str(current_user.id))
+    except ImageTooLarge:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="ファイルサイズは5MB以下にしてください"
         )
+    except InvalidImage:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="画像ファイルを読み込めませんでした"
+        )
 
-    # Create uploads directory if not exists
-    uploads_dir = Path("uploads/avatars")
-    uploads_dir.mkdir(parents=True, exist_ok=True)
-
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix if file.filename else ".jpg"
-    filename = f"{current_user.id}{file_extension}"
-    file_path = uploads_dir / filename
-
-    # Delete old avatar if exists (with different extension)
-    for ext in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
-        old_file = uploads_dir / f"{current_user.id}{ext}"
-        if old_file.exists() and old_file != file_path:
-            old_file.unlink()
-
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    # Update user picture_url
-    current_user.picture_url = f"/uploads/avatars/{filename}"
+    # Update user picture_url (the small WebP variant; the others are in picture_variants)
+    current_user.picture_url = picture_url
     db.commit()
     db.refresh(current_user)
-    invalidate_user_cache(str(current_user.id))
+    await invalidate_user_cache(str(current_user.id))
 
     return current_user
 
@@ -703,15 +692,13 @@ async def delete_avatar(
 ):
     """Delete user avatar image"""
     if current_user.picture_url and current_user.picture_url.startswith("/uploads/"):
-        # Delete the file
-        file_path = Path(current_user.picture_url.lstrip("/"))
-        if file_path.exists():
-            file_path.unlink()
+        # Delete every stored variant
+        await run_in_threadpool(remove_avatar_files, str(current_user.id))
 
     current_user.picture_url = None
     db.commit()
     db.refresh(current_user)
-    invalidate_user_cache(str(current_user.id))
+    await invalidate_user_cache(str(current_user.id))
 
     return current_user
 
@@ -720,7 +707,7 @@ async def delete_avatar(
 async def logout(current_user: User = Depends(get_current_user)):
     """Logout current user"""
     session_id = f"session:{current_user.id}"
-    delete_session(session_id)
+    await delete_session(session_id)
 
     response = JSONResponse(content={"message": "Logged out successfully"})
     response.delete_cookie(key=settings.SESSION_COOKIE_NAME)
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_, extract
+from pydantic import TypeAdapter
 from typing import List, Optional
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -13,9 +14,13 @@ from app.models.transaction import Transaction
 from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetResponse, BudgetSummary
 from app.schemas.transaction import ALL_EXPENSE_CATEGORIES, INCOME_CATEGORIES
 from app.core.dependencies import get_current_user
+from app.core.etag import conditional_get
+from app.core.serialization import model_response
 
 router = APIRouter()
 
+BUDGET_LIST_ADAPTER = TypeAdapter(List[BudgetResponse])
+
 
 def calculate_budget_spent(db: Session, budget: Budget) -> Decimal:
     """Calculate current spent amount for a budget"""
@@ -157,8 +162,9 @@ async def create_budget(
     return enrich_budget_response(db, budget)
 
 
-@router.get("/", response_model=List[BudgetResponse])
+@router.get("/", response_model=List[BudgetResponse], dependencies=[Depends(conditional_get)])
 async def get_budgets(
+    response: Response,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     year: Optional[int] = None,
     month: Optional[int] = None,
@@ -198,11 +204,16 @@ async def get_budgets(
     budgets = query.all()
 
     # Enrich with current spent
-    return [enrich_budget_response(db, budget) for budget in budgets]
+    return model_response(
+        BUDGET_LIST_ADAPTER,
+        [enrich_budget_response(db, budget) for budget in budgets],
+        response
+    )
 
 
-@router.get("/status/current", response_model=List[BudgetResponse])
+@router.get("/status/current", response_model=List[BudgetResponse], dependencies=[Depends(conditional_get)])
 async def get_current_budget_status(
+    response: Response,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -213,6 +224,7 @@ async def get_current_budget_status(
     current_month = now.month
 
     return await get_budgets(
+        response=response,
         scope=scope,
         year=current_year,
         month=current_month,
@@ -222,7 +234,7 @@ async def get_current_budget_status(
     )
 
 
-@router.get("/{budget_id}", response_model=BudgetSummary)
+@router.get("/{budget_id}", response_model=BudgetSummary, dependencies=[Depends(conditional_get)])
 async def get_budget_detail(
     budget_id: str,
     current_user: User = Depends(get_current_user),
@@ -1,15 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_, and_, func
-from typing import Optional
-from datetime import date
+from typing import List, Optional
+from datetime import date, timedelta
 from decimal import Decimal
 from pydantic import BaseModel
 from app.database import get_db
 from app.models.user import User
 from app.models.couple import Couple
 from app.models.invite_code import InviteCode
-from app.models.transaction import Transaction
 from app.schemas.couple import (
     CoupleResponse,
     CoupleCreate,
@@ -17,7 +16,8 @@ from app.schemas.couple import (
     InviteCodeResponse
 )
 from app.core.dependencies import get_current_user
-from app.utils.invite_code import create_invite_code, validate_invite_code
+from app.utils.invite_code import consume_invite_code, create_invite_code, validate_invite_code
+from app.utils.settlement import month_start, settlement_history, settlement_totals
 
 
 class SettlementResponse(BaseModel):
@@ -27,9 +27,30 @@ class SettlementResponse(BaseModel):
     settlement_amount: Decimal
     i_pay_partner: bool
 
+
+class SettlementMonth(SettlementResponse):
+    month: date
+
 router = APIRouter()
 
 
+def settle(my_paid: Decimal, partner_paid: Decimal) -> dict:
+    """Who owes whom, given what each partner paid for split expenses"""
+    total = my_paid + partner_paid
+    half = total / 2
+
+    # How much more I paid than my fair share
+    my_excess = my_paid - half
+
+    return {
+        "my_paid": my_paid,
+        "partner_paid": partner_paid,
+        "total": total,
+        "settlement_amount": abs(my_excess),
+        "i_pay_partner": my_excess < 0,  # If I paid less than half, I owe partner
+    }
+
+
 @router.post("/invite", response_model=InviteCodeResponse)
 async def generate_invite_code(
     data: InviteCodeCreate,
@@ -53,7 +74,7 @@ async def generate_invite_code(
         )
 
     # Create invite code
-    invite_code = create_invite_code(db, str(current_user.id), data.hours_valid)
+    invite_code = await create_invite_code(db, str(current_user.id), data.hours_valid)
 
     return invite_code
 
@@ -81,7 +102,7 @@ async def join_couple(
         )
 
     # Validate invite code
-    is_valid, error_message, invite_code = validate_invite_code(db, data.invite_code)
+    is_valid, error_message, invite_code = await validate_invite_code(db, data.invite_code)
 
     if not is_valid:
         raise HTTPException(
@@ -96,6 +117,13 @@ async def join_couple(
             detail="You cannot pair with yourself"
         )
 
+    # Mark invite code as used; fails if another join got there first
+    if not await consume_invite_code(db, invite_code, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invite code has already been used"
+        )
+
     # Create couple
     couple = Couple(
         user1_id=invite_code.user_id,
@@ -103,11 +131,6 @@ async def join_couple(
     )
 
     db.add(couple)
-
-    # Mark invite code as used
-    invite_code.used = True
-    invite_code.used_by = current_user.id
-
     db.commit()
 
     # Re-query with eager loading for response
@@ -193,47 +216,38 @@ async def get_settlement(
     else:
         partner_id = couple.user1_id
 
-    # Query split transactions for this couple
-    query = db.query(Transaction).filter(
-        and_(
-            Transaction.couple_id == couple.id,
-            Transaction.is_split == True,
-            Transaction.type == "expense",
-            Transaction.paid_by_user_id.isnot(None),
-        )
-    )
-
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
+    # Whole months come from the settlement ledger, not the transactions
+    my_paid, partner_paid = settlement_totals(db, couple.id, current_user.id, start_date, end_date)
 
-    # We only need one record per split expense (both records share the same original_amount and paid_by).
-    # Use the current user's records to avoid double counting.
-    query = query.filter(Transaction.user_id == current_user.id)
+    return SettlementResponse(**settle(my_paid, partner_paid))
 
-    transactions = query.all()
 
-    my_paid = Decimal("0.00")
-    partner_paid = Decimal("0.00")
+@router.get("/settlement/history", response_model=List[SettlementMonth])
+async def get_settlement_history(
+    months: int = Query(12, ge=1, le=60),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Settlement of each of the last `months` months, oldest first"""
 
-    for t in transactions:
-        original = t.original_amount or (t.amount * 2)
-        if str(t.paid_by_user_id) == str(current_user.id):
-            my_paid += original
-        else:
-            partner_paid += original
+    couple = db.query(Couple).filter(
+        or_(
+            Couple.user1_id == current_user.id,
+            Couple.user2_id == current_user.id
+        )
+    ).first()
 
-    total = my_paid + partner_paid
-    half = total / 2
+    if not couple:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="You are not in a couple"
+        )
 
-    # How much more I paid than my fair share
-    my_excess = my_paid - half
+    first_month = month_start(date.today())
+    for _ in range(months - 1):
+        first_month = month_start(first_month - timedelta(days=1))
 
-    return SettlementResponse(
-        my_paid=my_paid,
-        partner_paid=partner_paid,
-        total=total,
-        settlement_amount=abs(my_excess),
-        i_pay_partner=my_excess < 0,  # If I paid less than half, I owe partner
-    )
+    return [
+        SettlementMonth(month=month, **settle(my_paid, partner_paid))
+        for month, my_paid, partner_paid in settlement_history(db, couple.id, current_user.id, first_month)
+    ]
@@ -5,13 +5,14 @@ from datetime import date, datetime, timezone
 from decimal import Decimal
 from collections import defaultdict
 
-from app.database import get_db
 from app.models.user import User
 from app.models.couple import Couple
 from app.models.transaction import Transaction
 from app.models.budget import Budget
 from app.models.asset import Asset
 from app.core.dependencies import get_current_user
+from app.core.replicas import get_read_db
+from app.core.etag import conditional_get
 
 router = APIRouter()
 
@@ -21,10 +22,10 @@ MONTH_NAMES_JP = [
 ]
 
 
-@router.get("/data")
+@router.get("/data", dependencies=[Depends(conditional_get)])
 async def get_dashboard_data(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all dashboard data in a single request"""
 
@@ -6,10 +6,10 @@ from datetime import date
 from io import StringIO
 import csv
 
-from app.database import get_db
 from app.models.user import User
 from app.models.transaction import Transaction
 from app.core.dependencies import get_current_user
+from app.core.replicas import get_read_db
 from app.api.analytics import get_transactions_query, get_monthly_report, get_yearly_report
 
 router = APIRouter()
@@ -34,7 +34,7 @@ async def export_transactions_csv(
     end_date: Optional[date] = None,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Export transactions to CSV"""
 
@@ -101,7 +101,7 @@ async def export_monthly_report_csv(
     month: int,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Export monthly report to CSV"""
 
@@ -196,7 +196,7 @@ async def export_yearly_report_csv(
     year: int,
     scope: str = Query('personal', pattern="^(personal|couple)$"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Export yearly report to CSV"""
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from pydantic import BaseModel
@@ -14,6 +14,8 @@ from app.models.recurring_transaction import RecurringTransaction
 from app.models.transaction import Transaction
 from app.schemas.transaction import INCOME_CATEGORIES, ALL_EXPENSE_CATEGORIES
 from app.core.dependencies import get_current_user
+from app.core.etag import conditional_get
+from app.core.serialization import orm_rows_response
 
 router = APIRouter()
 
@@ -211,8 +213,9 @@ async def create_recurring_transaction(
     return recurring
 
 
-@router.get("/", response_model=List[RecurringTransactionResponse])
+@router.get("/", response_model=List[RecurringTransactionResponse], dependencies=[Depends(conditional_get)])
 async def get_recurring_transactions(
+    response: Response,
     is_active: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -228,10 +231,10 @@ async def get_recurring_transactions(
 
     query = query.order_by(RecurringTransaction.created_at.desc())
 
-    return query.all()
+    return orm_rows_response(RecurringTransactionResponse, query.all(), response)
 
 
-@router.get("/{recurring_id}", response_model=RecurringTransactionResponse)
+@router.get("/{recurring_id}", response_model=RecurringTransactionResponse, dependencies=[Depends(conditional_get)])
 async def get_recurring_transaction(
     recurring_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
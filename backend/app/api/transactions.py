@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, func
 from typing import Optional, List
@@ -18,6 +18,8 @@ from app.schemas.transaction import (
     ALL_EXPENSE_CATEGORIES
 )
 from app.core.dependencies import get_current_user
+from app.core.etag import conditional_get
+from app.core.serialization import orm_rows_response
 
 router = APIRouter()
 
@@ -137,8 +139,9 @@ async def create_transaction(
         return transaction
 
 
-@router.get("/", response_model=List[TransactionResponse])
+@router.get("/", response_model=List[TransactionResponse], dependencies=[Depends(conditional_get)])
 async def get_transactions(
+    response: Response,
     type: Optional[str] = Query(None, pattern="^(income|expense)$"),
     category: Optional[str] = None,
     start_date: Optional[date] = None,
@@ -197,10 +200,10 @@ async def get_transactions(
     # Apply pagination
     transactions = query.offset(offset).limit(limit).all()
 
-    return transactions
+    return orm_rows_response(TransactionResponse, transactions, response)
 
 
-@router.get("/summary", response_model=TransactionSummary)
+@router.get("/summary", response_model=TransactionSummary, dependencies=[Depends(conditional_get)])
 async def get_transaction_summary(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
@@ -258,7 +261,7 @@ async def get_transaction_summary(
     )
 
 
-@router.get("/{transaction_id}", response_model=TransactionResponse)
+@router.get("/{transaction_id}", response_model=TransactionResponse, dependencies=[Depends(conditional_get)])
 async def get_transaction(
     transaction_id: str,
     current_user: User = Depends(get_current_user),
@@ -7,21 +7,116 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Connection pool per worker process, for the primary and for each replica
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Read replicas for the dashboard, analytics, export and admin reads
+    # (comma-separated URLs; empty sends everything to DATABASE_URL)
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Replicas further behind are skipped
+    REPLICA_LAG_CHECK_INTERVAL: int = 5  # Seconds
+    # Reads of users whose data changed this recently go to the primary; keep it
+    # above REPLICA_MAX_LAG_SECONDS + REPLICA_LAG_CHECK_INTERVAL
+    READ_YOUR_WRITES_WINDOW: int = 15  # Seconds
 
     # Redis
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50  # Per worker process
+    REDIS_POOL_TIMEOUT: float = 2.0  # Seconds to wait for a free pooled connection
+    REDIS_SOCKET_TIMEOUT: float = 2.0
 
     # Security
     SECRET_KEY: str
     SESSION_COOKIE_NAME: str = "kakepple_session"
     SESSION_MAX_AGE: int = 86400 * 7  # 7 days
+    SESSION_REFRESH_INTERVAL: int = 3600  # Extend session expiry at most once per hour
     PASSWORD_RESET_TOKEN_EXPIRE_HOURS: int = 24
 
+    # Password hashing (bcrypt runs in a dedicated thread pool)
+    BCRYPT_ROUNDS: int = 12  # Changing this rehashes passwords on next login
+    PASSWORD_HASH_WORKERS: int = 2  # Threads per worker process
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Running + queued jobs before returning 503
+    AVATAR_WORKERS: int = 1  # Threads per worker process for resizing uploaded avatars
+
     # JWT Settings
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # In-process user cache (in front of the Redis user cache)
+    USER_LOCAL_CACHE_SIZE: int = 10000
+    USER_LOCAL_CACHE_TTL: int = 60  # seconds
+
+    # In-process cache of verified JWT claims
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Rate limiting (token buckets in Redis, "<requests>/<seconds>")
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_IP: str = "300/60"  # Anonymous requests
+    RATE_LIMIT_PER_USER: str = "600/60"  # Requests with a valid bearer token
+    RATE_LIMIT_LOGIN: str = "10/60"  # Per IP, on top of the general limit
+    RATE_LIMIT_REGISTER: str = "5/600"
+    RATE_LIMIT_PASSWORD_RESET: str = "5/900"
+    RATE_LIMIT_EXPORTS: str = "10/300"
+
+    # Admission control per worker: "<in flight>/<queued>/<queue timeout seconds>"
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_WRITE: str = "10/50/5"
+    ADMISSION_INTERACTIVE: str = "14/100/3"
+    ADMISSION_ANALYTICS: str = "4/8/10"
+    ADMISSION_EXPORT: str = "2/4/15"
+
+    # SQL instrumentation
+    SQL_SLOW_QUERY_MS: int = 200  # Statements slower than this are logged (params redacted)
+    SQL_DEBUG: bool = False  # Flag repeated statements per request as N+1 (also on with DEBUG)
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # Identical statements per request before flagging
+
+    # Prometheus /metrics (requires "Authorization: Bearer <token>" when set)
+    METRICS_TOKEN: Optional[str] = None
+
+    # Reverse proxies whose X-Forwarded-Proto/For headers are honoured
+    # (comma-separated IPs or CIDRs). The default covers nginx on the same host
+    # or Docker network; "*" trusts any peer and is only safe where the app is
+    # unreachable except through the platform's proxy (render.yaml, railway.json)
+    TRUSTED_PROXIES: str = "127.0.0.1,::1,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16"
+
+    # Response compression, negotiated in this order of preference
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"
+    COMPRESSION_MINIMUM_SIZE: int = 500  # Bytes
+    # Requests carrying this header (set by nginx) are left for the proxy to compress
+    COMPRESSION_PROXY_HEADER: Optional[str] = "X-Proxy-Compression"
+
+    # /uploads serving. Behind nginx, set UPLOADS_ACCEL_REDIRECT to its internal
+    # location (e.g. "/_uploads/") so nginx sends the files instead of a worker
+    UPLOADS_ACCEL_REDIRECT: Optional[str] = None
+    UPLOADS_MAX_AGE: int = 86400  # Cache lifetime of files without a content hash in their name
+
+    # Readiness probe (/health/ready), for load balancers that can route around
+    # an instance; platform health checks use /health/live. Cached per worker
+    HEALTH_CHECK_INTERVAL: float = 5.0  # Seconds between dependency probes
+    HEALTH_PROBE_TIMEOUT: float = 2.0  # Seconds before a DB/Redis ping counts as failed
+    HEALTH_POOL_WAIT_MS: float = 500  # Degraded when a checkout waited longer than this
+    HEALTH_POOL_USAGE_RATIO: float = 0.9  # Degraded when this share of the pool is checked out
+
+    # Periodic jobs (each runs on one worker at a time, coordinated through Redis)
+    SCHEDULER_ENABLED: bool = True
+    ADMIN_STATS_REFRESH_INTERVAL: int = 300  # Seconds
+    ADMIN_ANALYTICS_REFRESH_INTERVAL: int = 3600  # Seconds; rebuilds the analytics materialized views
+    INVITE_CODE_PURGE_INTERVAL: int = 3600  # Seconds
+    INVITE_CODE_PURGE_BATCH_SIZE: int = 1000  # Rows deleted per transaction
+
+    # Invite codes
+    INVITE_CODE_CACHE_ENABLED: bool = True  # Validate live codes from Redis without touching Postgres
+
+    # Startup warm-up (per worker, before it accepts traffic)
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5  # Capped at the pool size
+    WARMUP_REDIS_CONNECTIONS: int = 5
+    WARMUP_TIMEOUT: float = 10.0  # Seconds per step; failures never block startup
+    # Scale-to-zero deployments: skip warming OAuth and password hashing, which
+    # are imported lazily and only needed by the auth endpoints
+    FAST_STARTUP: bool = False
+
     # Google OAuth
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
@@ -0,0 +1,159 @@
+import asyncio
+import math
+from typing import Any, Dict, NamedTuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_SHED
+
+WRITE = "write"
+INTERACTIVE = "interactive"
+ANALYTICS = "analytics"
+EXPORT = "export"
+
+READ_METHODS = {"GET", "HEAD"}
+ANALYTICS_PREFIX = "/api/analytics"
+EXPORT_PREFIX = "/api/exports"
+
+
+class Limits(NamedTuple):
+    """Per-worker concurrency limits for one priority class"""
+    max_in_flight: int
+    max_queued: int
+    queue_timeout: float  # Seconds a request may wait for a slot
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limits":
+        """Build limits from a "<in flight>/<queued>/<queue timeout seconds>" setting"""
+        in_flight, queued, timeout = spec.split("/")
+        return cls(int(in_flight), int(queued), float(timeout))
+
+
+class PriorityClass:
+    """Bounded pool of request slots with a bounded, deadline-limited wait queue
+
+    Only touched from the event loop thread, so the counters need no locking.
+    """
+
+    def __init__(self, name: str, limits: Limits):
+        self.name = name
+        self.limits = limits
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self._slots = asyncio.Semaphore(limits.max_in_flight)
+        self._in_flight_metric = ADMISSION_IN_FLIGHT.labels(name)
+        self._queued_metric = ADMISSION_QUEUED.labels(name)
+        self._shed_queue_full_metric = ADMISSION_SHED.labels(name, "queue_full")
+        self._shed_timeout_metric = ADMISSION_SHED.labels(name, "timeout")
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; False if the queue is full or the deadline passes"""
+        if self._slots.locked():
+            if self.queued >= self.limits.max_queued:
+                self.shed_queue_full += 1
+                self._shed_queue_full_metric.inc()
+                return False
+            self.queued += 1
+            self._queued_metric.inc()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.limits.queue_timeout)
+            except asyncio.TimeoutError:
+                self.shed_timeout += 1
+                self._shed_timeout_metric.inc()
+                return False
+            finally:
+                self.queued -= 1
+                self._queued_metric.dec()
+        else:
+            await self._slots.acquire()
+        self.in_flight += 1
+        self.admitted += 1
+        self._in_flight_metric.inc()
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._in_flight_metric.dec()
+        self._slots.release()
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.limits.queue_timeout))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+            **self.limits._asdict(),
+        }
+
+
+# Defaults add up to the DB pool size (10 + 20 overflow), so heavy classes can
+# never take every connection away from writes and interactive reads
+PRIORITY_CLASSES = {
+    WRITE: PriorityClass(WRITE, Limits.parse(settings.ADMISSION_WRITE)),
+    INTERACTIVE: PriorityClass(INTERACTIVE, Limits.parse(settings.ADMISSION_INTERACTIVE)),
+    ANALYTICS: PriorityClass(ANALYTICS, Limits.parse(settings.ADMISSION_ANALYTICS)),
+    EXPORT: PriorityClass(EXPORT, Limits.parse(settings.ADMISSION_EXPORT)),
+}
+
+
+def classify(scope: Scope) -> str:
+    """Priority class of an API request"""
+    path = scope["path"]
+    if path.startswith(EXPORT_PREFIX):
+        return EXPORT
+    if path.startswith(ANALYTICS_PREFIX):
+        return ANALYTICS
+    if scope["method"] not in READ_METHODS:
+        return WRITE
+    return INTERACTIVE
+
+
+def admission_stats() -> Dict[str, Dict[str, Any]]:
+    """Queue depth and shed counts per priority class in this worker"""
+    return {name: priority.snapshot() for name, priority in PRIORITY_CLASSES.items()}
+
+
+class AdmissionControlMiddleware:
+    """Caps in-flight API requests per priority class and sheds load with 503
+
+    Heavy analytics and exports queue separately, so a burst of them cannot
+    starve cheap reads and writes of DB connections and worker threads.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.ADMISSION_CONTROL_ENABLED
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith("/api/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        priority = PRIORITY_CLASSES[classify(scope)]
+        if not await priority.acquire():
+            response = JSONResponse(
+                {"detail": "現在アクセスが集中しています。しばらくしてから再度お試しください"},
+                status_code=503,
+                headers={"Retry-After": str(priority.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            priority.release()
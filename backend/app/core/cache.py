@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.metrics import CACHE_REQUESTS
+
+
+class HitCounter:
+    """Hit/miss counters for a cache tier, also exported to Prometheus under `name`"""
+
+    def __init__(self, name: str):
+        self.hits = 0
+        self.misses = 0
+        self._hit_metric = CACHE_REQUESTS.labels(name, "hit")
+        self._miss_metric = CACHE_REQUESTS.labels(name, "miss")
+
+    def hit(self) -> None:
+        self.hits += 1
+        self._hit_metric.inc()
+
+    def miss(self) -> None:
+        self.misses += 1
+        self._miss_metric.inc()
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
+
+
+class TTLCache:
+    """Bounded in-process LRU cache with per-entry expiry
+
+    Safe to use from the event loop and background threads (e.g. pub/sub listeners).
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = HitCounter(name)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.miss()
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.stats.miss()
+                return None
+            self._data.move_to_end(key)
+            self.stats.hit()
+            return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Like get, but neither counted in the stats nor refreshing the LRU order"""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
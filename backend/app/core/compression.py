@@ -0,0 +1,174 @@
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional: without it br is simply never negotiated
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = "gzip"
+BROTLI = "br"
+ZSTD = "zstd"
+
+AVAILABLE = {GZIP} | ({BROTLI} if brotli else set()) | ({ZSTD} if zstandard else set())
+
+# Levels per content type. JSON responses are small and latency-sensitive, so
+# they get cheap levels; exports are large and rare, so spend more CPU there.
+# (see benchmarks/bench_compression.py)
+LEVELS: Dict[str, Dict[str, int]] = {
+    "application/json": {GZIP: 5, BROTLI: 4, ZSTD: 3},
+    "text/csv": {GZIP: 5, BROTLI: 5, ZSTD: 6},
+}
+DEFAULT_LEVELS = {GZIP: 5, BROTLI: 4, ZSTD: 3}
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+class Compressor:
+    """Incremental compressor; every chunk fed in is flushed so streams are not held back"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._brotli = brotli.Compressor(quality=level)
+        elif encoding == ZSTD:
+            self._zstd = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.process(data) + self._brotli.flush()
+        if self.encoding == ZSTD:
+            return self._zstd.compress(data) + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.process(data) + self._brotli.finish()
+        if self.encoding == ZSTD:
+            return self._zstd.compress(data) + self._zstd.flush()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """One-shot compression of a complete body"""
+    return Compressor(encoding, level).finish(data)
+
+
+def levels_for(content_type: str) -> Dict[str, int]:
+    return LEVELS.get(content_type.split(";")[0].strip().lower(), DEFAULT_LEVELS)
+
+
+def negotiate(accept_encoding: str, preference: List[str]) -> Optional[str]:
+    """Pick the client's highest-q encoding, breaking ties by server preference"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in preference:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Negotiated zstd/br/gzip compression of responses
+
+    Skipped when the request carries COMPRESSION_PROXY_HEADER (the reverse
+    proxy compresses instead), for small or non-text bodies and for responses
+    that are already encoded. Streaming responses are compressed and flushed
+    chunk by chunk instead of being buffered.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500):
+        self.app = app
+        self.minimum_size = minimum_size
+        configured = [encoding.strip() for encoding in settings.COMPRESSION_ENCODINGS.split(",")]
+        self.preference = [encoding for encoding in configured if encoding in AVAILABLE]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if settings.COMPRESSION_PROXY_HEADER and settings.COMPRESSION_PROXY_HEADER in headers:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(headers.get("accept-encoding", ""), self.preference)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                # First body chunk: decide whether to compress this response
+                response_headers = MutableHeaders(raw=start_message["headers"])
+                content_type = response_headers.get("content-type", "")
+                if (
+                    "content-encoding" in response_headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or "no-transform" in response_headers.get("cache-control", "")
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = Compressor(encoding, levels_for(content_type)[encoding])
+                response_headers["Content-Encoding"] = encoding
+                response_headers.add_vary_header("Accept-Encoding")
+                etag = response_headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The encoded bytes differ, so the strong validator becomes weak
+                    response_headers["ETag"] = "W/" + etag
+                if more_body:
+                    del response_headers["Content-Length"]
+                    message["body"] = compressor.compress(body)
+                else:
+                    message["body"] = compressor.finish(body)
+                    response_headers["Content-Length"] = str(len(message["body"]))
+                await send(start_message)
+                await send(message)
+                return
+
+            message["body"] = compressor.compress(body) if more_body else compressor.finish(body)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -1,10 +1,15 @@
 from fastapi import Cookie, HTTPException, status, Depends, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from typing import Optional, Tuple
+from contextvars import ContextVar
 import json
-from app.core.security import get_session, refresh_session, verify_token, get_redis_client
-from app.database import get_db
+from app.core import invalidation
+from app.core.cache import HitCounter, TTLCache
+from app.core.security import get_session, refresh_session, verify_token, get_redis_client, get_sync_redis_client
+from app.database import SessionLocal, get_db
+from app.models.couple import Couple
 from app.models.user import User
 from app.config import settings
 
@@ -12,58 +17,190 @@ from app.config import settings
 security = HTTPBearer(auto_error=False)
 
 USER_CACHE_TTL = 300  # 5 minutes
+USER_CACHE_INVALIDATION_CHANNEL = "user_cache:invalidate"
 
+# Couple membership cache; invalidated on commit, the TTL bounds staleness if
+# a concurrent lookup re-caches the old membership right after
+COUPLE_CACHE_TTL = 300  # 5 minutes
+_COUPLE_PENDING_KEY = "couple_cache_pending"
+
+# Authenticated user of the current request, for hooks that run without it
+# (app.core.replicas marks whoever wrote as read-your-writes sticky)
+acting_user_id: ContextVar[Optional[str]] = ContextVar("acting_user_id", default=None)
+
+# Tier 1: per-worker LRU in front of the shared Redis cache (tier 2).
+# Entries are dropped across workers via Redis pub/sub, the short TTL bounds
+# staleness if an invalidation message is ever missed.
+_local_user_cache = TTLCache(
+    "user_local",
+    maxsize=settings.USER_LOCAL_CACHE_SIZE,
+    ttl=settings.USER_LOCAL_CACHE_TTL,
+)
+_redis_user_cache_stats = HitCounter("user_redis")
+
+invalidation.register(
+    USER_CACHE_INVALIDATION_CHANNEL,
+    _local_user_cache.pop,
+    on_reset=_local_user_cache.clear,
+)
+
+
+def _user_from_cache_data(user_data: dict, db: Session) -> User:
+    """Create a transient User object and merge into session"""
+    user = User(
+        id=user_data["id"],
+        email=user_data["email"],
+        name=user_data.get("name"),
+        picture_url=user_data.get("picture_url"),
+        is_admin=user_data.get("is_admin", False),
+        email_verified=user_data.get("email_verified", False),
+    )
+    # merge(load=False) only accepts detached instances; this one is never flushed
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+async def _get_cached_user(user_id: str, db: Session) -> Optional[User]:
+    """Try the in-process cache, then Redis, then fall back to DB"""
+    use_local = invalidation.ensure_listener()
+
+    if use_local:
+        user_data = _local_user_cache.get(user_id)
+        if user_data:
+            return _user_from_cache_data(user_data, db)
 
-def _get_cached_user(user_id: str, db: Session) -> Optional[User]:
-    """Try to get user from Redis cache, fall back to DB"""
     redis = get_redis_client()
     cache_key = f"user_cache:{user_id}"
 
     try:
-        cached = redis.get(cache_key)
+        cached = await redis.get(cache_key)
         if cached:
+            _redis_user_cache_stats.hit()
             user_data = json.loads(cached)
-            # Create a transient User object and merge into session
-            user = User(
-                id=user_data["id"],
-                email=user_data["email"],
-                name=user_data.get("name"),
-                picture_url=user_data.get("picture_url"),
-                is_admin=user_data.get("is_admin", False),
-                email_verified=user_data.get("email_verified", False),
-            )
-            user = db.merge(user, load=False)
-            return user
+            if use_local:
+                _local_user_cache.set(user_id, user_data)
+            return _user_from_cache_data(user_data, db)
+        _redis_user_cache_stats.miss()
     except Exception:
         pass  # Redis error, fall through to DB
 
     # Cache miss - query DB
     user = db.query(User).filter(User.id == user_id).first()
     if user:
+        user_data = {
+            "id": str(user.id),
+            "email": user.email,
+            "name": user.name,
+            "picture_url": user.picture_url,
+            "is_admin": user.is_admin,
+            "email_verified": getattr(user, 'email_verified', False),
+        }
+        if use_local:
+            _local_user_cache.set(user_id, user_data)
         try:
-            redis.setex(cache_key, USER_CACHE_TTL, json.dumps({
-                "id": str(user.id),
-                "email": user.email,
-                "name": user.name,
-                "picture_url": user.picture_url,
-                "is_admin": user.is_admin,
-                "email_verified": getattr(user, 'email_verified', False),
-            }))
+            await redis.setex(cache_key, USER_CACHE_TTL, json.dumps(user_data))
         except Exception:
             pass  # Redis error, continue without caching
 
     return user
 
 
-def invalidate_user_cache(user_id: str):
-    """Invalidate user cache after profile update"""
+async def invalidate_user_cache(user_id: str):
+    """Invalidate user cache after profile update (all tiers, all workers)"""
+    _local_user_cache.pop(user_id)
     try:
-        redis = get_redis_client()
-        redis.delete(f"user_cache:{user_id}")
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.delete(f"user_cache:{user_id}")
+            pipe.publish(USER_CACHE_INVALIDATION_CHANNEL, user_id)
+            await pipe.execute()
     except Exception:
         pass
 
 
+def user_cache_stats() -> dict:
+    """Hit ratios of both user cache tiers in this worker"""
+    return {
+        "local": {**_local_user_cache.stats.snapshot(), "size": len(_local_user_cache)},
+        "redis": _redis_user_cache_stats.snapshot(),
+    }
+
+
+# ==================== Couple Membership Cache ====================
+
+def couple_cache_key(user_id) -> str:
+    return f"user_couple:{user_id}"
+
+
+async def get_couple_membership(user_id, db: Session) -> Optional[Tuple[str, str]]:
+    """(couple_id, partner_id) of the user's couple, or None; cached in Redis"""
+    redis = get_redis_client()
+    cache_key = couple_cache_key(user_id)
+
+    try:
+        cached = await redis.get(cache_key)
+        if cached is not None:
+            membership = json.loads(cached)
+            return tuple(membership) if membership else None
+    except Exception:
+        pass  # Redis error, fall through to DB
+
+    couple = db.query(Couple.id, Couple.user1_id, Couple.user2_id).filter(
+        or_(
+            Couple.user1_id == user_id,
+            Couple.user2_id == user_id
+        )
+    ).first()
+    membership = None
+    if couple:
+        partner_id = couple.user2_id if str(couple.user1_id) == str(user_id) else couple.user1_id
+        membership = (str(couple.id), str(partner_id))
+
+    try:
+        # Single users are cached too ("null"), they are most of the misses
+        await redis.setex(cache_key, COUPLE_CACHE_TTL, json.dumps(membership))
+    except Exception:
+        pass  # Redis error, continue without caching
+
+    return membership
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _collect_couple_changes(session: Session, flush_context, instances) -> None:
+    pending = session.info.setdefault(_COUPLE_PENDING_KEY, set())
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, Couple):
+            pending.update(str(member) for member in (obj.user1_id, obj.user2_id) if member)
+
+    # Deleting a user cascades to their couple in the database, not through
+    # the session, so the partner is looked up before the rows are gone
+    deleted_users = [obj.id for obj in session.deleted if isinstance(obj, User)]
+    if deleted_users:
+        members = session.connection().execute(
+            select(Couple.user1_id, Couple.user2_id).where(
+                or_(Couple.user1_id.in_(deleted_users), Couple.user2_id.in_(deleted_users))
+            )
+        )
+        for user1_id, user2_id in members:
+            pending.update((str(user1_id), str(user2_id)))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_couple_membership(session: Session) -> None:
+    pending = session.info.pop(_COUPLE_PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        # Runs inside a sync SQLAlchemy hook, so this uses the blocking client
+        get_sync_redis_client().delete(*(couple_cache_key(user_id) for user_id in pending))
+    except Exception:
+        pass  # Redis error, the TTL expires the entries
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_couple_changes(session: Session) -> None:
+    session.info.pop(_COUPLE_PENDING_KEY, None)
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     session_id: Optional[str] = Cookie(None, alias=settings.SESSION_COOKIE_NAME),
@@ -74,12 +211,13 @@ async def get_current_user(
     # First, try JWT token authentication (preferred for cross-domain)
     if credentials:
         token = credentials.credentials
-        payload = verify_token(token, token_type="access")
+        payload = await verify_token(token, token_type="access")
         if payload:
             user_id = payload.get("sub")
             if user_id:
-                user = _get_cached_user(user_id, db)
+                user = await _get_cached_user(user_id, db)
                 if user:
+                    acting_user_id.set(str(user.id))
                     return user
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -89,11 +227,12 @@ async def get_current_user(
 
     # Fallback to session cookie authentication (for backwards compatibility)
     if session_id:
-        session_data = get_session(session_id)
+        session_data, remaining_ttl = await get_session(session_id)
         if session_data:
-            user = _get_cached_user(session_data["user_id"], db)
+            user = await _get_cached_user(session_data["user_id"], db)
             if user:
-                refresh_session(session_id)
+                await refresh_session(session_id, remaining_ttl)
+                acting_user_id.set(str(user.id))
                 return user
 
     raise HTTPException(
@@ -0,0 +1,172 @@
+import hashlib
+import secrets
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Set
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_couple_membership, get_current_user
+from app.core.replicas import get_read_db
+from app.core.security import get_redis_client, get_sync_redis_client
+from app.database import SessionLocal
+from app.models.asset import Asset
+from app.models.budget import Budget
+from app.models.recurring_transaction import RecurringTransaction
+from app.models.transaction import Transaction
+from app.models.user import User
+
+# Models whose changes invalidate the cached read endpoints
+VERSIONED_MODELS = (Transaction, Budget, Asset, RecurringTransaction)
+
+# Bump when the response format of the guarded endpoints changes
+ETAG_SCHEMA_VERSION = "1"
+
+CACHE_CONTROL = "private, no-cache"
+
+_PENDING_KEY = "etag_pending_scopes"
+
+
+def user_version_key(user_id) -> str:
+    return f"data_version:user:{user_id}"
+
+
+def couple_version_key(couple_id) -> str:
+    return f"data_version:couple:{couple_id}"
+
+
+# ==================== Write Side: Version Bumps ====================
+
+def _scopes_for(obj) -> Set[str]:
+    """Version keys affected by a change to the given row"""
+    keys = set()
+    if getattr(obj, "user_id", None):
+        keys.add(user_version_key(obj.user_id))
+    if getattr(obj, "couple_id", None):
+        keys.add(couple_version_key(obj.couple_id))
+    if getattr(obj, "paid_by_user_id", None):
+        keys.add(user_version_key(obj.paid_by_user_id))
+    return keys
+
+
+def bump_data_versions(keys: Iterable[str]) -> None:
+    """Increment data versions so previously issued ETags stop matching"""
+    keys = list(keys)
+    if not keys:
+        return
+    try:
+        # Runs inside a sync SQLAlchemy hook, so this uses the blocking client
+        pipe = get_sync_redis_client().pipeline(transaction=False)
+        for key in keys:
+            # Seed unknown keys randomly so a Redis flush cannot resurrect old ETags
+            pipe.set(key, secrets.randbits(48), nx=True)
+            pipe.incr(key)
+        pipe.execute()
+    except Exception:
+        pass  # Redis error, clients will fall back to full responses
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changed_scopes(session: Session, flush_context) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, VERSIONED_MODELS):
+            pending.update(_scopes_for(obj))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_changed_scopes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        bump_data_versions(pending)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changed_scopes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ==================== Read Side: Conditional GET ====================
+
+async def get_data_versions(keys: List[str]) -> Optional[List[str]]:
+    """Fetch (and seed if missing) the data versions for the given keys"""
+    try:
+        redis = get_redis_client()
+        versions = await redis.mget(keys)
+        missing = [key for key, value in zip(keys, versions) if value is None]
+        if missing:
+            pipe = redis.pipeline(transaction=False)
+            for key in missing:
+                pipe.set(key, secrets.randbits(48), nx=True)
+            pipe.mget(keys)
+            versions = (await pipe.execute())[-1]
+        return versions
+    except Exception:
+        return None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison as required for If-None-Match (RFC 9110 13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+) -> None:
+    """Attach a strong ETag to the response and answer 304 if the client copy is fresh
+
+    The ETag is derived from per-user and per-couple data versions kept in Redis,
+    so a matching If-None-Match short-circuits the endpoint before its queries run.
+    A couple membership cache miss is read through the same routed session as
+    replica-routed endpoints, so those never touch the primary.
+    """
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    # Cached membership: a warm If-None-Match match issues no query at all
+    membership = await get_couple_membership(current_user.id, db)
+
+    keys = [user_version_key(current_user.id)]
+    if membership:
+        couple_id, partner_id = membership
+        keys.append(user_version_key(partner_id))
+        keys.append(couple_version_key(couple_id))
+
+    versions = await get_data_versions(keys)
+    if versions is None:
+        return
+
+    query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+    fingerprint = "|".join([
+        ETAG_SCHEMA_VERSION,
+        request.url.path,
+        query,
+        str(current_user.id),
+        membership[0] if membership else "",
+        *versions,
+        # Several endpoints default to "the current month" or "today"; most use
+        # the server's local date.today(), the dashboard the UTC date
+        date.today().isoformat(),
+        datetime.now(timezone.utc).date().isoformat(),
+    ])
+    etag = '"' + hashlib.sha256(fingerprint.encode()).hexdigest()[:32] + '"'
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+
+    response.headers["ETag"] = etag
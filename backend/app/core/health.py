@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.pool import Pool
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.security import get_redis_client
+from app.database import engine, replica_engines
+
+OK = "ok"
+DEGRADED = "degraded"
+UNAVAILABLE = "unavailable"
+
+# (monotonic time of the probe, report); shared by all probes hitting this worker
+_cached: Optional[Tuple[float, Dict[str, Any]]] = None
+_refresh_lock = asyncio.Lock()
+
+
+def _ping_db() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def _probe(ping: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(ping(), settings.HEALTH_PROBE_TIMEOUT)
+    except Exception as error:
+        return {"status": UNAVAILABLE, "error": type(error).__name__}
+    return {"status": OK, "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+def pool_check(pool: Pool) -> Dict[str, Any]:
+    """Checked-out ratio and longest checkout wait of a DB pool since the last check"""
+    checked_out = pool.checkedout()
+    capacity = pool.capacity()
+    usage = checked_out / capacity if capacity else 1.0
+    max_wait_ms = pool.take_max_wait() * 1000
+    saturated = usage >= settings.HEALTH_POOL_USAGE_RATIO or max_wait_ms >= settings.HEALTH_POOL_WAIT_MS
+    return {
+        "status": DEGRADED if saturated else OK,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "usage": round(usage, 2),
+        "max_wait_ms": round(max_wait_ms, 1),
+    }
+
+
+async def _check_database(pool: Dict[str, Any]) -> Dict[str, Any]:
+    if pool["checked_out"] >= pool["capacity"]:
+        # A ping would just queue behind the requests holding every connection
+        return {"status": DEGRADED, "error": "pool exhausted"}
+    return await _probe(lambda: run_in_threadpool(_ping_db))
+
+
+async def _run_checks() -> Dict[str, Any]:
+    pool = pool_check(engine.pool)
+    database, redis = await asyncio.gather(
+        _check_database(pool),
+        _probe(get_redis_client().ping),
+    )
+    checks = {"database": database, "redis": redis, "db_pool": pool}
+    # Replicas are not pinged (the lag job takes unreachable ones out of
+    # rotation), but a saturated replica pool slows reads down like the primary's
+    for replica in replica_engines:
+        checks[f"db_pool_{replica.pool.logging_name}"] = pool_check(replica.pool)
+    statuses = {check["status"] for check in checks.values()}
+    if UNAVAILABLE in statuses:
+        overall = UNAVAILABLE
+    elif DEGRADED in statuses:
+        overall = DEGRADED
+    else:
+        overall = OK
+    return {"status": overall, "checks": checks}
+
+
+async def readiness() -> Dict[str, Any]:
+    """Dependency and saturation report, probed at most every HEALTH_CHECK_INTERVAL"""
+    global _cached
+    if _cached is None or time.monotonic() - _cached[0] >= settings.HEALTH_CHECK_INTERVAL:
+        async with _refresh_lock:
+            # Concurrent probes wait for the one refresh already in progress
+            if _cached is None or time.monotonic() - _cached[0] >= settings.HEALTH_CHECK_INTERVAL:
+                _cached = (time.monotonic(), await _run_checks())
+    checked_at, report = _cached
+    return {**report, "age_seconds": round(time.monotonic() - checked_at, 1)}
@@ -0,0 +1,81 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Channel -> handler receiving the message payload
+_handlers: Dict[str, Callable[[str], None]] = {}
+# Called when messages may have been missed (listener disconnected)
+_reset_callbacks: List[Callable[[], None]] = []
+
+_listener_lock = threading.Lock()
+_listener_thread = None
+_retry_at = 0.0  # Back off after a failed start instead of reconnecting on every request
+LISTENER_RETRY_INTERVAL = 10
+
+
+def register(channel: str, handler: Callable[[str], None], on_reset: Callable[[], None]) -> None:
+    """Register a handler for cross-worker invalidation messages on a channel"""
+    _handlers[channel] = handler
+    _reset_callbacks.append(on_reset)
+
+
+def _reset_all() -> None:
+    for callback in _reset_callbacks:
+        callback()
+
+
+def _dispatch(message) -> None:
+    handler = _handlers.get(message["channel"])
+    if handler:
+        handler(message["data"])
+
+
+def _handle_listener_error(error, pubsub, thread) -> None:
+    logger.warning("Invalidation listener error: %s", error)
+    _reset_all()
+    time.sleep(1)
+
+
+def ensure_listener() -> bool:
+    """Start the pub/sub listener lazily so it runs in each (forked) worker
+
+    Returns False when the listener cannot run; in-process caches must then be
+    bypassed because they would not see invalidations from other workers.
+    """
+    global _listener_thread, _retry_at
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return True
+    if time.monotonic() < _retry_at:
+        return False
+    with _listener_lock:
+        if _listener_thread is not None and _listener_thread.is_alive():
+            return True
+        from app.core.security import get_sync_redis_client
+
+        try:
+            pubsub = get_sync_redis_client().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{channel: _dispatch for channel in _handlers})
+            _listener_thread = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=_handle_listener_error,
+            )
+        except Exception:
+            _reset_all()
+            _listener_thread = None
+            _retry_at = time.monotonic() + LISTENER_RETRY_INTERVAL
+            return False
+    return True
+
+
+async def publish(channel: str, message: str) -> None:
+    """Broadcast an invalidation message to every worker"""
+    from app.core.security import get_redis_client
+
+    try:
+        await get_redis_client().publish(channel, message)
+    except Exception:
+        pass
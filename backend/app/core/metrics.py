@@ -0,0 +1,232 @@
+import os
+import time
+from typing import Tuple
+
+import redis.asyncio
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from redis.asyncio.client import Pipeline
+from sqlalchemy.pool import QueuePool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.query_stats import detect_n_plus_one, report_n_plus_one, track_queries
+
+# Under gunicorn, PROMETHEUS_MULTIPROC_DIR is set by gunicorn.conf.py and every
+# worker writes its samples there; /metrics then aggregates all workers.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# ==================== HTTP ====================
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+
+# ==================== Database ====================
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the SQLAlchemy pool, by pool (primary, replicaN)",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond pool_size (negative while the pool is not full), by pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request",
+    "SQL statements issued per request, by route template",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_TIME = Histogram(
+    "db_time_per_request_seconds",
+    "Total SQL execution time per request, by route template",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent obtaining a connection from the SQLAlchemy pool, by pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_READ_ROUTING = Counter(
+    "db_read_routing_total",
+    "Read-only sessions by target (replica, or primary and why)",
+    ["target"],
+)
+
+# ==================== Redis and Caches ====================
+
+REDIS_COMMAND_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis round-trip latency by command (PIPELINE for pipelines)",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 2),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache tier and result",
+    ["cache", "result"],
+)
+
+# ==================== Admission Control ====================
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests",
+    "Requests holding an admission slot, by priority class",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued_requests",
+    "Requests waiting for an admission slot, by priority class",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total",
+    "Requests rejected with 503, by priority class and reason",
+    ["priority", "reason"],
+)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, aggregated over all workers"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# ==================== Instrumentation ====================
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits for a connection
+
+    Metrics are labelled with the pool's logging name (pool_logging_name).
+    """
+
+    # Longest checkout wait since the last take_max_wait(), for readiness checks
+    _max_wait = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            DB_POOL_WAIT.labels(self.logging_name).observe(waited)
+            if waited > self._max_wait:
+                self._max_wait = waited
+
+    def take_max_wait(self) -> float:
+        """Longest wait in seconds since the previous call, then reset"""
+        waited, self._max_wait = self._max_wait, 0.0
+        return waited
+
+    def capacity(self) -> int:
+        """Connections the pool may hand out at once (pool_size + max_overflow)"""
+        return self.size() + max(self._max_overflow, 0)
+
+
+def track_pool_usage(pool: QueuePool) -> None:
+    """Update the pool gauges; called from the pool checkout/checkin events"""
+    DB_POOL_CHECKED_OUT.labels(pool.logging_name).set(pool.checkedout())
+    DB_POOL_OVERFLOW.labels(pool.logging_name).set(pool.overflow())
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_LATENCY.labels("PIPELINE").observe(time.perf_counter() - start)
+
+
+class InstrumentedRedis(redis.asyncio.Redis):
+    """Async Redis client recording the latency of every command and pipeline"""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(str(args[0]).upper()).observe(time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class MetricsMiddleware:
+    """Records latency, status and SQL usage per route template
+
+    Routes are labelled by their template (e.g. /api/transactions/{transaction_id})
+    so label cardinality stays bounded; unmatched paths share one label. With
+    SQL_DEBUG, repeated statements are logged as N+1 candidates and responses
+    carry a Server-Timing header with the query count and DB time.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+        debug = detect_n_plus_one()
+
+        with track_queries() as queries:
+            async def send_with_status(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if debug:
+                        MutableHeaders(scope=message).append(
+                            "Server-Timing",
+                            f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} queries"',
+                        )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                # Mounted apps (e.g. /uploads) have no route; they are labelled by mount path
+                label = route.path if route is not None else scope.get("root_path") or "unmatched"
+                method = scope["method"]
+                REQUEST_LATENCY.labels(method, label).observe(time.perf_counter() - start)
+                REQUESTS.labels(method, label, str(status_code)).inc()
+                if queries.count:
+                    DB_QUERIES.labels(label).observe(queries.count)
+                    DB_TIME.labels(label).observe(queries.duration)
+                if debug:
+                    report_n_plus_one(queries, f"{method} {label}")
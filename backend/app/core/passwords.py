@@ -0,0 +1,71 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """Password hashing context, built on first use to keep passlib out of startup
+
+    Hashes with different cost parameters are flagged for rehash.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    )
+
+
+# bcrypt releases the GIL, so a small dedicated pool keeps hashing off the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_pending = 0  # Running + queued hash jobs; only touched from the event loop thread
+
+
+async def _run_bounded(fn: Callable[..., T], *args) -> T:
+    """Run a hashing job in the dedicated pool, rejecting work beyond the queue limit"""
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="現在アクセスが集中しています。しばらくしてから再度お試しください",
+            headers={"Retry-After": "1"}
+        )
+
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+
+
+def pending_hash_jobs() -> int:
+    """Number of hashing jobs currently running or queued"""
+    return _pending
+
+
+async def hash_password(password: str) -> str:
+    return await _run_bounded(get_pwd_context().hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_bounded(get_pwd_context().verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the cost parameters changed"""
+    return await _run_bounded(get_pwd_context().verify_and_update, plain_password, hashed_password)
@@ -0,0 +1,74 @@
+import ipaddress
+from typing import List, Optional, Tuple, Union
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_trusted(spec: str) -> Optional[List[Network]]:
+    """Networks from a comma-separated list of IPs/CIDRs; None means trust every peer"""
+    entries = [entry.strip() for entry in spec.split(",") if entry.strip()]
+    if "*" in entries:
+        return None
+    return [ipaddress.ip_network(entry, strict=False) for entry in entries]
+
+
+class TrustedProxyMiddleware:
+    """Applies X-Forwarded-Proto and X-Forwarded-For to the ASGI scope
+
+    Only honoured when the direct peer is a trusted proxy. The client address
+    is the right-most X-Forwarded-For entry that is not itself a trusted proxy
+    (with "*", simply the right-most one), so a header sent by the client is
+    ignored as long as every request passes a trusted proxy; a client that can
+    reach the app directly under "*" can still spoof it. Runs outermost, so
+    redirects (OAuth) use https and rate limiting and metrics see real clients.
+    """
+
+    def __init__(self, app: ASGIApp, trusted_proxies: str = "127.0.0.1"):
+        self.app = app
+        self.trusted = parse_trusted(trusted_proxies)
+
+    def _is_trusted(self, host: str) -> bool:
+        if self.trusted is None:
+            return True
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False  # e.g. a unix socket peer
+        return any(address in network for network in self.trusted)
+
+    def _client(self, forwarded_for: str) -> Optional[str]:
+        hosts = [host.strip() for host in forwarded_for.split(",") if host.strip()]
+        if self.trusted is None:
+            # Only the entry added by the (single) proxy in front of us is reliable
+            return hosts[-1] if hosts else None
+        for host in reversed(hosts):
+            if not self._is_trusted(host):
+                return host
+        return hosts[0] if hosts else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        client: Optional[Tuple[str, int]] = scope.get("client")
+        if client is None or self._is_trusted(client[0]):
+            proto = forwarded_for = None
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-proto":
+                    proto = value
+                elif name == b"x-forwarded-for":
+                    forwarded_for = value
+            if proto is not None:
+                # Left-most value is what the client used with the first proxy
+                proto = proto.decode("latin-1").split(",")[0].strip().lower()
+                if proto in ("http", "https"):
+                    scope["scheme"] = proto if scope["type"] == "http" else proto.replace("http", "ws")
+            if forwarded_for is not None:
+                host = self._client(forwarded_for.decode("latin-1"))
+                if host:
+                    scope["client"] = (host, 0)
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,125 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_QUERY_START_KEY = "query_start"
+
+
+class QueryStats:
+    """Queries issued while handling one request (or one tracked block)"""
+
+    def __init__(self, record_statements: bool, parent: Optional["QueryStats"] = None):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.record_statements = record_statements
+        self.statements: List[str] = []
+        self.parent = parent  # Enclosing tracked block, which counts these queries too
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        if self.record_statements:
+            self.statements.append(statement)
+        if self.parent is not None:
+            self.parent.add(statement, duration)
+
+    def repeated_statements(self, threshold: int) -> List[tuple]:
+        """(statement, count) for statements issued at least `threshold` times"""
+        return [
+            (statement, count)
+            for statement, count in Counter(self.statements).most_common()
+            if count >= threshold
+        ]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def detect_n_plus_one() -> bool:
+    return settings.SQL_DEBUG or settings.DEBUG
+
+
+@contextmanager
+def track_queries(record_statements: Optional[bool] = None) -> Iterator[QueryStats]:
+    """Count queries and DB time for the enclosed block
+
+    The stats object is shared through a context variable, so queries issued
+    from sync endpoints running in the thread pool are counted as well. Blocks
+    nest: a test tracking a request still sees the queries the metrics
+    middleware tracks for it.
+    """
+    if record_statements is None:
+        record_statements = detect_n_plus_one()
+    stats = QueryStats(record_statements, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def report_n_plus_one(stats: QueryStats, label: str) -> None:
+    """Log statements repeated often enough within one request to look like N+1"""
+    for statement, count in stats.repeated_statements(settings.SQL_N_PLUS_ONE_THRESHOLD):
+        logger.warning("Possible N+1 in %s: %d x %s", label, count, " ".join(statement.split()))
+
+
+@contextmanager
+def assert_max_queries(max_count: int) -> Iterator[QueryStats]:
+    """Fail if the enclosed block issues more than `max_count` queries
+
+    Tests use it through the max_queries fixture (tests/conftest.py), which
+    holds the per-endpoint budgets.
+    """
+    with track_queries(record_statements=True) as stats:
+        yield stats
+    if stats.count > max_count:
+        statements = "\n".join(f"  {statement}" for statement in stats.statements)
+        raise AssertionError(f"Expected at most {max_count} queries, got {stats.count}:\n{statements}")
+
+
+# ==================== Engine Hooks ====================
+
+def _redact(parameters: Any) -> str:
+    """Describe bound parameters without their values"""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}=?" for key in parameters) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return "(" + ", ".join("?" for _ in parameters) + ")"
+    return "?"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info[_QUERY_START_KEY].pop()
+
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, duration)
+
+    if duration * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s params=%s",
+            duration * 1000, " ".join(statement.split()), _redact(parameters),
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach query counting and slow-statement logging to an engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
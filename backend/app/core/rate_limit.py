@@ -0,0 +1,228 @@
+import logging
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.security import get_redis_client, token_subject
+
+logger = logging.getLogger(__name__)
+
+
+class Policy(NamedTuple):
+    """Token bucket refilling `limit` tokens every `window` seconds"""
+    name: str
+    limit: int
+    window: int
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> "Policy":
+        """Build a policy from a "<requests>/<seconds>" setting"""
+        limit, _, window = spec.partition("/")
+        return cls(name, int(limit), int(window))
+
+    @property
+    def header(self) -> str:
+        return f"{self.limit};w={self.window}"
+
+
+IP_POLICY = Policy.parse("ip", settings.RATE_LIMIT_PER_IP)
+USER_POLICY = Policy.parse("user", settings.RATE_LIMIT_PER_USER)
+LOGIN_POLICY = Policy.parse("login", settings.RATE_LIMIT_LOGIN)
+REGISTER_POLICY = Policy.parse("register", settings.RATE_LIMIT_REGISTER)
+PASSWORD_RESET_POLICY = Policy.parse("password_reset", settings.RATE_LIMIT_PASSWORD_RESET)
+EXPORT_POLICY = Policy.parse("export", settings.RATE_LIMIT_EXPORTS)
+
+# Credential endpoints are limited per client IP, on top of the general bucket
+AUTH_ROUTE_POLICIES = {
+    "/api/auth/login": LOGIN_POLICY,
+    "/api/auth/register": REGISTER_POLICY,
+    "/api/auth/password/reset": PASSWORD_RESET_POLICY,
+}
+EXPORT_PREFIX = "/api/exports"
+
+# Probes must keep working while a client is being limited
+EXEMPT_PATHS = {"/health", "/health/live", "/health/ready", "/metrics"}
+
+# Refills and consumes every bucket of a request atomically; a request is only
+# charged when all of its buckets have a token left.
+# KEYS: bucket keys, ARGV: limit and window (ms) for each key
+# Returns: {allowed, remaining tokens per key...}
+TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = now_parts[1] * 1000 + math.floor(now_parts[2] / 1000)
+local allowed = 1
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 2 - 1])
+    local window = tonumber(ARGV[i * 2])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local current = tonumber(bucket[1]) or limit
+    local elapsed = math.max(0, now - (tonumber(bucket[2]) or now))
+    current = math.min(limit, current + elapsed * limit / window)
+    if current < 1 then
+        allowed = 0
+    end
+    tokens[i] = current
+end
+local result = {allowed}
+for i, key in ipairs(KEYS) do
+    if allowed == 1 then
+        tokens[i] = tokens[i] - 1
+    end
+    redis.call('HSET', key, 'tokens', tokens[i], 'ts', now)
+    -- An untouched bucket is full again after one window
+    redis.call('PEXPIRE', key, ARGV[i * 2])
+    result[i + 1] = tostring(tokens[i])
+end
+return result
+"""
+
+_script = None
+
+
+def _get_script():
+    global _script
+    if _script is None:
+        _script = get_redis_client().register_script(TOKEN_BUCKET_SCRIPT)
+    return _script
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _client_ip(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(scope: Scope) -> Optional[str]:
+    """User of a validly signed bearer token (no Redis lookup)"""
+    authorization = _header(scope, b"authorization")
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    return token_subject(authorization[7:].strip())
+
+
+def buckets_for(scope: Scope) -> List[Tuple[Policy, str]]:
+    """(policy, redis key) pairs charged for a request
+
+    Authenticated requests are charged to the user, anonymous ones to the client
+    IP. Session cookies are not resolved here (that would cost a Redis lookup),
+    so cookie-authenticated requests are limited per IP.
+    """
+    path = scope["path"]
+    ip = _client_ip(scope)
+    user_id = _user_id(scope)
+
+    identity = user_id or ip
+    buckets = [(USER_POLICY if user_id else IP_POLICY, identity)]
+
+    auth_policy = AUTH_ROUTE_POLICIES.get(path.rstrip("/"))
+    if auth_policy:
+        buckets.append((auth_policy, ip))
+    elif path.startswith(EXPORT_PREFIX):
+        buckets.append((EXPORT_POLICY, identity))
+
+    return [(policy, f"ratelimit:{policy.name}:{key}") for policy, key in buckets]
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    policy: Policy
+    remaining: int
+    reset: int  # Seconds until the reported bucket is full again
+    retry_after: int  # Seconds until the request would be allowed (0 if allowed)
+
+
+def _evaluate(buckets: List[Tuple[Policy, str]], reply: list) -> RateLimitResult:
+    """Pick the bucket to report: the one blocking the request longest, or the emptiest"""
+    allowed = int(reply[0]) == 1
+    results = []
+    for (policy, _), tokens in zip(buckets, reply[1:]):
+        tokens = float(tokens)
+        rate = policy.limit / policy.window
+        retry_after = 0 if tokens >= 1 else math.ceil((1 - tokens) / rate)
+        reset = math.ceil((policy.limit - tokens) / rate)
+        results.append(RateLimitResult(allowed, policy, max(0, math.floor(tokens)), reset, retry_after))
+    if allowed:
+        return min(results, key=lambda result: result.remaining)
+    return max(results, key=lambda result: result.retry_after)
+
+
+async def consume(scope: Scope) -> Optional[RateLimitResult]:
+    """Charge a request to its buckets in one Redis round-trip (None if Redis is down)"""
+    buckets = buckets_for(scope)
+    args = []
+    for policy, _ in buckets:
+        args.extend((policy.limit, policy.window * 1000))
+    try:
+        reply = await _get_script()(keys=[key for _, key in buckets], args=args)
+    except Exception as error:
+        logger.debug("Rate limiter unavailable, allowing request: %s", error)
+        return None
+    return _evaluate(buckets, reply)
+
+
+def rate_limit_headers(result: RateLimitResult) -> List[Tuple[str, str]]:
+    headers = [
+        ("RateLimit-Policy", result.policy.header),
+        ("RateLimit-Limit", str(result.policy.limit)),
+        ("RateLimit-Remaining", str(result.remaining)),
+        ("RateLimit-Reset", str(result.reset)),
+    ]
+    if not result.allowed:
+        headers.append(("Retry-After", str(result.retry_after)))
+    return headers
+
+
+class RateLimitMiddleware:
+    """Distributed token-bucket limiter, enforced before any routing or DB work
+
+    Limits are shared by all workers through Redis, so they also apply when the
+    API is reached without going through nginx. Fails open if Redis is down.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.RATE_LIMIT_ENABLED
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        result = await consume(scope)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = rate_limit_headers(result)
+        if not result.allowed:
+            response = JSONResponse(
+                {"detail": "リクエストが多すぎます。しばらくしてから再度お試しください"},
+                status_code=429,
+                headers=dict(headers),
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers:
+                    response_headers.append(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
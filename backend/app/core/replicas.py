@@ -0,0 +1,178 @@
+import logging
+import random
+from typing import Set
+
+from fastapi import Depends
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import scheduler
+from app.core.dependencies import acting_user_id, get_current_user
+from app.core.metrics import DB_READ_ROUTING
+from app.core.security import get_redis_client, get_sync_redis_client
+from app.database import SessionLocal, engine, replica_engines
+from app.models.couple import Couple
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+LAG_JOB_NAME = "replica_lag"
+LAG_KEY = "replicas:lag"  # Hash of replica name -> seconds behind the primary
+
+# Columns naming a user whose reads a change affects
+USER_FIELDS = ("user_id", "paid_by_user_id", "used_by", "user1_id", "user2_id")
+
+_PENDING_KEY = "db_sticky_users"
+
+# Unknown (NULL, so the replica is skipped) unless the WAL receiver is
+# streaming: a disconnected standby replays everything it received and would
+# look caught up however far behind it is. While streaming, it is caught up
+# when everything received has been replayed; an idle primary does not advance
+# the replay timestamp, so that alone would look like growing lag.
+LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+def sticky_key(user_id) -> str:
+    return f"db_sticky:user:{user_id}"
+
+
+def _replica_name(replica: Engine) -> str:
+    return replica.url.render_as_string(hide_password=True)
+
+
+# ==================== Write Side: Read-Your-Writes ====================
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_sticky_users(session: Session, flush_context) -> None:
+    if not replica_engines:
+        return
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    user = acting_user_id.get()
+    if user:
+        pending.add(user)
+
+    couple_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            pending.add(str(obj.id))
+        for field in USER_FIELDS:
+            value = getattr(obj, field, None)
+            if value:
+                pending.add(str(value))
+        couple_id = getattr(obj, "couple_id", None)
+        if couple_id:
+            couple_ids.add(couple_id)
+
+    # A shared expense changes what the partner sees as well
+    if couple_ids:
+        members = session.connection().execute(
+            select(Couple.user1_id, Couple.user2_id).where(Couple.id.in_(couple_ids))
+        )
+        for user1_id, user2_id in members:
+            pending.update(str(member) for member in (user1_id, user2_id) if member)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_sticky_users(session: Session) -> None:
+    pending: Set[str] = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        # Runs inside a sync SQLAlchemy hook, so this uses the blocking client
+        pipe = get_sync_redis_client().pipeline(transaction=False)
+        for user_id in pending:
+            pipe.set(sticky_key(user_id), "1", ex=settings.READ_YOUR_WRITES_WINDOW)
+        pipe.execute()
+    except Exception:
+        pass  # Redis error, reads fall back to the primary anyway (no lag data)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_sticky_users(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ==================== Lag Monitoring ====================
+
+def check_replica_lag() -> None:
+    """Publish how far each streaming replica is behind the primary"""
+    lags = {}
+    for replica in replica_engines:
+        name = _replica_name(replica)
+        try:
+            with replica.connect() as connection:
+                lag = connection.execute(LAG_SQL).scalar()
+        except Exception:
+            logger.warning("Replica %s is unreachable", name)
+            continue
+        if lag is None:
+            logger.warning("Replica %s is not streaming from the primary", name)
+            continue
+        lags[name] = float(lag)
+
+    pipe = get_sync_redis_client().pipeline()
+    pipe.delete(LAG_KEY)
+    if lags:
+        pipe.hset(LAG_KEY, mapping=lags)
+        # Stale figures expire if this job stops running; reads then use the primary
+        pipe.expire(LAG_KEY, settings.REPLICA_LAG_CHECK_INTERVAL * 3)
+    pipe.execute()
+
+
+if replica_engines:
+    scheduler.register(LAG_JOB_NAME, settings.REPLICA_LAG_CHECK_INTERVAL, check_replica_lag)
+
+
+# ==================== Read Side: Routing ====================
+
+async def choose_engine(user_id) -> Engine:
+    """A replica that is caught up, or the primary if the user wrote recently or none is"""
+    if not replica_engines:
+        return engine
+    try:
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.exists(sticky_key(user_id))
+            pipe.hgetall(LAG_KEY)
+            sticky, lags = await pipe.execute()
+    except Exception:
+        DB_READ_ROUTING.labels(target="primary_unknown").inc()
+        return engine
+
+    if sticky:
+        DB_READ_ROUTING.labels(target="primary_sticky").inc()
+        return engine
+    if not lags:
+        DB_READ_ROUTING.labels(target="primary_unknown").inc()
+        return engine
+
+    fresh = [
+        replica for replica in replica_engines
+        if float(lags.get(_replica_name(replica), "inf")) <= settings.REPLICA_MAX_LAG_SECONDS
+    ]
+    if not fresh:
+        DB_READ_ROUTING.labels(target="primary_lag").inc()
+        return engine
+    DB_READ_ROUTING.labels(target="replica").inc()
+    return random.choice(fresh)
+
+
+async def get_read_engine(current_user: User = Depends(get_current_user)) -> Engine:
+    return await choose_engine(current_user.id)
+
+
+def get_read_db(bind: Engine = Depends(get_read_engine)):
+    """Dependency to get a read-only database session, on a replica when possible"""
+    db = SessionLocal(bind=bind)
+    try:
+        yield db
+    finally:
+        db.close()
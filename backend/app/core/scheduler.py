@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Set
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.security import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class Job(NamedTuple):
+    name: str
+    interval: float  # Seconds between runs, across all workers
+    fn: Callable[[], None]  # Blocking; runs in the thread pool
+
+
+_jobs: Dict[str, Job] = {}
+_tasks: List[asyncio.Task] = []
+_triggered: Set[asyncio.Task] = set()  # Strong references until they finish
+
+
+def register(name: str, interval: float, fn: Callable[[], None]) -> None:
+    """Run `fn` every `interval` seconds on one worker of the deployment"""
+    _jobs[name] = Job(name, interval, fn)
+
+
+async def _claim(job: Job) -> bool:
+    """Only the worker that sets the lock runs the job; it expires with the interval"""
+    try:
+        return bool(await get_redis_client().set(
+            f"scheduler:{job.name}", "1", nx=True, ex=max(1, int(job.interval))
+        ))
+    except Exception:
+        return False  # Without Redis every worker would run it; skip until it is back
+
+
+async def run_job(job: Job) -> None:
+    start = time.perf_counter()
+    try:
+        await run_in_threadpool(job.fn)
+        logger.info("Job %s done in %.0f ms", job.name, (time.perf_counter() - start) * 1000)
+    except Exception:
+        logger.exception("Job %s failed", job.name)
+
+
+async def _loop(job: Job) -> None:
+    # Spread the first attempt so freshly started workers do not race for the lock
+    await asyncio.sleep(random.uniform(0, min(job.interval, 30)))
+    while True:
+        if await _claim(job):
+            await run_job(job)
+        await asyncio.sleep(job.interval * random.uniform(0.9, 1.1))
+
+
+def trigger(name: str) -> None:
+    """Run a job now in the background, unless another worker ran it this interval"""
+    job = _jobs[name]
+
+    async def run() -> None:
+        if await _claim(job):
+            await run_job(job)
+
+    task = asyncio.create_task(run(), name=f"job:{name}:triggered")
+    _triggered.add(task)
+    task.add_done_callback(_triggered.discard)
+
+
+def start() -> None:
+    """Start the periodic jobs in this worker's event loop"""
+    if not settings.SCHEDULER_ENABLED:
+        return
+    for job in _jobs.values():
+        _tasks.append(asyncio.create_task(_loop(job), name=f"job:{job.name}"))
+
+
+async def stop() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
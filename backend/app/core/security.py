@@ -1,18 +1,48 @@
 import redis
+import redis.asyncio
 import json
 import secrets
-from typing import Optional, Dict, Any
+import hashlib
+import time
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from app.config import settings
-
-# Redis client for session management
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+from app.core import invalidation
+from app.core.cache import TTLCache
+from app.core.metrics import InstrumentedRedis
+
+# Async Redis client used by request handlers (sessions, caches, OAuth state)
+redis_pool = redis.asyncio.BlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,  # Wait for a free connection instead of failing
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_keepalive=True,
+    health_check_interval=30,
+)
+redis_client = InstrumentedRedis(connection_pool=redis_pool)
+
+# Sync client for code that cannot await: SQLAlchemy session hooks and the
+# pub/sub listener thread
+sync_redis_client = redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+)
+
+
+def get_redis_client() -> redis.asyncio.Redis:
+    """Get async Redis client instance"""
+    return redis_client
 
 
-def get_redis_client():
-    """Get Redis client instance"""
-    return redis_client
+def get_sync_redis_client() -> redis.Redis:
+    """Get sync Redis client instance (only for code outside the event loop)"""
+    return sync_redis_client
 
 
 # ==================== JWT Token Functions ====================
@@ -44,17 +74,107 @@ def create_refresh_token(user_id: str) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
-def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
-    """Verify a JWT token and return the payload"""
+# ==================== Verified Token Cache ====================
+
+TOKEN_REVOCATION_CHANNEL = "tokens:revoke"
+TOKEN_REVOCATION_TTL = 86400 * settings.REFRESH_TOKEN_EXPIRE_DAYS  # Outlives every token
+
+# sha256(token) -> verified claims, each entry expires with the token's exp
+_token_cache = TTLCache("token", maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+# user_id -> tokens issued before this unix time are revoked (0 = none)
+_revoked_before = TTLCache("token_revocation", maxsize=settings.TOKEN_CACHE_SIZE, ttl=TOKEN_REVOCATION_TTL)
+
+
+def _handle_revocation(message: str) -> None:
+    user_id, _, revoked_at = message.partition(":")
+    _revoked_before.set(user_id, int(revoked_at))
+
+
+# Revocations are checked on every cache hit, so only the revocation map needs resetting
+invalidation.register(TOKEN_REVOCATION_CHANNEL, _handle_revocation, on_reset=_revoked_before.clear)
+
+
+async def _get_revoked_before(user_id: str, use_local: bool) -> int:
+    """Revocation time for a user, looked up in Redis when not known locally"""
+    revoked_at = _revoked_before.get(user_id) if use_local else None
+    if revoked_at is None:
+        try:
+            revoked_at = int(await redis_client.get(f"token_revoked_before:{user_id}") or 0)
+        except Exception:
+            revoked_at = 0  # Redis error, keep accepting signed tokens as before
+        _revoked_before.set(user_id, revoked_at)
+    return revoked_at
+
+
+async def _is_revoked(payload: Dict[str, Any], use_local: bool) -> bool:
+    return payload.get("iat", 0) < await _get_revoked_before(str(payload.get("sub")), use_local)
+
+
+async def revoke_user_tokens(user_id: str) -> None:
+    """Revoke every token issued to a user so far (e.g. after a password reset)"""
+    revoked_at = int(time.time())
+    _revoked_before.set(user_id, revoked_at)
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        if payload.get("type") != token_type:
-            return None
-        return payload
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(f"token_revoked_before:{user_id}", TOKEN_REVOCATION_TTL, revoked_at)
+            pipe.publish(TOKEN_REVOCATION_CHANNEL, f"{user_id}:{revoked_at}")
+            await pipe.execute()
+    except Exception:
+        pass
+
+
+def _decode_token(token: str) -> Optional[Dict[str, Any]]:
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
     except JWTError:
         return None
 
 
+async def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
+    """Verify a JWT token and return the payload
+
+    Verified claims are cached per worker until the token expires, so repeated
+    requests with the same token skip the signature check. Revocations reach
+    every worker through Redis pub/sub; without a listener the cache is bypassed.
+    """
+    use_cache = invalidation.ensure_listener()
+    cache_key = hashlib.sha256(token.encode()).digest()
+
+    payload = _token_cache.get(cache_key) if use_cache else None
+    if payload is None:
+        payload = _decode_token(token)
+        if payload is None:
+            return None
+        if use_cache:
+            _token_cache.set(cache_key, payload, ttl=payload.get("exp", 0) - time.time())
+
+    if payload.get("type") != token_type or await _is_revoked(payload, use_cache):
+        return None
+    return payload
+
+
+def token_subject(token: str) -> Optional[str]:
+    """User id of a validly signed access token, without the revocation check
+
+    Only meant for keying per-user limits; authorization must use verify_token.
+    Reuses claims verify_token cached without touching the cache or its stats,
+    so the rate limiter does not count a lookup of its own per request.
+    """
+    payload = _token_cache.peek(hashlib.sha256(token.encode()).digest())
+    if payload is None:
+        payload = _decode_token(token)
+        if payload is None:
+            return None
+    if payload.get("type") != "access":
+        return None
+    return str(payload.get("sub"))
+
+
+def token_cache_stats() -> Dict[str, Any]:
+    """Hit ratio of the verified-token cache in this worker"""
+    return {**_token_cache.stats.snapshot(), "size": len(_token_cache)}
+
+
 def create_tokens(user_id: str) -> Dict[str, str]:
     """Create both access and refresh tokens"""
     return {
@@ -66,7 +186,7 @@ def create_tokens(user_id: str) -> Dict[str, str]:
 
 # ==================== Session Functions (Legacy - kept for compatibility) ====================
 
-def create_session(user_id: str, user_data: Dict[str, Any]) -> str:
+async def create_session(user_id: str, user_data: Dict[str, Any]) -> str:
     """Create a new session for a user"""
     # Generate cryptographically secure random session ID
     random_token = secrets.token_urlsafe(32)
@@ -74,7 +194,7 @@ def create_session(user_id: str, user_data: Dict[str, Any]) -> str:
 
     # Store user data in Redis (include user_id in data for reference)
     session_data = {**user_data, "user_id": user_id}
-    redis_client.setex(
+    await redis_client.setex(
         session_id,
         settings.SESSION_MAX_AGE,
         json.dumps(session_data)
@@ -83,19 +203,23 @@ def create_session(user_id: str, user_data: Dict[str, Any]) -> str:
     return session_id
 
 
-def get_session(session_id: str) -> Optional[Dict[str, Any]]:
-    """Get session data from Redis"""
-    data = redis_client.get(session_id)
+async def get_session(session_id: str) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Get session data and its remaining TTL from Redis in one round-trip"""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.get(session_id)
+        pipe.ttl(session_id)
+        data, ttl = await pipe.execute()
     if data:
-        return json.loads(data)
-    return None
+        return json.loads(data), ttl
+    return None, ttl
 
 
-def delete_session(session_id: str) -> None:
+async def delete_session(session_id: str) -> None:
     """Delete a session from Redis"""
-    redis_client.delete(session_id)
+    await redis_client.delete(session_id)
 
 
-def refresh_session(session_id: str) -> None:
-    """Refresh session expiration time"""
-    redis_client.expire(session_id, settings.SESSION_MAX_AGE)
+async def refresh_session(session_id: str, remaining_ttl: int) -> None:
+    """Slide session expiration, only once the remaining TTL drops below the threshold"""
+    if remaining_ttl < settings.SESSION_MAX_AGE - settings.SESSION_REFRESH_INTERVAL:
+        await redis_client.expire(session_id, settings.SESSION_MAX_AGE)
@@ -0,0 +1,59 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Tuple, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+
+# Match pydantic's JSON output: UTC datetimes end in "Z"
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Fallback encoder for types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        # Keep the exact string representation (e.g. "1500.00") used by pydantic
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with Decimal support"""
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """Application-wide JSON response rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _json_response(body: bytes, response: Optional[Response]) -> Response:
+    result = Response(content=body, media_type="application/json")
+    if response is not None:
+        # Carry over headers set by dependencies (ETag, Cache-Control, ...)
+        result.headers.raw.extend(response.headers.raw)
+    return result
+
+
+@lru_cache(maxsize=None)
+def _schema_fields(model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def orm_rows_response(model: Type[BaseModel], rows: Iterable[Any], response: Optional[Response] = None) -> Response:
+    """Map ORM rows straight to JSON using the response schema's fields
+
+    Only for schemas whose fields are plain column values: the rows are trusted
+    as-is, which skips pydantic validation and FastAPI's response_model pass.
+    """
+    fields = _schema_fields(model)
+    return _json_response(dumps([{name: getattr(row, name) for name in fields} for row in rows]), response)
+
+
+def model_response(adapter: TypeAdapter, models: Any, response: Optional[Response] = None) -> Response:
+    """Serialize already-built pydantic models through a precompiled TypeAdapter"""
+    return _json_response(adapter.dump_json(models), response)
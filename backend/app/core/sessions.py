@@ -0,0 +1,23 @@
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ScopedSessionMiddleware:
+    """SessionMiddleware for one path prefix only
+
+    Cookie sessions are only needed to carry the OAuth state through the
+    Google login redirect; everywhere else, signing and parsing the cookie is
+    wasted work. The cookie path is set to the prefix as well, so browsers
+    stop sending it with every API request.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str, **session_options):
+        self.app = app
+        self.prefix = prefix
+        self.session_app = SessionMiddleware(app, path=prefix, **session_options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket") and scope["path"].startswith(self.prefix):
+            await self.session_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
@@ -0,0 +1,54 @@
+import mimetypes
+import os
+from typing import Optional
+from urllib.parse import quote
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.config import settings
+from app.utils.avatars import VARIANT_NAME
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def cache_control(filename: str) -> str:
+    """Content-addressed avatar variants never change; anything else is revalidated after a while"""
+    if VARIANT_NAME.match(filename):
+        return IMMUTABLE
+    return f"public, max-age={settings.UPLOADS_MAX_AGE}"
+
+
+class UploadFiles(StaticFiles):
+    """StaticFiles for /uploads that can hand the transfer off to nginx
+
+    With `accel_redirect` set (the prefix of an `internal` nginx location
+    aliased to the uploads directory), the app only resolves and checks the
+    path and answers with an empty X-Accel-Redirect response; nginx then
+    serves the file with sendfile and handles ETag/Last-Modified itself.
+    Otherwise files are served from Python with ETag, Last-Modified, 304s and
+    the same Cache-Control.
+    """
+
+    def __init__(self, *, directory: str, accel_redirect: Optional[str] = None, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.accel_redirect = accel_redirect.rstrip("/") + "/" if accel_redirect else None
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200) -> Response:
+        filename = os.path.basename(full_path)
+        if self.accel_redirect:
+            relative_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            media_type, _ = mimetypes.guess_type(filename)
+            # nginx keeps Content-Type and Cache-Control from this response
+            return Response(
+                status_code=status_code,
+                media_type=media_type or "application/octet-stream",
+                headers={
+                    "X-Accel-Redirect": self.accel_redirect + quote(relative_path),
+                    "Cache-Control": cache_control(filename),
+                },
+            )
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = cache_control(filename)
+        return response
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core import invalidation
+from app.core.passwords import get_pwd_context
+from app.core.security import get_redis_client
+from app.database import engine, replica_engines
+
+logger = logging.getLogger(__name__)
+
+
+def _open_db_connections(count: int) -> None:
+    """Check out `count` connections at once so the pool keeps them open"""
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def warm_db() -> None:
+    await run_in_threadpool(_open_db_connections, min(settings.WARMUP_DB_CONNECTIONS, engine.pool.size()))
+
+
+async def warm_redis() -> None:
+    # Concurrent pings make the pool open several connections
+    redis = get_redis_client()
+    await asyncio.gather(*(redis.ping() for _ in range(settings.WARMUP_REDIS_CONNECTIONS)))
+    await run_in_threadpool(invalidation.ensure_listener)
+
+
+async def warm_oauth() -> None:
+    from app.api.auth import get_oauth
+
+    await get_oauth().google.load_server_metadata()
+
+
+async def warm_password_hashing() -> None:
+    # passlib loads and self-tests the bcrypt backend on first use
+    await run_in_threadpool(lambda: get_pwd_context().handler("bcrypt").get_backend())
+
+
+WARMUP_STEPS = {
+    "db": warm_db,
+    "redis": warm_redis,
+    "oauth": warm_oauth,
+    "password_hashing": warm_password_hashing,
+}
+
+# Only what the first typical (authenticated API) request needs
+FAST_STARTUP_STEPS = ("db", "redis")
+
+
+async def _timed(name: str, step: Callable[[], Awaitable[None]]) -> None:
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(step(), settings.WARMUP_TIMEOUT)
+        logger.info("Warm-up %s done in %.0f ms", name, (time.perf_counter() - start) * 1000)
+    except Exception as error:
+        # Never block startup: the first request will pay the cost instead
+        logger.warning("Warm-up %s failed: %r", name, error)
+
+
+async def warm_up() -> None:
+    """Open connections and load lazy state before the worker takes traffic"""
+    start = time.perf_counter()
+    steps = {
+        name: step for name, step in WARMUP_STEPS.items()
+        if not settings.FAST_STARTUP or name in FAST_STARTUP_STEPS
+    }
+    await asyncio.gather(*(_timed(name, step) for name, step in steps.items()))
+    logger.info("Warm-up finished in %.0f ms", (time.perf_counter() - start) * 1000)
+
+
+async def shut_down() -> None:
+    """Release pooled connections when the worker stops"""
+    try:
+        await get_redis_client().aclose(close_connection_pool=True)
+    except Exception:
+        pass
+    for database in (engine, *replica_engines):
+        await run_in_threadpool(database.dispose)
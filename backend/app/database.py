@@ -1,15 +1,51 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.core.metrics import InstrumentedQueuePool, track_pool_usage
+from app.core.query_stats import instrument_engine
+
+
+def _create_engine(url: str, name: str) -> Engine:
+    """Engine with an instrumented pool; `name` labels its pool metrics
+
+    The pool is per worker process: with WEB_CONCURRENCY workers
+    (gunicorn.conf.py) each database sees up to
+    workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    """
+    new_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
+
+    instrument_engine(new_engine)
+
+    @event.listens_for(new_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        track_pool_usage(new_engine.pool)
+
+    @event.listens_for(new_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        track_pool_usage(new_engine.pool)
+
+    return new_engine
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+engine = _create_engine(settings.DATABASE_URL, "primary")
+
+# Read replicas (optional); sessions are routed to them by app.core.replicas
+replica_engines = [
+    _create_engine(url.strip(), f"replica{index}")
+    for index, url in enumerate(
+        url for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()
+    )
+]
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
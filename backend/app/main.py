@@ -1,17 +1,42 @@
-from fastapi import FastAPI, Request
+import secrets
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
-from starlette.middleware.sessions import SessionMiddleware
-from starlette.middleware.gzip import GZipMiddleware
 from pathlib import Path
 from app.config import settings
+from app.core import scheduler
+from app.core.admission import AdmissionControlMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.health import OK, readiness
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.proxy import TrustedProxyMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.serialization import FastJSONResponse
+from app.core.sessions import ScopedSessionMiddleware
+from app.core.uploads import UploadFiles
+from app.core.warmup import shut_down, warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up each worker and start periodic jobs; release connections on shutdown"""
+    if settings.WARMUP_ENABLED:
+        await warm_up()
+    scheduler.start()
+    yield
+    await scheduler.stop()
+    await shut_down()
+
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
     description="Couple Budget Management Application",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS - must be first middleware added (last to process)
@@ -22,24 +47,27 @@ origins = [
 if settings.FRONTEND_URL not in origins:
     origins.append(settings.FRONTEND_URL)
 
-# Middleware to fix HTTPS scheme behind proxy (for proper redirect URLs)
-@app.middleware("http")
-async def fix_scheme_middleware(request: Request, call_next):
-    # Check X-Forwarded-Proto header from proxy
-    forwarded_proto = request.headers.get("x-forwarded-proto")
-    if forwarded_proto == "https":
-        # Modify scope to use https scheme
-        request.scope["scheme"] = "https"
-    response = await call_next(request)
-    return response
+# Negotiated zstd/br/gzip compression, unless the proxy compresses
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# Cookie sessions only carry the Google OAuth state (authlib)
+app.add_middleware(
+    ScopedSessionMiddleware,
+    prefix="/api/auth/google",
+    secret_key=settings.SECRET_KEY,
+    session_cookie="oauth_session",
+)
+
+# Admission control runs after rate limiting, so rejected clients never take a slot
+app.add_middleware(AdmissionControlMiddleware)
 
-# Add GZip compression (compress responses > 500 bytes)
-app.add_middleware(GZipMiddleware, minimum_size=500)
+# Rate limiting runs inside CORS so 429 responses still carry CORS headers
+app.add_middleware(RateLimitMiddleware)
 
-# Add SessionMiddleware first (will be inner layer)
-app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+# Metrics wrap the limiters so shed and rate-limited responses are counted too
+app.add_middleware(MetricsMiddleware)
 
-# Add CORSMiddleware last (will be outer layer - processes requests first)
+# CORS wraps everything except the proxy header handling below
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -48,10 +76,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost: scheme and client address from trusted proxies, seen by every layer
+# (https redirect URLs, rate limiting per client IP, metrics)
+app.add_middleware(TrustedProxyMiddleware, trusted_proxies=settings.TRUSTED_PROXIES)
+
 # Create uploads directory and mount static files
 uploads_dir = Path("uploads")
 uploads_dir.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount(
+    "/uploads",
+    UploadFiles(directory="uploads", accel_redirect=settings.UPLOADS_ACCEL_REDIRECT),
+    name="uploads",
+)
 
 
 @app.get("/")
@@ -65,11 +101,31 @@ async def root():
 
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness: the worker is up and its event loop responds (no dependency checks)"""
     return {"status": "healthy"}
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: 503 while Postgres/Redis are unreachable or the DB pool is saturated"""
+    report = await readiness()
+    status_code = status.HTTP_200_OK if report["status"] == OK else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(report, status_code=status_code)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics, aggregated over all gunicorn workers"""
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not secrets.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/cors-test")
 async def cors_test():
     """CORS test endpoint"""
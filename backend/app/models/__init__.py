@@ -8,6 +8,7 @@ from app.models.notification_preference import NotificationPreference
 from app.models.notification_log import NotificationLog
 from app.models.recurring_transaction import RecurringTransaction
 from app.models.asset import Asset
+from app.models.settlement_ledger import SettlementLedger
 
 __all__ = [
     "User",
@@ -20,4 +21,5 @@ __all__ = [
     "NotificationLog",
     "RecurringTransaction",
     "Asset",
+    "SettlementLedger",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, func
+from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -11,7 +11,7 @@ class InviteCode(Base):
     __tablename__ = "invite_codes"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    code = Column(String(10), unique=True, nullable=False, index=True)
+    code = Column(String(10), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     used = Column(Boolean, default=False)
@@ -22,5 +22,11 @@ class InviteCode(Base):
     user = relationship("User", foreign_keys=[user_id], back_populates="invite_codes")
     used_by_user = relationship("User", foreign_keys=[used_by])
 
+    __table_args__ = (
+        # Codes are unique among live ones; used codes keep theirs until purged
+        Index('ux_invite_codes_live_code', 'code', unique=True, postgresql_where=text('NOT used')),
+        Index('ix_invite_codes_expires_at', 'expires_at'),
+    )
+
     def __repr__(self):
         return f"<InviteCode {self.code}>"
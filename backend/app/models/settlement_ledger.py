@@ -0,0 +1,23 @@
+from sqlalchemy import Column, ForeignKey, Date, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class SettlementLedger(Base):
+    """Split expenses per couple member and month, by who paid
+
+    Maintained on every flush of split transactions (app/utils/settlement.py).
+    Mirrors the member's own half of each split: my_paid is what they paid,
+    partner_paid what their partner paid, both as original (unsplit) amounts.
+    """
+
+    __tablename__ = "settlement_ledger"
+
+    couple_id = Column(UUID(as_uuid=True), ForeignKey("couples.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), primary_key=True)  # Owner of the split halves; no FK, see settlement.py
+    month = Column(Date, primary_key=True)  # First day of the month
+    my_paid = Column(Numeric(14, 2), nullable=False, default=0)
+    partner_paid = Column(Numeric(14, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SettlementLedger {self.couple_id} {self.user_id} {self.month}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Date, Numeric, Text, func
+from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Date, Numeric, Text, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -21,7 +21,7 @@ class Transaction(Base):
     is_split = Column(Boolean, default=False)  # Flag for split expenses
     original_amount = Column(Numeric(12, 2), nullable=True)  # Original amount for split expenses
     paid_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # Who actually paid (for split expenses)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
@@ -29,5 +29,10 @@ class Transaction(Base):
     couple = relationship("Couple", back_populates="transactions")
     paid_by = relationship("User", foreign_keys=[paid_by_user_id])
 
+    # Admin listing filtered by user, newest first
+    __table_args__ = (
+        Index('ix_transactions_user_id_created_at', 'user_id', 'created_at'),
+    )
+
     def __repr__(self):
         return f"<Transaction {self.type} {self.amount}>"
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, computed_field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 import uuid
 
+from app.utils.avatars import avatar_variants
+
 
 class UserBase(BaseModel):
     """Base user schema"""
@@ -29,5 +31,11 @@ class UserResponse(UserBase):
     created_at: datetime
     updated_at: datetime
 
+    @computed_field
+    @property
+    def picture_variants(self) -> Optional[Dict[str, str]]:
+        """Every size/format of an uploaded avatar, keyed like "256.webp" """
+        return avatar_variants(self.picture_url)
+
     class Config:
         from_attributes = True
@@ -0,0 +1,322 @@
+"""Bulk synthetic data for benchmark-scale databases
+
+Generates users, couples, transactions (with consistent split pairs), budgets,
+recurring templates and assets deterministically from a seed, and loads them
+with PostgreSQL COPY. Category mixes follow app/schemas/transaction.py.
+
+Usage (from backend/, against the database in .env):
+    python -m app.tools.seed --couples 100 --singles 50 --months 12
+    # ~10M transactions:
+    python -m app.tools.seed --couples 3000 --singles 1500 --months 24
+    # Remove everything a previous run created:
+    python -m app.tools.seed --reset-only
+"""
+import argparse
+import calendar
+import csv
+import io
+import math
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+from app.api.assets import ASSET_TYPES
+from app.core.passwords import get_pwd_context
+from app.database import engine
+from app.utils.settlement import REBUILD_SQL as REBUILD_SETTLEMENT_LEDGER_SQL
+from app.schemas.transaction import (
+    ALL_EXPENSE_CATEGORIES,
+    FIXED_EXPENSE_CATEGORIES,
+    INCOME_CATEGORIES,
+)
+
+SEED_EMAIL_DOMAIN = "seed.kakepple.test"
+SEED_PASSWORD = "seed-password"
+
+# category -> (rows per month, min amount, max amount, chance a couple splits it)
+EXPENSE_PROFILE = {
+    "家賃": (1, 60000, 160000, 0.9),
+    "電気・ガス・水道": (3, 2000, 12000, 0.7),
+    "通信費": (1, 2000, 9000, 0.0),
+    "サブスク・保険": (2, 500, 15000, 0.2),
+    "食費": (20, 300, 8000, 0.4),
+    "日用品": (4, 200, 5000, 0.5),
+    "交通費": (6, 200, 3000, 0.0),
+    "交際費": (3, 1000, 12000, 0.3),
+    "医療費": (0.5, 1000, 10000, 0.0),
+    "被服・美容": (1.5, 2000, 20000, 0.0),
+    "趣味・娯楽": (3, 500, 15000, 0.2),
+}
+
+# Main income source and its monthly range; side incomes are occasional
+MAIN_INCOME = {"本業": (0.7, 180000, 450000), "パート": (0.15, 60000, 150000), "アルバイト": (0.15, 40000, 120000)}
+SIDE_INCOME = {"副業": (0.15, 10000, 80000), "その他": (0.05, 1000, 50000)}
+
+TRANSACTION_COLUMNS = (
+    "id", "user_id", "couple_id", "type", "category", "amount", "description", "date",
+    "is_split", "original_amount", "paid_by_user_id", "created_at", "updated_at",
+)
+
+
+class CopyStream(io.TextIOBase):
+    """File-like object feeding generated rows to COPY FROM STDIN in CSV format"""
+
+    def __init__(self, rows: Iterable[Sequence], batch_size: int = 5000):
+        self._rows = iter(rows)
+        self._batch_size = batch_size
+        self._buffer = ""
+        self.count = 0
+
+    def _fill(self) -> bool:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        for _ in range(self._batch_size):
+            row = next(self._rows, None)
+            if row is None:
+                break
+            writer.writerow(row)  # None becomes an unquoted empty field, i.e. NULL
+            self.count += 1
+        chunk = out.getvalue()
+        self._buffer += chunk
+        return bool(chunk)
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while (size < 0 or len(self._buffer) < size) and self._fill():
+            pass
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+class Seeder:
+    """Deterministic generator; the same seed and arguments give the same rows"""
+
+    def __init__(self, seed: int, couples: int, singles: int, months: Sequence[Tuple[int, int]]):
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.months = months
+        self.users: List[uuid.UUID] = []
+        self.couples: List[Tuple[uuid.UUID, uuid.UUID, uuid.UUID]] = []
+        self.partner = {}
+        self.couple_of = {}
+        self.first_member = {}
+
+        for _ in range(couples):
+            first, second, couple_id = self.new_id(), self.new_id(), self.new_id()
+            self.users += [first, second]
+            self.couples.append((couple_id, first, second))
+            self.partner[first], self.partner[second] = second, first
+            self.couple_of[first] = self.couple_of[second] = couple_id
+            self.first_member[couple_id] = first
+        for _ in range(singles):
+            self.users.append(self.new_id())
+
+        first_day = date(*months[0], 1)
+        self.epoch = datetime(first_day.year, first_day.month, first_day.day, tzinfo=timezone.utc)
+
+    def new_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def count(self, mean: float) -> int:
+        """Rows for one month, jittered around the mean"""
+        if mean <= 1:
+            return int(self.rng.random() < mean)
+        return self.rng.randint(math.floor(mean * 0.6), math.ceil(mean * 1.4))
+
+    def amount(self, low: int, high: int) -> int:
+        # Amounts in yen, rounded like real receipts
+        step = 1000 if low >= 10000 else 10
+        return max(step, round(self.rng.randint(low, high) / step) * step)
+
+    def day_in(self, year: int, month: int) -> date:
+        return date(year, month, self.rng.randint(1, calendar.monthrange(year, month)[1]))
+
+    def timestamp(self, day: date) -> datetime:
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(
+            seconds=self.rng.randint(6 * 3600, 23 * 3600)
+        )
+
+    # ==================== Rows ====================
+
+    def user_rows(self) -> Iterator[tuple]:
+        password_hash = get_pwd_context().hash(SEED_PASSWORD)
+        for index, user_id in enumerate(self.users):
+            created = self.epoch - timedelta(days=self.rng.randint(1, 60))
+            yield (
+                user_id, f"seed-{self.seed}-{index}@{SEED_EMAIL_DOMAIN}", f"Seed User {index}",
+                password_hash, True, False, created, created,
+            )
+
+    def couple_rows(self) -> Iterator[tuple]:
+        for couple_id, first, second in self.couples:
+            yield couple_id, first, second, self.epoch
+
+    def transaction_rows(self) -> Iterator[tuple]:
+        for user_id in self.users:
+            couple_id = self.couple_of.get(user_id)
+            partner_id = self.partner.get(user_id)
+            main_income = self.rng.choices(list(MAIN_INCOME), [p for p, _, _ in MAIN_INCOME.values()])[0]
+
+            for year, month in self.months:
+                _, low, high = MAIN_INCOME[main_income]
+                yield self._row(user_id, None, "income", main_income, self.amount(low, high),
+                                date(year, month, min(25, calendar.monthrange(year, month)[1])))
+                for category in INCOME_CATEGORIES:
+                    if category not in SIDE_INCOME:
+                        continue
+                    chance, low, high = SIDE_INCOME[category]
+                    if self.rng.random() < chance:
+                        yield self._row(user_id, None, "income", category, self.amount(low, high),
+                                        self.day_in(year, month))
+
+                for category in ALL_EXPENSE_CATEGORIES:
+                    per_month, low, high, split_chance = EXPENSE_PROFILE[category]
+                    # Shared fixed costs (rent, utilities) are paid by one partner per couple
+                    shared = category in FIXED_EXPENSE_CATEGORIES and split_chance >= 0.5
+                    if couple_id and shared and user_id != self.first_member[couple_id]:
+                        continue
+                    for _ in range(self.count(per_month)):
+                        day = self.day_in(year, month)
+                        amount = self.amount(low, high)
+                        if couple_id and self.rng.random() < split_chance:
+                            yield from self._split_pair(user_id, partner_id, couple_id, category, amount, day)
+                        else:
+                            yield self._row(user_id, None, "expense", category, amount, day)
+
+    def _row(self, user_id, couple_id, type_, category, amount, day, description=None,
+             is_split=False, original_amount=None, paid_by=None) -> tuple:
+        created = self.timestamp(day)
+        return (
+            self.new_id(), user_id, couple_id, type_, category, amount, description, day,
+            is_split, original_amount, paid_by, created, created,
+        )
+
+    def _split_pair(self, payer_id, partner_id, couple_id, category, original, day) -> Iterator[tuple]:
+        """Both halves of a split expense, as created by the transactions API"""
+        half = math.ceil(original / 2)
+        yield self._row(payer_id, couple_id, "expense", category, half, day, category,
+                        True, original, payer_id)
+        yield self._row(partner_id, couple_id, "expense", category, half, day, f"{category} (割り勘)",
+                        True, original, payer_id)
+
+    def budget_rows(self) -> Iterator[tuple]:
+        for year, month in self.months:
+            created = datetime(year, month, 1, tzinfo=timezone.utc)
+            for user_id in self.users:
+                yield (self.new_id(), user_id, None, "personal", "monthly_total", None,
+                       self.amount(80000, 250000), year, month, True, created, created)
+                for category in self.rng.sample(ALL_EXPENSE_CATEGORIES, 2):
+                    _, low, high, _ = EXPENSE_PROFILE[category]
+                    yield (self.new_id(), user_id, None, "personal", "category", category,
+                           self.amount(low * 4, high * 4), year, month, True, created, created)
+            for couple_id, _, _ in self.couples:
+                yield (self.new_id(), None, couple_id, "couple", "monthly_total", None,
+                       self.amount(150000, 400000), year, month, True, created, created)
+
+    def recurring_rows(self) -> Iterator[tuple]:
+        for user_id in self.users:
+            templates = [("income", "本業", 250000, 25, False), ("expense", "サブスク・保険", 1500, 10, False)]
+            if user_id in self.couple_of:
+                templates.append(("expense", "家賃", 100000, 27, True))
+            for type_, category, amount, day_of_month, is_split in templates:
+                yield (self.new_id(), user_id, type_, category, amount, None, "monthly", day_of_month,
+                       None, is_split, True, None, None, self.epoch, self.epoch)
+
+    def asset_rows(self) -> Iterator[tuple]:
+        for user_id in self.users:
+            for asset_type in self.rng.sample(ASSET_TYPES, self.rng.randint(0, 3)):
+                yield (self.new_id(), user_id, f"{asset_type} account", asset_type,
+                       self.amount(10000, 5000000), None, self.epoch, self.epoch)
+
+
+# ==================== Loading ====================
+
+TABLES = (
+    ("users", ("id", "email", "name", "password_hash", "email_verified", "is_admin",
+               "created_at", "updated_at"), "user_rows"),
+    ("couples", ("id", "user1_id", "user2_id", "created_at"), "couple_rows"),
+    ("transactions", TRANSACTION_COLUMNS, "transaction_rows"),
+    ("budgets", ("id", "user_id", "couple_id", "scope", "budget_type", "category", "amount",
+                 "year", "month", "is_active", "created_at", "updated_at"), "budget_rows"),
+    ("recurring_transactions", ("id", "user_id", "type", "category", "amount", "description",
+                                "frequency", "day_of_month", "day_of_week", "is_split", "is_active",
+                                "last_created_at", "next_due_date", "created_at", "updated_at"),
+     "recurring_rows"),
+    ("assets", ("id", "user_id", "name", "asset_type", "amount", "description",
+                "created_at", "updated_at"), "asset_rows"),
+)
+
+
+def copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    stream = CopyStream(rows)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", stream
+    )
+    return stream.count
+
+
+def reset(cursor) -> None:
+    """Delete users from previous runs; cascades to all their rows"""
+    cursor.execute("DELETE FROM users WHERE email LIKE %s", (f"%@{SEED_EMAIL_DOMAIN}",))
+    print(f"removed {cursor.rowcount} seeded users")
+
+
+def month_range(end: Tuple[int, int], count: int) -> List[Tuple[int, int]]:
+    year, month = end
+    months = []
+    for _ in range(count):
+        months.append((year, month))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return months[::-1]
+
+
+def main():
+    today = date.today()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--couples", type=int, default=100)
+    parser.add_argument("--singles", type=int, default=50)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--end-month", default=f"{today.year}-{today.month:02d}", help="YYYY-MM")
+    parser.add_argument("--reset", action="store_true", help="Delete previously seeded users first")
+    parser.add_argument("--reset-only", action="store_true")
+    args = parser.parse_args()
+
+    end_year, end_month = (int(part) for part in args.end_month.split("-"))
+    seeder = Seeder(args.seed, args.couples, args.singles, month_range((end_year, end_month), args.months))
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if args.reset or args.reset_only:
+            reset(cursor)
+        if not args.reset_only:
+            for table, columns, generator in TABLES:
+                start = time.perf_counter()
+                count = copy_rows(cursor, table, columns, getattr(seeder, generator)())
+                elapsed = time.perf_counter() - start
+                print(f"{table:<24} {count:>10} rows  {elapsed:7.1f} s  {count / elapsed:10.0f} rows/s")
+            # COPY bypasses the session hooks that maintain the ledger
+            start = time.perf_counter()
+            cursor.execute(REBUILD_SETTLEMENT_LEDGER_SQL)
+            print(f"{'settlement_ledger':<24} {cursor.rowcount:>10} rows  {time.perf_counter() - start:7.1f} s")
+        connection.commit()
+
+        if not args.reset_only:
+            # Fresh statistics so the planner sees benchmark-scale tables
+            for table, _, _ in TABLES:
+                cursor.execute(f"ANALYZE {table}")
+            cursor.execute("ANALYZE settlement_ledger")
+            connection.commit()
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import scheduler
+from app.core.security import get_redis_client, get_sync_redis_client
+from app.database import engine
+
+JOB_NAME = "admin_analytics"
+REFRESHED_AT_KEY = "admin:analytics:refreshed_at"
+
+# Created by the add_admin_analytics_views migration; endpoints read nothing else
+VIEWS = ("admin_daily_metrics", "admin_retention_cohorts")
+
+# Per-bucket aggregate of each daily series. Active users are averaged (mean
+# DAU over the bucket) since summing distinct users across days double counts.
+SERIES = {
+    "signups": "sum(signups)",
+    "active-users": "avg(active_users)",
+    "transactions": "sum(transactions)",
+    "couples": "sum(couples_formed)",
+}
+
+SERIES_SQL = """
+    SELECT date_trunc(:bucket, day::timestamp)::date AS period, {aggregate} AS value, NULL AS rate
+    FROM admin_daily_metrics
+    WHERE day BETWEEN :start AND :end
+    GROUP BY 1
+    ORDER BY 1
+"""
+
+# Couples formed per bucket, plus the share of all users signed up so far who
+# are in a couple at the end of the bucket
+COUPLES_SQL = text("""
+    WITH daily AS (
+        SELECT day, couples_formed,
+               sum(couples_formed) OVER (ORDER BY day) AS couples_total,
+               sum(signups) OVER (ORDER BY day) AS users_total
+        FROM admin_daily_metrics
+    )
+    SELECT date_trunc(:bucket, day::timestamp)::date AS period,
+           sum(couples_formed) AS value,
+           2 * max(couples_total)::float / nullif(max(users_total), 0) AS rate
+    FROM daily
+    WHERE day BETWEEN :start AND :end
+    GROUP BY 1
+    ORDER BY 1
+""")
+
+COHORT_SIZES_SQL = text("""
+    SELECT date_trunc('month', day::timestamp)::date AS cohort, sum(signups) AS size
+    FROM admin_daily_metrics
+    WHERE day BETWEEN :start AND :end
+    GROUP BY 1
+    ORDER BY 1
+""")
+
+RETENTION_SQL = text("""
+    SELECT cohort, month_offset, active_users
+    FROM admin_retention_cohorts
+    WHERE cohort BETWEEN :start AND :end AND month_offset <= :months
+""")
+
+POPULATED_SQL = text("SELECT ispopulated FROM pg_matviews WHERE matviewname = :view")
+
+# object_not_in_prerequisite_state: the view was never refreshed
+NOT_POPULATED = "55000"
+
+
+class AnalyticsNotReady(Exception):
+    """The views have not been populated yet"""
+
+
+def _read(db: Session, statement, params: Dict[str, Any]) -> List[Any]:
+    try:
+        return db.execute(statement, params).all()
+    except DBAPIError as e:
+        if getattr(e.orig, "pgcode", None) != NOT_POPULATED:
+            raise
+        db.rollback()
+        raise AnalyticsNotReady() from e
+
+
+def series(db: Session, metric: str, bucket: str, start: date, end: date) -> List[Dict[str, Any]]:
+    """Time-bucketed points of one metric between start and end (inclusive)"""
+    if metric == "couples":
+        statement = COUPLES_SQL
+    else:
+        statement = text(SERIES_SQL.format(aggregate=SERIES[metric]))
+    rows = _read(db, statement, {"bucket": bucket, "start": start, "end": end})
+    return [
+        {"period": period, "value": float(value), "rate": rate}
+        for period, value, rate in rows
+    ]
+
+
+def _months_between(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + end.month - start.month
+
+
+def retention(db: Session, start: date, end: date, months: int) -> List[Dict[str, Any]]:
+    """Monthly signup cohorts with the share of each active 0..months months later"""
+    # Whole cohort months: the active counts cover everyone who signed up in
+    # the month, so the sizes must too or the last ratio can exceed 1
+    start = start.replace(day=1)
+    end = (end.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    params = {"start": start, "end": end, "months": months}
+    sizes = _read(db, COHORT_SIZES_SQL, params)
+    active = {
+        (cohort, offset): users
+        for cohort, offset, users in _read(db, RETENTION_SQL, params)
+    }
+    today = datetime.now(timezone.utc).date()
+    cohorts = []
+    for cohort, size in sizes:
+        size = int(size)
+        elapsed = min(months, _months_between(cohort, today))
+        cohorts.append({
+            "cohort": cohort,
+            "size": size,
+            "retention": [
+                active.get((cohort, offset), 0) / size if size else 0.0
+                for offset in range(elapsed + 1)
+            ],
+        })
+    return cohorts
+
+
+def refresh_views() -> None:
+    """Rebuild the analytics views from the base tables"""
+    for view in VIEWS:
+        with engine.begin() as connection:
+            populated = connection.execute(POPULATED_SQL, {"view": view}).scalar()
+            # CONCURRENTLY keeps the view readable while it is rebuilt, but
+            # only works once the view has been populated
+            concurrently = "CONCURRENTLY " if populated else ""
+            connection.execute(text(f"REFRESH MATERIALIZED VIEW {concurrently}{view}"))
+    get_sync_redis_client().set(REFRESHED_AT_KEY, datetime.now(timezone.utc).isoformat())
+
+
+async def get_refreshed_at() -> Optional[datetime]:
+    try:
+        refreshed_at = await get_redis_client().get(REFRESHED_AT_KEY)
+    except Exception:
+        return None
+    return datetime.fromisoformat(refreshed_at) if refreshed_at else None
+
+
+scheduler.register(JOB_NAME, settings.ADMIN_ANALYTICS_REFRESH_INTERVAL, refresh_views)
@@ -0,0 +1,110 @@
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import bindparam, text
+
+from app.config import settings
+from app.core import scheduler
+from app.core.security import get_redis_client, get_sync_redis_client
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "admin:stats"
+JOB_NAME = "admin_stats"
+
+# Every counter in one pass per table; runs on the schedule, never per page load
+STATS_SQL = text("""
+    SELECT
+        u.total AS total_users,
+        u.this_month AS users_this_month,
+        (SELECT count(*) FROM couples) AS total_couples,
+        t.total AS total_transactions,
+        t.this_month AS transactions_this_month,
+        t.income AS total_income,
+        t.expense AS total_expense
+    FROM
+        (SELECT count(*) AS total,
+                count(*) FILTER (WHERE created_at >= :month_start) AS this_month
+         FROM users) AS u,
+        (SELECT count(*) AS total,
+                count(*) FILTER (WHERE created_at >= :month_start) AS this_month,
+                coalesce(sum(amount) FILTER (WHERE type = 'income'), 0) AS income,
+                coalesce(sum(amount) FILTER (WHERE type = 'expense'), 0) AS expense
+         FROM transactions) AS t
+""")
+
+# Planner row estimates (kept current by autovacuum/ANALYZE); -1 if never analyzed
+ESTIMATES_SQL = text("""
+    SELECT relname, reltuples::bigint
+    FROM pg_class
+    WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace AND relname IN :tables
+""").bindparams(bindparam("tables", expanding=True))
+
+# Index range scans on created_at
+THIS_MONTH_SQL = text("""
+    SELECT
+        (SELECT count(*) FROM users WHERE created_at >= :month_start) AS users_this_month,
+        (SELECT count(*) FROM transactions WHERE created_at >= :month_start) AS transactions_this_month
+""")
+
+
+def _month_start() -> datetime:
+    now = datetime.now(timezone.utc)
+    return datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+
+
+def compute_stats() -> Dict[str, Any]:
+    """Exact statistics; scans users and transactions once each"""
+    with engine.connect() as connection:
+        row = connection.execute(STATS_SQL, {"month_start": _month_start()}).mappings().one()
+    return {
+        **{key: int(row[key]) for key in (
+            "total_users", "users_this_month", "total_couples",
+            "total_transactions", "transactions_this_month",
+        )},
+        "total_income": float(row["total_income"]),
+        "total_expense": float(row["total_expense"]),
+        "estimated": False,
+        "refreshed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def estimate_stats() -> Dict[str, Any]:
+    """Statistics without scanning: catalog estimates for the totals, no sums"""
+    with engine.connect() as connection:
+        estimates = dict(connection.execute(
+            ESTIMATES_SQL, {"tables": ["users", "couples", "transactions"]}
+        ).all())
+        this_month = connection.execute(THIS_MONTH_SQL, {"month_start": _month_start()}).mappings().one()
+    return {
+        "total_users": max(estimates.get("users", 0), 0),
+        "users_this_month": this_month["users_this_month"],
+        "total_couples": max(estimates.get("couples", 0), 0),
+        "total_transactions": max(estimates.get("transactions", 0), 0),
+        "transactions_this_month": this_month["transactions_this_month"],
+        "total_income": None,
+        "total_expense": None,
+        "estimated": True,
+        "refreshed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def refresh_stats() -> None:
+    """Recompute the exact statistics and publish them to all workers"""
+    stats = compute_stats()
+    # Outlive a few missed refreshes, so a slow or failed run does not empty the cache
+    get_sync_redis_client().setex(STATS_KEY, settings.ADMIN_STATS_REFRESH_INTERVAL * 3, json.dumps(stats))
+
+
+async def get_cached_stats() -> Optional[Dict[str, Any]]:
+    try:
+        cached = await get_redis_client().get(STATS_KEY)
+    except Exception:
+        return None
+    return json.loads(cached) if cached else None
+
+
+scheduler.register(JOB_NAME, settings.ADMIN_STATS_REFRESH_INTERVAL, refresh_stats)
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional
+
+from app.config import settings
+
+AVATARS_DIR = Path("uploads/avatars")
+AVATARS_URL = "/uploads/avatars"
+
+# Square sizes in px: 96 covers the list/header avatars (32-48 px) at 2x,
+# 256 the account page. picture_url points at DEFAULT_SIZE.
+SIZES = (96, 256)
+DEFAULT_SIZE = 96
+# WebP first; JPEG for clients that cannot decode it
+FORMATS = {"webp": {"quality": 80, "method": 4}, "jpg": {"quality": 85, "optimize": True, "progressive": True}}
+DEFAULT_FORMAT = "webp"
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+MAX_PIXELS = 40_000_000  # Rejects decompression bombs before decoding
+CHUNK_SIZE = 64 * 1024
+
+# {user_id}/{content hash}-{size}.{format}; the hash makes every file immutable
+VARIANT_NAME = re.compile(r"^(?P<digest>[0-9a-f]{20})-(?P<size>\d+)\.(?P<format>webp|jpg)$")
+
+# Decoding and resizing are CPU-bound; Pillow releases the GIL while doing it
+_executor = ThreadPoolExecutor(max_workers=settings.AVATAR_WORKERS, thread_name_prefix="avatar")
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+class ImageTooLarge(ValueError):
+    pass
+
+
+def _digest(upload: BinaryIO) -> str:
+    """Hash the upload in chunks, enforcing the size limit without reading it into memory"""
+    sha = hashlib.sha256()
+    total = 0
+    upload.seek(0)
+    while chunk := upload.read(CHUNK_SIZE):
+        total += len(chunk)
+        if total > MAX_UPLOAD_BYTES:
+            raise ImageTooLarge()
+        sha.update(chunk)
+    upload.seek(0)
+    return sha.hexdigest()[:20]
+
+
+def _write_atomic(image, path: Path, format: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    image.save(tmp_path, format="JPEG" if format == "jpg" else "WEBP", **FORMATS[format])
+    os.replace(tmp_path, path)
+
+
+def _render_variants(upload: BinaryIO, user_dir: Path, digest: str) -> None:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(upload) as source:
+            width, height = source.size
+            if width * height > MAX_PIXELS:
+                raise InvalidImage()
+            # JPEG can decode at a fraction of the resolution, which is far cheaper
+            source.draft("RGB", (max(SIZES), max(SIZES)))
+            image = ImageOps.exif_transpose(source)  # First frame only for GIFs
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as error:
+        raise InvalidImage() from error
+
+    user_dir.mkdir(parents=True, exist_ok=True)
+    for size in SIZES:
+        square = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        _write_atomic(square, user_dir / f"{digest}-{size}.webp", "webp")
+        if square.mode == "RGBA":
+            # JPEG has no alpha: flatten transparent areas onto white
+            background = Image.new("RGB", square.size, (255, 255, 255))
+            background.paste(square, mask=square.getchannel("A"))
+            square = background
+        _write_atomic(square, user_dir / f"{digest}-{size}.jpg", "jpg")
+
+
+def _process(upload: BinaryIO, user_id: str) -> str:
+    digest = _digest(upload)
+    user_dir = AVATARS_DIR / user_id
+    # Same content uploaded again: the variants already exist
+    if not all((user_dir / f"{digest}-{size}.{format}").exists() for size in SIZES for format in FORMATS):
+        _render_variants(upload, user_dir, digest)
+    remove_avatar_files(user_id, keep=digest)
+    return variant_url(user_id, digest, DEFAULT_SIZE, DEFAULT_FORMAT)
+
+
+async def save_avatar(upload: BinaryIO, user_id: str) -> str:
+    """Re-encode an uploaded image into the avatar variants; returns the default variant's URL
+
+    Raises InvalidImage or ImageTooLarge.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_executor, _process, upload, user_id)
+
+
+def variant_url(user_id: str, digest: str, size: int, format: str) -> str:
+    return f"{AVATARS_URL}/{user_id}/{digest}-{size}.{format}"
+
+
+def avatar_variants(picture_url: Optional[str]) -> Optional[Dict[str, str]]:
+    """URLs of every size/format of an uploaded avatar, keyed like "256.webp" """
+    if not picture_url or not picture_url.startswith(AVATARS_URL + "/"):
+        return None
+    user_id, _, name = picture_url[len(AVATARS_URL) + 1:].rpartition("/")
+    match = VARIANT_NAME.match(name)
+    if not user_id or not match:
+        return None  # Uploaded before variants existed
+    digest = match["digest"]
+    return {
+        f"{size}.{format}": variant_url(user_id, digest, size, format)
+        for size in SIZES for format in FORMATS
+    }
+
+
+def remove_avatar_files(user_id: str, keep: Optional[str] = None) -> None:
+    """Delete a user's stored avatars, except the variants of the `keep` hash"""
+    user_dir = AVATARS_DIR / user_id
+    if keep is None:
+        shutil.rmtree(user_dir, ignore_errors=True)
+    elif user_dir.is_dir():
+        for path in user_dir.iterdir():
+            if not path.name.startswith(f"{keep}-"):
+                path.unlink(missing_ok=True)
+    # Single-file avatars from before variants existed
+    for ext in (".jpg", ".jpeg", ".png", ".gif", ".webp"):
+        (AVATARS_DIR / f"{user_id}{ext}").unlink(missing_ok=True)
@@ -1,56 +1,177 @@
-import random
+import json
+import logging
+import secrets
 import string
+import uuid
 from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+from sqlalchemy import text, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import scheduler
+from app.core.security import get_redis_client
+from app.database import engine
 from app.models.invite_code import InviteCode
 
+logger = logging.getLogger(__name__)
+
+CODE_CHARACTERS = string.ascii_uppercase + string.digits
+
+# 36^8 codes against a handful of live ones: a retry is already very unlikely
+MAX_ATTEMPTS = 5
+
+PURGE_JOB_NAME = "invite_code_purge"
+
+# Expired codes can never validate again, used ones expire like the rest
+PURGE_SQL = text("""
+    DELETE FROM invite_codes
+    WHERE id IN (SELECT id FROM invite_codes WHERE expires_at < now() LIMIT :batch_size)
+""")
+
+
+class LiveInviteCode(NamedTuple):
+    id: uuid.UUID
+    code: str
+    user_id: uuid.UUID
+    expires_at: datetime
+
+
+def _cache_key(code: str) -> str:
+    return f"invite_code:{code}"
+
 
 def generate_invite_code(length: int = 8) -> str:
     """Generate a random invite code"""
-    characters = string.ascii_uppercase + string.digits
-    return ''.join(random.choice(characters) for _ in range(length))
+    return ''.join(secrets.choice(CODE_CHARACTERS) for _ in range(length))
 
 
-def create_invite_code(db: Session, user_id: str, hours_valid: int = 24) -> InviteCode:
-    """Create a new invite code for a user"""
-    # Generate unique code
-    while True:
-        code = generate_invite_code()
-        existing = db.query(InviteCode).filter(InviteCode.code == code).first()
-        if not existing:
-            break
+async def _cache_live_code(invite_code: InviteCode) -> None:
+    """Publish a live code to Redis until it expires"""
+    if not settings.INVITE_CODE_CACHE_ENABLED:
+        return
+    ttl = int((invite_code.expires_at - datetime.now(timezone.utc)).total_seconds())
+    if ttl <= 0:
+        return
+    try:
+        await get_redis_client().setex(_cache_key(invite_code.code), ttl, json.dumps({
+            "id": str(invite_code.id),
+            "user_id": str(invite_code.user_id),
+            "expires_at": invite_code.expires_at.isoformat(),
+        }))
+    except Exception:
+        pass  # Validation falls back to Postgres
+
 
-    # Create invite code with expiration
+async def create_invite_code(db: Session, user_id: str, hours_valid: int = 24) -> InviteCode:
+    """Create a new invite code for a user"""
     expires_at = datetime.now(timezone.utc) + timedelta(hours=hours_valid)
 
-    invite_code = InviteCode(
-        code=code,
-        user_id=user_id,
-        expires_at=expires_at
-    )
+    # Codes only have to be unique among live ones (partial unique index), so
+    # a collision is detected by the insert itself instead of a SELECT first
+    for _ in range(MAX_ATTEMPTS):
+        statement = insert(InviteCode).values(
+            code=generate_invite_code(),
+            user_id=user_id,
+            expires_at=expires_at
+        ).on_conflict_do_nothing(
+            index_elements=[InviteCode.code], index_where=~InviteCode.used
+        ).returning(InviteCode)
+        invite_code = db.execute(statement).scalar_one_or_none()
+        if invite_code is not None:
+            break
+    else:
+        raise RuntimeError("Could not generate a unique invite code")
 
-    db.add(invite_code)
     db.commit()
-    db.refresh(invite_code)
+    await _cache_live_code(invite_code)
 
     return invite_code
 
 
-def validate_invite_code(db: Session, code: str) -> tuple[bool, str, InviteCode | None]:
+async def _cached_live_code(code: str) -> Optional[LiveInviteCode]:
+    if not settings.INVITE_CODE_CACHE_ENABLED:
+        return None
+    try:
+        cached = await get_redis_client().get(_cache_key(code))
+    except Exception:
+        return None
+    if not cached:
+        return None
+    data = json.loads(cached)
+    return LiveInviteCode(
+        id=uuid.UUID(data["id"]),
+        code=code,
+        user_id=uuid.UUID(data["user_id"]),
+        expires_at=datetime.fromisoformat(data["expires_at"])
+    )
+
+
+async def validate_invite_code(db: Session, code: str) -> tuple[bool, str, LiveInviteCode | None]:
     """Validate an invite code
 
+    Live codes are answered from Redis; Postgres is only asked on a miss.
+
     Returns:
         (is_valid, error_message, invite_code)
     """
-    invite_code = db.query(InviteCode).filter(InviteCode.code == code).first()
+    cached = await _cached_live_code(code)
+    if cached is not None:
+        return True, "", cached
+
+    # ~used matches the partial index predicate
+    invite_code = db.query(InviteCode).filter(InviteCode.code == code, ~InviteCode.used).first()
 
     if not invite_code:
+        # Not indexed, but the purge keeps the table down to recent codes
+        if db.query(InviteCode.id).filter(InviteCode.code == code).first():
+            return False, "Invite code has already been used", None
         return False, "Invalid invite code", None
 
-    if invite_code.used:
-        return False, "Invite code has already been used", None
-
     if datetime.now(timezone.utc) > invite_code.expires_at:
         return False, "Invite code has expired", None
 
-    return True, "", invite_code
+    return True, "", LiveInviteCode(invite_code.id, invite_code.code, invite_code.user_id, invite_code.expires_at)
+
+
+async def consume_invite_code(db: Session, invite_code: LiveInviteCode, used_by) -> bool:
+    """Mark a validated code as used, unless someone else used it first
+
+    Part of the caller's transaction; False if the code is no longer live.
+    """
+    result = db.execute(
+        update(InviteCode)
+        .where(
+            InviteCode.id == invite_code.id,
+            ~InviteCode.used,
+            InviteCode.expires_at > datetime.now(timezone.utc)
+        )
+        .values(used=True, used_by=used_by)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+    try:
+        await get_redis_client().delete(_cache_key(invite_code.code))
+    except Exception:
+        pass  # Expires on its own; a stale hit still fails the update above
+    return True
+
+
+def purge_expired_codes() -> None:
+    """Delete expired codes in small batches, each in its own short transaction"""
+    batch_size = settings.INVITE_CODE_PURGE_BATCH_SIZE
+    deleted = 0
+    while True:
+        with engine.begin() as connection:
+            count = connection.execute(PURGE_SQL, {"batch_size": batch_size}).rowcount
+        deleted += count
+        if count < batch_size:
+            break
+    if deleted:
+        logger.info("Purged %d expired invite codes", deleted)
+
+
+scheduler.register(PURGE_JOB_NAME, settings.INVITE_CODE_PURGE_INTERVAL, purge_expired_codes)
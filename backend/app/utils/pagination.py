@@ -0,0 +1,74 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.orm import Query, Session
+
+# Filtered listings count at most this many rows; past it the total is a lower bound
+COUNT_LIMIT = 1000
+
+# Planner row estimate (kept current by autovacuum/ANALYZE); -1 if never analyzed
+RELTUPLES_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+
+def escape_like(value: str) -> str:
+    """Match `value` literally inside a LIKE/ILIKE pattern"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    payload = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(payload)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_page(query: Query, model, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List, Optional[str]]:
+    """Newest-first page of `model` rows after `cursor`, keyed on (created_at, id)
+
+    The row comparison seeks straight into the created_at index, so deep pages
+    cost the same as the first one. `offset` is only honoured without a cursor,
+    for clients that still page by offset.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, id))
+    elif offset:
+        query = query.offset(offset)
+    # One extra row tells whether there is a next page without counting
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created_at, last.id)
+
+
+def estimated_total(db: Session, query: Query, table: str, filtered: bool) -> Tuple[int, bool]:
+    """Row count for a listing as (total, estimated)
+
+    Unfiltered listings of large tables use the planner estimate; everything
+    else is counted exactly up to COUNT_LIMIT rows.
+    """
+    if not filtered:
+        estimate = db.execute(RELTUPLES_SQL, {"table": table}).scalar()
+        if estimate is not None and estimate >= COUNT_LIMIT:
+            return int(estimate), True
+    capped = query.order_by(None).limit(COUNT_LIMIT + 1).subquery()
+    count = db.execute(select(func.count()).select_from(capped)).scalar()
+    if count > COUNT_LIMIT:
+        return COUNT_LIMIT, True
+    return count, False
@@ -0,0 +1,222 @@
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, Numeric, bindparam, event, func, inspect, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.settlement_ledger import SettlementLedger
+from app.models.transaction import Transaction
+
+ZERO = Decimal("0.00")
+
+# Attributes of a transaction that decide its ledger entry
+LEDGER_FIELDS = ("couple_id", "user_id", "type", "is_split", "paid_by_user_id", "original_amount", "amount", "date")
+
+# Each member's half of a split expense counts at the original amount
+SPLIT_PAID_SQL = "coalesce(nullif(original_amount, 0), amount * 2)"
+SPLIT_EXPENSES_SQL = "couple_id IS NOT NULL AND is_split AND type = 'expense' AND paid_by_user_id IS NOT NULL"
+
+# Skips couples deleted in the same flush; their ledger rows went with them.
+# There is no FK to users for the same reason (a user delete cascades to the
+# couple in the database, not through the session).
+APPLY_SQL = text("""
+    INSERT INTO settlement_ledger (couple_id, user_id, month, my_paid, partner_paid)
+    SELECT :couple_id, :user_id, :month, :my_paid, :partner_paid
+    WHERE EXISTS (SELECT 1 FROM couples WHERE id = :couple_id)
+    ON CONFLICT (couple_id, user_id, month) DO UPDATE SET
+        my_paid = settlement_ledger.my_paid + excluded.my_paid,
+        partner_paid = settlement_ledger.partner_paid + excluded.partner_paid
+""").bindparams(
+    bindparam("couple_id", type_=UUID(as_uuid=True)),
+    bindparam("user_id", type_=UUID(as_uuid=True)),
+    bindparam("month", type_=Date),
+    bindparam("my_paid", type_=Numeric(14, 2)),
+    bindparam("partner_paid", type_=Numeric(14, 2)),
+)
+
+# Recomputes the whole ledger, for rows written outside the ORM (COPY, raw SQL)
+REBUILD_SQL = f"""
+    DELETE FROM settlement_ledger;
+    INSERT INTO settlement_ledger (couple_id, user_id, month, my_paid, partner_paid)
+    SELECT
+        couple_id,
+        user_id,
+        date_trunc('month', date::timestamp)::date,
+        coalesce(sum(paid) FILTER (WHERE paid_by_user_id = user_id), 0),
+        coalesce(sum(paid) FILTER (WHERE paid_by_user_id <> user_id), 0)
+    FROM (
+        SELECT couple_id, user_id, date, paid_by_user_id, {SPLIT_PAID_SQL} AS paid
+        FROM transactions
+        WHERE {SPLIT_EXPENSES_SQL}
+    ) AS split
+    GROUP BY 1, 2, 3
+"""
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+# ==================== Write Side: Ledger Maintenance ====================
+
+def _ledger_values(obj: Transaction, old: bool) -> Dict[str, Any]:
+    """Current attribute values, or the ones loaded before this flush's changes"""
+    state = inspect(obj)
+    values = {}
+    for name in LEDGER_FIELDS:
+        attr = state.attrs[name]
+        history = attr.history
+        values[name] = history.deleted[0] if old and history.deleted else attr.value
+    return values
+
+
+def _ledger_entry(values: Dict[str, Any]) -> Optional[Tuple[tuple, Decimal, Decimal]]:
+    """(couple, member, month) and the (my_paid, partner_paid) a transaction adds"""
+    if not (
+        values["couple_id"] and values["is_split"]
+        and values["type"] == "expense" and values["paid_by_user_id"]
+    ):
+        return None
+    paid = Decimal(str(values["original_amount"] or values["amount"] * 2))
+    user_id = uuid.UUID(str(values["user_id"]))
+    key = (uuid.UUID(str(values["couple_id"])), user_id, month_start(values["date"]))
+    if uuid.UUID(str(values["paid_by_user_id"])) == user_id:
+        return key, paid, ZERO
+    return key, ZERO, paid
+
+
+def _load_old_value(target: Transaction, value, oldvalue, initiator) -> None:
+    pass  # Registering with active_history is what loads the old value
+
+
+# Setting an expired attribute (e.g. after a commit) records no old value
+# unless it is loaded first, and the delta would then subtract the new one
+for _name in LEDGER_FIELDS:
+    event.listen(getattr(Transaction, _name), "set", _load_old_value, active_history=True)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _apply_ledger_changes(session: Session, flush_context) -> None:
+    deltas = defaultdict(lambda: [ZERO, ZERO])
+
+    def add(values: Dict[str, Any], sign: int) -> None:
+        entry = _ledger_entry(values)
+        if entry:
+            key, my_paid, partner_paid = entry
+            deltas[key][0] += sign * my_paid
+            deltas[key][1] += sign * partner_paid
+
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            add(_ledger_values(obj, old=False), 1)
+    for obj in session.dirty:
+        if isinstance(obj, Transaction) and session.is_modified(obj):
+            add(_ledger_values(obj, old=True), -1)
+            add(_ledger_values(obj, old=False), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Transaction):
+            add(_ledger_values(obj, old=True), -1)
+
+    rows = [
+        {"couple_id": couple_id, "user_id": user_id, "month": month, "my_paid": my_paid, "partner_paid": partner_paid}
+        for (couple_id, user_id, month), (my_paid, partner_paid) in deltas.items()
+        if my_paid or partner_paid
+    ]
+    if rows:
+        # Same transaction as the flush, so the ledger commits or rolls back with it
+        session.connection().execute(APPLY_SQL, rows)
+
+
+# ==================== Read Side ====================
+
+def _ledger_totals(db: Session, couple_id, user_id, start: Optional[date], end: Optional[date]) -> Tuple[Decimal, Decimal]:
+    """Sum of the ledger months in [start, end)"""
+    query = db.query(
+        func.coalesce(func.sum(SettlementLedger.my_paid), 0),
+        func.coalesce(func.sum(SettlementLedger.partner_paid), 0),
+    ).filter(
+        SettlementLedger.couple_id == couple_id,
+        SettlementLedger.user_id == user_id,
+    )
+    if start:
+        query = query.filter(SettlementLedger.month >= start)
+    if end:
+        query = query.filter(SettlementLedger.month < end)
+    return query.one()
+
+
+def _transaction_totals(db: Session, couple_id, user_id, start: date, end: date) -> Tuple[Decimal, Decimal]:
+    """Same figures from the transactions themselves, for days [start, end]"""
+    paid = func.coalesce(func.nullif(Transaction.original_amount, 0), Transaction.amount * 2)
+    return db.query(
+        func.coalesce(func.sum(paid).filter(Transaction.paid_by_user_id == Transaction.user_id), 0),
+        func.coalesce(func.sum(paid).filter(Transaction.paid_by_user_id != Transaction.user_id), 0),
+    ).filter(
+        Transaction.couple_id == couple_id,
+        Transaction.user_id == user_id,
+        Transaction.is_split == True,
+        Transaction.type == "expense",
+        Transaction.paid_by_user_id.isnot(None),
+        Transaction.date >= start,
+        Transaction.date <= end,
+    ).one()
+
+
+def settlement_totals(
+    db: Session, couple_id, user_id, start: Optional[date] = None, end: Optional[date] = None
+) -> Tuple[Decimal, Decimal]:
+    """(my_paid, partner_paid) of a member's split expenses between start and end (inclusive)
+
+    Whole months come from the ledger; only the partial months at either end
+    of the range read transactions.
+    """
+    first_full = None if start is None else (start if start.day == 1 else next_month(start))
+    end_full = None if end is None else (
+        next_month(end) if end + timedelta(days=1) == next_month(end) else month_start(end)
+    )
+
+    if first_full and end_full and first_full >= end_full:
+        # Within a month or two: no whole month in between
+        my_paid, partner_paid = _transaction_totals(db, couple_id, user_id, start, end)
+        return Decimal(my_paid), Decimal(partner_paid)
+
+    my_paid, partner_paid = _ledger_totals(db, couple_id, user_id, first_full, end_full)
+    edges = []
+    if start and start < first_full:
+        edges.append((start, first_full - timedelta(days=1)))
+    if end and end_full <= end:
+        edges.append((end_full, end))
+    for edge_start, edge_end in edges:
+        edge_my_paid, edge_partner_paid = _transaction_totals(db, couple_id, user_id, edge_start, edge_end)
+        my_paid += edge_my_paid
+        partner_paid += edge_partner_paid
+    return Decimal(my_paid), Decimal(partner_paid)
+
+
+def settlement_history(db: Session, couple_id, user_id, first_month: date) -> List[Tuple[date, Decimal, Decimal]]:
+    """(month, my_paid, partner_paid) for every month from first_month to the current one"""
+    rows = db.query(
+        SettlementLedger.month, SettlementLedger.my_paid, SettlementLedger.partner_paid
+    ).filter(
+        SettlementLedger.couple_id == couple_id,
+        SettlementLedger.user_id == user_id,
+        SettlementLedger.month >= first_month,
+    ).all()
+    by_month = {month: (my_paid, partner_paid) for month, my_paid, partner_paid in rows}
+
+    history = []
+    month, current = first_month, month_start(date.today())
+    while month <= current:
+        my_paid, partner_paid = by_month.get(month, (ZERO, ZERO))
+        history.append((month, my_paid, partner_paid))
+        month = next_month(month)
+    return history
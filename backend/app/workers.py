@@ -0,0 +1,16 @@
+import os
+
+from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """Gunicorn worker pinned to uvloop and httptools (both in uvicorn[standard])
+
+    Unlike the default "auto" mode this fails loudly if either is missing
+    instead of silently falling back to asyncio/h11.
+    """
+
+    CONFIG_KWARGS = {
+        "loop": os.environ.get("UVICORN_LOOP", "uvloop"),
+        "http": os.environ.get("UVICORN_HTTP", "httptools"),
+    }
@@ -0,0 +1,128 @@
+"""CPU time versus bytes saved for each response encoding and level
+
+Builds representative payloads from the deterministic seed data: a dashboard
+response, a 100-row transaction list page and a two-year CSV export. Each one
+is compressed with gzip, br and zstd at several levels; the CSV is also
+compressed in 16 KB chunks with a flush after each one, as the middleware does
+for streaming responses. The levels in app/core/compression.py were chosen
+from this table.
+
+Usage (from backend/):
+    python benchmarks/bench_compression.py [--repeat 50]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.exports import generate_csv_content
+from app.core.compression import AVAILABLE, Compressor, compress
+from app.tools.seed import TRANSACTION_COLUMNS, Seeder, month_range
+
+LEVELS = {"gzip": (1, 5, 6, 9), "br": (1, 4, 5, 6, 11), "zstd": (1, 3, 6, 9, 19)}
+CHUNK_SIZE = 16 * 1024
+
+
+def couple_transactions() -> list:
+    """All transactions of the first seeded couple over two years, newest first"""
+    seeder = Seeder(seed=7, couples=20, singles=0, months=month_range((2026, 9), 24))
+    couple_id = seeder.couples[0][0]
+    column = {name: i for i, name in enumerate(TRANSACTION_COLUMNS)}
+    rows = [row for row in seeder.transaction_rows() if row[column["couple_id"]] == couple_id]
+    rows.sort(key=lambda row: row[column["date"]], reverse=True)
+    return [dict(zip(TRANSACTION_COLUMNS, row)) for row in rows]
+
+
+def transaction_json(row: dict) -> dict:
+    return {
+        "id": str(row["id"]),
+        "type": row["type"],
+        "category": row["category"],
+        "amount": str(row["amount"]),
+        "description": row["description"],
+        "date": row["date"].isoformat(),
+        "is_split": row["is_split"],
+        "created_at": row["created_at"].isoformat(),
+    }
+
+
+def payloads() -> dict:
+    transactions = couple_transactions()
+    current = [row for row in transactions if row["date"] >= date(2026, 9, 1)]
+    breakdown = defaultdict(int)
+    for row in current:
+        if row["type"] == "expense":
+            breakdown[row["category"]] += row["amount"]
+    dashboard = {
+        "personal_summary": {"income": "412000", "expense": "198500", "balance": "213500"},
+        "couple_summary": {"income": "688000", "expense": "351200", "balance": "336800"},
+        "personal_budgets": [
+            {"category": category, "amount": "50000", "spent": str(spent), "percentage": round(spent / 500, 1)}
+            for category, spent in breakdown.items()
+        ],
+        "couple_budgets": [],
+        "savings": {"total": "1520000", "monthly": [{"month": f"2026-{m:02d}", "amount": str(100000 + m)} for m in range(1, 10)]},
+        "expense_breakdown": [{"category": category, "amount": str(amount)} for category, amount in breakdown.items()],
+        "monthly_trends": [{"month": f"2026-{m:02d}", "income": "688000", "expense": "351200"} for m in range(1, 13)],
+        "recent_transactions": [transaction_json(row) for row in transactions[:10]],
+    }
+    page = [transaction_json(row) for row in transactions[:100]]
+    csv_rows = [
+        [
+            row["date"].isoformat(),
+            '収入' if row["type"] == 'income' else '支出',
+            row["category"],
+            str(row["amount"]),
+            row["description"] or '',
+            'はい' if row["is_split"] else 'いいえ',
+            str(row["original_amount"]) if row["original_amount"] else '',
+        ]
+        for row in transactions
+    ]
+    export = generate_csv_content(["日付", "種類", "カテゴリ", "金額", "説明", "割り勘", "元の金額"], csv_rows)
+    return {
+        "dashboard (json)": json.dumps(dashboard, ensure_ascii=False).encode(),
+        "transactions page (json)": json.dumps(page, ensure_ascii=False).encode(),
+        "export (csv)": export.encode(),
+        "export streamed (csv)": export.encode(),
+    }
+
+
+def compress_chunked(body: bytes, encoding: str, level: int) -> bytes:
+    compressor = Compressor(encoding, level)
+    chunks = [body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+    return b"".join(compressor.compress(chunk) for chunk in chunks[:-1]) + compressor.finish(chunks[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for name, body in payloads().items():
+        print(f"\n{name}: {len(body):,} bytes")
+        print(f"{'encoding':<8} {'level':>5} {'bytes':>10} {'saved':>7} {'cpu µs':>9} {'KB saved/cpu ms':>16}")
+        fn = compress_chunked if "streamed" in name else compress
+        for encoding, levels in LEVELS.items():
+            if encoding not in AVAILABLE:
+                print(f"{encoding:<8} (not installed)")
+                continue
+            for level in levels:
+                start = time.process_time()
+                for _ in range(args.repeat):
+                    compressed = fn(body, encoding, level)
+                cpu_us = (time.process_time() - start) / args.repeat * 1e6
+                saved = len(body) - len(compressed)
+                print(
+                    f"{encoding:<8} {level:5d} {len(compressed):10,d} {saved / len(body):6.1%} "
+                    f"{cpu_us:9.0f} {saved / 1024 / (cpu_us / 1000):16.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
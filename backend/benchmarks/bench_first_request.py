@@ -0,0 +1,123 @@
+"""First-request latency of a freshly started worker, with and without warm-up
+
+Boots gunicorn with a single worker (so the first request always hits a cold
+worker) against the Postgres and Redis in .env, waits for /health and times:
+the first authenticated dashboard load, the first login, and the steady-state
+dashboard latency afterwards. Repeats for WARMUP_ENABLED=false/true.
+
+Usage (from backend/):
+    python benchmarks/bench_first_request.py [--rounds 3]
+"""
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASSWORD = "first-request-bench"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot(warmup: bool):
+    port = free_port()
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": "1",
+        "WARMUP_ENABLED": str(warmup).lower(),
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    client = httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60)
+    started = time.perf_counter()
+    while True:
+        try:
+            if client.get("/health").status_code == 200:
+                break
+        except httpx.TransportError:
+            pass
+        if time.perf_counter() - started > 60:
+            raise RuntimeError("Server did not become healthy")
+        time.sleep(0.05)
+    return server, client, time.perf_counter() - started
+
+
+def stop(server) -> None:
+    server.send_signal(signal.SIGTERM)
+    server.wait(timeout=30)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    response = fn()
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+def create_account() -> tuple:
+    """Register a throwaway user; the access token stays valid across restarts"""
+    server, client, _ = boot(warmup=True)
+    try:
+        email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+        response = client.post("/api/auth/register", json={"email": email, "password": PASSWORD, "name": "Bench"})
+        response.raise_for_status()
+        return email, response.json()["access_token"]
+    finally:
+        stop(server)
+
+
+def measure(warmup: bool, email: str, token: str) -> dict:
+    server, client, ready = boot(warmup)
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        first_dashboard = timed(lambda: client.get("/api/dashboard/data", headers=headers))
+        first_login = timed(lambda: client.post("/api/auth/login", json={"email": email, "password": PASSWORD}))
+        steady = [
+            timed(lambda: client.get("/api/dashboard/data", headers=headers))
+            for _ in range(20)
+        ]
+    finally:
+        stop(server)
+    return {
+        "ready_ms": ready * 1000,
+        "first_dashboard_ms": first_dashboard,
+        "first_login_ms": first_login,
+        "steady_dashboard_ms": statistics.median(steady),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    email, token = create_account()
+    print(f"{'warm-up':<8} {'ready':>9} {'1st dashboard':>14} {'1st login':>10} {'steady dashboard':>17}  (ms, median of {args.rounds})")
+    for warmup in (False, True):
+        rounds = [measure(warmup, email, token) for _ in range(args.rounds)]
+        row = {key: statistics.median(r[key] for r in rounds) for key in rounds[0]}
+        print(
+            f"{'on' if warmup else 'off':<8} {row['ready_ms']:9.0f} {row['first_dashboard_ms']:14.1f} "
+            f"{row['first_login_ms']:10.1f} {row['steady_dashboard_ms']:17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Latency of cheap endpoints while a burst of logins is running
+
+Runs a stripped-down ASGI app in-process with two login variants: bcrypt called
+inline in the handler (the old behaviour) and bcrypt offloaded to the bounded
+pool in app.core.passwords. Reports p50/p99 latency of a cheap endpoint that is
+polled during the login burst.
+
+Usage (from backend/, with the usual .env available):
+    python benchmarks/bench_login_latency.py [--logins 40] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.passwords import get_pwd_context, verify_and_update_password
+
+app = FastAPI()
+PASSWORD = "correct horse battery staple"
+pwd_context = get_pwd_context()
+HASHED = pwd_context.hash(PASSWORD)
+POLL_INTERVAL = 0.005
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+@app.post("/login-inline")
+async def login_inline():
+    return {"ok": pwd_context.verify(PASSWORD, HASHED)}
+
+
+@app.post("/login-offloaded")
+async def login_offloaded():
+    is_valid, _ = await verify_and_update_password(PASSWORD, HASHED)
+    return {"ok": is_valid}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, login_path: str, logins: int, concurrency: int):
+    latencies = []
+    done = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            await client.post(login_path)
+
+    async def poll():
+        # Measured from when the request was due, so event-loop stalls are included
+        while not done.is_set():
+            due = time.perf_counter() + POLL_INTERVAL
+            await asyncio.sleep(POLL_INTERVAL)
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - due) * 1000)
+
+    poller = asyncio.create_task(poll())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await poller
+
+    print(
+        f"{login_path:<18} logins/s={logins / elapsed:6.1f}  "
+        f"ping p50={statistics.median(latencies):7.2f} ms  "
+        f"p99={percentile(latencies, 99):7.2f} ms  max={max(latencies):7.2f} ms  "
+        f"(n={len(latencies)})"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/login-inline", "/login-offloaded"):
+            await run_scenario(client, path, args.logins, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
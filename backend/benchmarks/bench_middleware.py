@@ -0,0 +1,158 @@
+"""Per-request overhead of the middleware stack, before and after going pure ASGI
+
+Drives ASGI apps directly (no server, no sockets) with a browser-like request:
+session cookie, Origin, X-Forwarded-Proto/For. Every stack wraps the same
+trivial endpoint, so the difference to "bare" is the middleware overhead:
+
+  bare    the endpoint alone
+  before  fix_scheme via @app.middleware("http") (BaseHTTPMiddleware) and
+          SessionMiddleware on every request
+  after   TrustedProxyMiddleware and ScopedSessionMiddleware (OAuth paths only)
+
+Both stacks also include CORS, metrics, admission control and compression as
+configured in app.main. Rate limiting is left out (it needs Redis and is the
+same in both).
+
+Usage (from backend/):
+    python benchmarks/bench_middleware.py [--requests 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from itsdangerous import TimestampSigner
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.config import settings
+from app.core.admission import AdmissionControlMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.proxy import TrustedProxyMiddleware
+from app.core.sessions import ScopedSessionMiddleware
+
+ORIGIN = "https://kakepple.vercel.app"
+
+
+def endpoint_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/bench")
+    async def bench():
+        return {"status": "ok"}
+
+    return app
+
+
+def add_common(app: FastAPI) -> None:
+    app.add_middleware(AdmissionControlMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(
+        CORSMiddleware, allow_origins=[ORIGIN], allow_credentials=True, allow_methods=["*"], allow_headers=["*"]
+    )
+
+
+def before_app() -> FastAPI:
+    app = endpoint_app()
+
+    @app.middleware("http")
+    async def fix_scheme_middleware(request: Request, call_next):
+        forwarded_proto = request.headers.get("x-forwarded-proto")
+        if forwarded_proto == "https":
+            request.scope["scheme"] = "https"
+        response = await call_next(request)
+        return response
+
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+    app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+    add_common(app)
+    return app
+
+
+def after_app() -> FastAPI:
+    app = endpoint_app()
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+    app.add_middleware(
+        ScopedSessionMiddleware, prefix="/api/auth/google", secret_key=settings.SECRET_KEY, session_cookie="oauth_session"
+    )
+    add_common(app)
+    app.add_middleware(TrustedProxyMiddleware, trusted_proxies=settings.TRUSTED_PROXIES)
+    return app
+
+
+def request_headers() -> list:
+    # A browser that went through the Google login keeps sending its session cookie
+    cookie = TimestampSigner(settings.SECRET_KEY).sign("eyJzdGF0ZSI6ICJhYmMifQ==").decode()
+    return [
+        (b"host", b"api.kakepple.test"),
+        (b"origin", ORIGIN.encode()),
+        (b"accept-encoding", b"gzip, deflate, br, zstd"),
+        (b"cookie", f"session={cookie}; oauth_session={cookie}".encode()),
+        (b"x-forwarded-proto", b"https"),
+        (b"x-forwarded-for", b"203.0.113.7"),
+    ]
+
+
+async def call(app, headers: list) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/bench",
+        "raw_path": b"/api/bench",
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("10.0.0.2", 52000),
+        "server": ("10.0.0.1", 8000),
+    }
+
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like a server: the next message only arrives when the client disconnects
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"Unexpected status {message['status']}")
+
+    await app(scope, receive, send)
+
+
+async def bench(label: str, app, requests: int, baseline: float = None) -> float:
+    headers = request_headers()
+    for _ in range(200):  # warm-up (builds the middleware stack)
+        await call(app, headers)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, headers)
+    per_request = (time.perf_counter() - start) / requests * 1_000_000
+    overhead = f"  (+{per_request - baseline:.1f} us middleware)" if baseline is not None else ""
+    print(f"{label:<8} {per_request:8.1f} us/request{overhead}")
+    return per_request
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    baseline = await bench("bare", endpoint_app(), args.requests)
+    await bench("before", before_app(), args.requests, baseline)
+    await bench("after", after_app(), args.requests, baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Serialization micro-benchmark for list endpoints
+
+Compares FastAPI's default response_model path (validate + jsonable + stdlib json)
+with the precompiled TypeAdapter and direct row-mapper paths used by the hot
+list endpoints.
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py [--rows 1000] [--repeat 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from app.core.serialization import FastJSONResponse, model_response, orm_rows_response
+from app.schemas.transaction import TransactionResponse
+
+
+def make_rows(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            couple_id=None,
+            type="expense",
+            category="食費",
+            amount=Decimal("1280.00"),
+            description=f"スーパー {i}",
+            date=date(2026, 1, 1 + i % 28),
+            is_split=False,
+            original_amount=None,
+            paid_by_user_id=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def bench(label: str, fn, repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<40} {elapsed:8.2f} ms/op  ({len(body)} bytes)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    field = create_response_field(name="Response_get_transactions", type_=List[TransactionResponse])
+    adapter = TypeAdapter(List[TransactionResponse])
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default(response_class):
+        def run():
+            content = loop.run_until_complete(serialize_response(field=field, response_content=rows))
+            return response_class(content).body
+        return run
+
+    def precompiled_adapter():
+        return model_response(adapter, adapter.validate_python(rows, from_attributes=True)).body
+
+    def row_mapper():
+        return orm_rows_response(TransactionResponse, rows).body
+
+    print(f"Serializing {args.rows} transactions, {args.repeat} iterations")
+    baseline = bench("response_model + JSONResponse", fastapi_default(JSONResponse), args.repeat)
+    bench("response_model + FastJSONResponse", fastapi_default(FastJSONResponse), args.repeat)
+    bench("precompiled TypeAdapter", precompiled_adapter, args.repeat)
+    fast = bench("orm_rows_response (row mapper)", row_mapper, args.repeat)
+    print(f"speed-up vs. baseline: {baseline / fast:.1f}x")
+
+    assert fastapi_default(JSONResponse)() == precompiled_adapter() == row_mapper(), "outputs differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Per-request cost of access-token verification
+
+Compares a full python-jose decode + HMAC check (the previous path) with
+verify_token served from the verified-token cache. Needs the usual .env and a
+reachable Redis (the cache is bypassed when the invalidation listener is down).
+
+Usage (from backend/):
+    python benchmarks/bench_token_verify.py [--requests 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import invalidation
+from app.core.security import _decode_token, create_access_token, token_cache_stats, verify_token
+
+
+async def decode_uncached(token: str):
+    return _decode_token(token)
+
+
+async def bench(label: str, fn, token: str, requests: int) -> float:
+    await fn(token)  # warm-up
+    start = time.perf_counter()
+    for _ in range(requests):
+        await fn(token)
+    per_request = (time.perf_counter() - start) / requests * 1_000_000
+    print(f"{label:<28} {per_request:8.2f} us/request")
+    return per_request
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    if not invalidation.ensure_listener():
+        print("Redis is not reachable: verify_token will bypass its cache")
+
+    token = create_access_token("00000000-0000-0000-0000-000000000001")
+    uncached = await bench("jose decode (uncached)", decode_uncached, token, args.requests)
+    cached = await bench("verify_token (cached)", verify_token, token, args.requests)
+    print(f"speed-up: {uncached / cached:.1f}x")
+    print(f"cache: {token_cache_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
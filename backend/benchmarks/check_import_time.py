@@ -0,0 +1,91 @@
+"""Import-time budget check for app.main
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+reports the median total import time and the slowest top-level packages.
+Exits non-zero when the median exceeds the budget or when a module that is
+deliberately imported lazily (only needed by the auth endpoints, avatar
+uploads or push notifications) shows up at startup again.
+
+Target: app.main imports in under 1500 ms on a Render starter instance; the
+deferred modules (authlib + httpx, passlib) account for ~150 ms of that.
+
+Usage (from backend/, with the .env settings available):
+    python benchmarks/check_import_time.py [--runs 5] [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported on first use, never at startup
+DEFERRED_MODULES = ("authlib", "passlib", "httpx", "pywebpush", "PIL")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)$")
+
+
+def profile() -> list:
+    """(self_us, cumulative_us, module) for every module imported by app.main"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit("import app.main failed")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative, module = match.groups()
+            rows.append((int(self_us), int(cumulative), module))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    totals = []
+    per_package = defaultdict(list)
+    imported = set()
+    for _ in range(args.runs):
+        rows = profile()
+        totals.append(next(cumulative for _, cumulative, module in rows if module == "app.main") / 1000)
+        # Self times add up without double counting nested imports
+        run = defaultdict(int)
+        for self_us, _, module in rows:
+            imported.add(module)
+            run[module.split(".")[0]] += self_us
+        for package, us in run.items():
+            per_package[package].append(us / 1000)
+
+    total = statistics.median(totals)
+    print(f"import app.main: {total:.0f} ms (median of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    print(f"\n{'package':<32} {'ms':>8}")
+    slowest = sorted(per_package.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for package, samples in slowest[:args.top]:
+        print(f"{package:<32} {statistics.median(samples):8.1f}")
+
+    failures = []
+    if total > args.budget_ms:
+        failures.append(f"import time {total:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    leaked = sorted({module.split(".")[0] for module in imported} & set(DEFERRED_MODULES))
+    if leaked:
+        failures.append(f"deferred modules imported at startup: {', '.join(leaked)}")
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""End-to-end load test replaying a weighted mix of couple workloads
+
+Boots the API with gunicorn (same worker class as production) against the
+Postgres and Redis configured in .env, registers test couples through the API,
+then runs a weighted request mix at fixed concurrency. Prints per-endpoint
+p50/p95/p99 latency and throughput as JSON.
+
+Rate limiting is disabled in the booted server (the mix would otherwise trip
+the per-user buckets); use --url to target an already running deployment.
+
+Usage (from backend/):
+    python benchmarks/loadtest.py [--couples 10] [--concurrency 20] [--duration 60]
+        [--warmup 5] [--workers 2] [--etags] [--url http://host:8000] [--output result.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+from app.schemas.transaction import INCOME_CATEGORIES, VARIABLE_EXPENSE_CATEGORIES
+
+PASSWORD = "loadtest-password"
+
+# Weighted like production traffic: dashboard and lists dominate, heavy
+# reports and exports are rare
+MIX = {
+    "dashboard": 30,
+    "transactions_list": 22,
+    "transaction_create_split": 10,
+    "budget_status": 12,
+    "token_refresh": 10,
+    "report_monthly": 8,
+    "report_yearly": 5,
+    "export_csv": 3,
+}
+
+
+class VirtualUser:
+    """One member of a test couple, with its tokens and ETag cache"""
+
+    def __init__(self, email: str, tokens: dict):
+        self.email = email
+        self.access_token = tokens["access_token"]
+        self.refresh_token = tokens["refresh_token"]
+        self.etags = {}
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+# ==================== Server and Fixtures ====================
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot_server(port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "RATE_LIMIT_ENABLED": "false"}
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "app.main:app",
+            "-w", str(workers), "-k", "uvicorn.workers.UvicornWorker",
+            "--bind", f"127.0.0.1:{port}", "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become healthy")
+
+
+async def register(client: httpx.AsyncClient, name: str) -> VirtualUser:
+    email = f"loadtest-{uuid.uuid4().hex[:12]}@example.com"
+    response = await client.post(
+        "/api/auth/register", json={"email": email, "password": PASSWORD, "name": name}
+    )
+    response.raise_for_status()
+    return VirtualUser(email, response.json())
+
+
+async def create_couple(client: httpx.AsyncClient, transactions: int) -> list:
+    """Register two users, pair them and give them some history"""
+    first = await register(client, "Load Test A")
+    second = await register(client, "Load Test B")
+    invite = await client.post("/api/couples/invite", json={}, headers=first.headers)
+    invite.raise_for_status()
+    joined = await client.post(
+        "/api/couples/join", json={"invite_code": invite.json()["code"]}, headers=second.headers
+    )
+    joined.raise_for_status()
+
+    today = date.today()
+    for user in (first, second):
+        for i in range(transactions):
+            await client.post("/api/transactions/", json=random_transaction(today - timedelta(days=i * 3)),
+                              headers=user.headers)
+    return [first, second]
+
+
+def random_transaction(day: date, split: bool = False) -> dict:
+    if not split and random.random() < 0.15:
+        return {
+            "type": "income",
+            "category": random.choice(INCOME_CATEGORIES),
+            "amount": str(random.randint(50, 400) * 1000),
+            "date": day.isoformat(),
+        }
+    return {
+        "type": "expense",
+        "category": random.choice(VARIABLE_EXPENSE_CATEGORIES),
+        "amount": str(random.randint(1, 300) * 100),
+        "description": "load test",
+        "date": day.isoformat(),
+        "is_split": split or random.random() < 0.3,
+    }
+
+
+# ==================== Workload ====================
+
+async def run_operation(client: httpx.AsyncClient, user: VirtualUser, name: str, use_etags: bool) -> int:
+    today = date.today()
+    if name == "transaction_create_split":
+        response = await client.post("/api/transactions/", json=random_transaction(today, split=True),
+                                     headers=user.headers)
+        return response.status_code
+    if name == "token_refresh":
+        response = await client.post("/api/auth/refresh", json={"refresh_token": user.refresh_token})
+        if response.status_code == 200:
+            tokens = response.json()
+            user.access_token = tokens["access_token"]
+            user.refresh_token = tokens.get("refresh_token", user.refresh_token)
+        return response.status_code
+
+    scope = random.choice(("personal", "couple"))
+    path, params = {
+        "dashboard": ("/api/dashboard/data", {}),
+        "transactions_list": ("/api/transactions/", {"scope": scope, "limit": 50}),
+        "budget_status": ("/api/budgets/status/current", {"scope": scope}),
+        "report_monthly": ("/api/analytics/report/monthly",
+                           {"year": today.year, "month": today.month, "scope": scope}),
+        "report_yearly": ("/api/analytics/report/yearly", {"year": today.year, "scope": scope}),
+        "export_csv": ("/api/exports/csv", {"scope": scope}),
+    }[name]
+
+    headers = user.headers
+    cache_key = (path, tuple(sorted(params.items())))
+    if use_etags and cache_key in user.etags:
+        headers = {**headers, "If-None-Match": user.etags[cache_key]}
+    response = await client.get(path, params=params, headers=headers)
+    if use_etags and "etag" in response.headers:
+        user.etags[cache_key] = response.headers["etag"]
+    return response.status_code
+
+
+async def worker(client, users, deadline, measure_from, samples, statuses, use_etags):
+    names = list(MIX)
+    weights = list(MIX.values())
+    while time.monotonic() < deadline:
+        name = random.choices(names, weights)[0]
+        user = random.choice(users)
+        start = time.monotonic()
+        try:
+            status_code = await run_operation(client, user, name, use_etags)
+        except httpx.HTTPError:
+            status_code = 0  # Transport error or timeout
+        if start >= measure_from:
+            samples[name].append((time.monotonic() - start) * 1000)
+            statuses[name][status_code] += 1
+
+
+def percentile(ordered: list, pct: float) -> float:
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples: dict, statuses: dict, elapsed: float) -> dict:
+    endpoints = {}
+    for name in MIX:
+        latencies = sorted(samples[name])
+        if not latencies:
+            continue
+        errors = sum(count for code, count in statuses[name].items() if code == 0 or code >= 400)
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "status_codes": {str(code): count for code, count in sorted(statuses[name].items())},
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+    all_latencies = sorted(latency for values in samples.values() for latency in values)
+    total = {
+        "requests": len(all_latencies),
+        "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        "throughput_rps": round(len(all_latencies) / elapsed, 2),
+    }
+    if all_latencies:
+        total.update(
+            p50_ms=round(percentile(all_latencies, 50), 2),
+            p95_ms=round(percentile(all_latencies, 95), 2),
+            p99_ms=round(percentile(all_latencies, 99), 2),
+        )
+    return {"total": total, "endpoints": endpoints}
+
+
+async def run(args) -> dict:
+    server = None
+    base_url = args.url
+    if not base_url:
+        port = free_port()
+        server = boot_server(port, args.workers)
+        base_url = f"http://127.0.0.1:{port}"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            await wait_until_healthy(client)
+            couples = await asyncio.gather(
+                *(create_couple(client, args.transactions) for _ in range(args.couples))
+            )
+            users = [user for couple in couples for user in couple]
+
+            samples = defaultdict(list)
+            statuses = defaultdict(lambda: defaultdict(int))
+            start = time.monotonic()
+            measure_from = start + args.warmup
+            deadline = measure_from + args.duration
+            await asyncio.gather(*(
+                worker(client, users, deadline, measure_from, samples, statuses, args.etags)
+                for _ in range(args.concurrency)
+            ))
+            elapsed = time.monotonic() - measure_from
+    finally:
+        if server:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    return {
+        "config": {
+            "url": args.url or "booted",
+            "workers": None if args.url else args.workers,
+            "couples": args.couples,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "etags": args.etags,
+            "mix": MIX,
+        },
+        **summarize(samples, statuses, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="Target a running server instead of booting one")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--couples", type=int, default=10)
+    parser.add_argument("--transactions", type=int, default=30, help="Seed transactions per user")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before the run")
+    parser.add_argument("--etags", action="store_true", help="Replay ETags like a browser cache")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the request mix")
+    parser.add_argument("--output", help="Write the JSON result to a file instead of stdout")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    result = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(result + "\n")
+    else:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Gunicorn configuration, loaded automatically from the working directory.
+# Every setting can be tuned per deployment through the environment; flags on
+# the command line still take precedence.
+import os
+import shutil
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Async workers each serve many requests. Every worker has its own DB pools
+# (up to DB_POOL_SIZE + DB_MAX_OVERFLOW = 30 connections to the primary and to
+# each replica, see app/database.py), so workers x 30 must stay below
+# Postgres' max_connections (100 by default). The core count is not used as a default: in containers it
+# is usually the host's, not the CPU quota. WEB_CONCURRENCY is set by
+# Render/Heroku-style platforms.
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "app.workers.UvicornWorker"  # uvloop + httptools
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+# Longer than the proxy's idle timeout so upstream keep-alive connections get reused
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 75))
+
+# Recycle workers periodically to bound memory growth (0 disables)
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 0))
+
+# Import the app once in the master and fork it: faster worker (re)starts and
+# shared memory pages. Connections are only opened after fork (see post_fork).
+preload_app = _env_bool("GUNICORN_PRELOAD", True)
+
+# Prometheus multiprocess mode: each worker writes its samples to this
+# directory and /metrics aggregates them. It is reset here, when the master
+# loads this file, because a preloaded app imports prometheus_client right after.
+_metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+shutil.rmtree(_metrics_dir, ignore_errors=True)
+os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def post_fork(server, worker):
+    """Never share pooled DB connections inherited from a preloading master"""
+    if server.cfg.preload_app:
+        from app.database import engine, replica_engines
+
+        for database in (engine, *replica_engines):
+            database.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Drop live gauges of dead workers from the aggregate"""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
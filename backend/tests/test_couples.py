@@ -0,0 +1,97 @@
+"""Pairing through invite codes and the settlement ledger"""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.database import engine
+from app.models.couple import Couple
+from app.models.transaction import Transaction
+from app.utils.settlement import REBUILD_SQL, settlement_totals
+
+
+def test_join_with_invite_code(client, make_user, auth_headers):
+    inviter, partner, latecomer = make_user(), make_user(), make_user()
+
+    response = client.post("/api/couples/invite", json={"hours_valid": 24}, headers=auth_headers(inviter))
+    assert response.status_code in (200, 201)
+    code = response.json()["code"]
+    # Live codes are validated from Redis
+    assert security.sync_redis_client.exists(f"invite_code:{code}")
+
+    response = client.post("/api/couples/join", json={"invite_code": code}, headers=auth_headers(partner))
+    assert response.status_code == 200
+    assert response.json()["user1"]["email"] == inviter.email
+    assert not security.sync_redis_client.exists(f"invite_code:{code}")
+
+    response = client.post("/api/couples/join", json={"invite_code": code}, headers=auth_headers(latecomer))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invite code has already been used"
+
+
+def _ledger(connection) -> set:
+    rows = connection.execute(text(
+        "SELECT couple_id, user_id, month, my_paid, partner_paid FROM settlement_ledger"
+    ))
+    # Deltas leave emptied months at zero, a rebuild has no row for them
+    return {tuple(row) for row in rows if row.my_paid or row.partner_paid}
+
+
+def _assert_ledger_matches_rebuild(db, couple, members):
+    """The incrementally maintained ledger equals a full recompute"""
+    totals = [settlement_totals(db, couple.id, member.id) for member in members]
+    db.commit()  # Ends the read so the rebuild below is not blocked by it
+
+    with engine.connect() as connection, connection.begin() as transaction:
+        maintained = _ledger(connection)
+        connection.exec_driver_sql(REBUILD_SQL)
+        assert _ledger(connection) == maintained
+        with Session(bind=connection) as rebuilt:
+            assert [settlement_totals(rebuilt, couple.id, member.id) for member in members] == totals
+        transaction.rollback()
+
+
+def test_settlement_ledger_follows_transaction_changes(db, make_user):
+    payer, partner = make_user(), make_user()
+    couple = Couple(user1_id=payer.id, user2_id=partner.id)
+    db.add(couple)
+    db.commit()
+    members = (payer, partner)
+
+    def split_expense(owner, paid_by, original_amount, day):
+        return Transaction(
+            user_id=owner.id, couple_id=couple.id, type="expense", category="食費",
+            amount=original_amount / 2, original_amount=original_amount, date=day,
+            is_split=True, paid_by_user_id=paid_by.id,
+        )
+
+    groceries = split_expense(payer, payer, Decimal("3000"), date(2024, 1, 31))
+    groceries_half = split_expense(partner, payer, Decimal("3000"), date(2024, 1, 31))
+    rent = split_expense(payer, partner, Decimal("80000"), date(2024, 2, 10))
+    db.add_all([groceries, groceries_half, rent])
+    db.commit()
+    _assert_ledger_matches_rebuild(db, couple, members)
+    assert settlement_totals(db, couple.id, payer.id) == (Decimal("3000"), Decimal("80000"))
+
+    groceries.original_amount, groceries.amount = Decimal("5000"), Decimal("2500")
+    db.commit()
+    _assert_ledger_matches_rebuild(db, couple, members)
+
+    # Moves the entry from the January row to the February one
+    groceries.date = date(2024, 2, 1)
+    db.commit()
+    _assert_ledger_matches_rebuild(db, couple, members)
+    assert settlement_totals(db, couple.id, payer.id, date(2024, 1, 1), date(2024, 1, 31)) == (0, 0)
+
+    rent.paid_by_user_id = payer.id
+    db.commit()
+    _assert_ledger_matches_rebuild(db, couple, members)
+    assert settlement_totals(db, couple.id, payer.id) == (Decimal("85000"), 0)
+
+    db.delete(groceries_half)
+    db.delete(groceries)
+    db.commit()
+    _assert_ledger_matches_rebuild(db, couple, members)
+    assert settlement_totals(db, couple.id, partner.id) == (0, 0)
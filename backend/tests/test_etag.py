@@ -0,0 +1,82 @@
+"""Conditional GET: ETags from Redis data versions and cached couple membership"""
+from datetime import date
+
+from sqlalchemy import create_engine, event
+
+from app.core import security
+from app.core.dependencies import couple_cache_key
+from app.core.query_stats import track_queries
+from app.core.replicas import get_read_engine
+from app.database import engine
+from app.main import app
+from app.models.couple import Couple
+
+DASHBOARD = "/api/dashboard/data"
+
+
+def test_matching_etag_answers_304_without_queries(client, user, auth_headers):
+    headers = auth_headers(user)
+    response = client.get(DASHBOARD, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    with track_queries() as stats:
+        response = client.get(DASHBOARD, headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    # The 200 was compressed, which weakens its ETag
+    assert etag.endswith(response.headers["ETag"])
+    assert stats.count == 0
+
+
+def test_partner_expense_changes_etag(client, db, make_user, auth_headers):
+    payer, partner = make_user(), make_user()
+    db.add(Couple(user1_id=payer.id, user2_id=partner.id))
+    db.commit()
+    partner_headers = auth_headers(partner)
+    etag = client.get(DASHBOARD, headers=partner_headers).headers["ETag"]
+
+    response = client.post("/api/transactions/", headers=auth_headers(payer), json={
+        "type": "expense", "category": "食費", "amount": "3000",
+        "date": date.today().isoformat(), "is_split": True,
+    })
+    assert response.status_code == 200
+
+    response = client.get(DASHBOARD, headers={**partner_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_joining_a_couple_changes_etag(client, make_user, auth_headers):
+    inviter, joiner = make_user(), make_user()
+    joiner_headers = auth_headers(joiner)
+    # Caches the joiner as single
+    etag = client.get(DASHBOARD, headers=joiner_headers).headers["ETag"]
+
+    code = client.post("/api/couples/invite", json={}, headers=auth_headers(inviter)).json()["code"]
+    assert client.post("/api/couples/join", json={"invite_code": code}, headers=joiner_headers).status_code == 200
+
+    response = client.get(DASHBOARD, headers={**joiner_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_routed_get_never_checks_out_the_primary(client, user, auth_headers):
+    # A second engine on the same database stands in for a caught-up replica
+    replica = create_engine(engine.url)
+    app.dependency_overrides[get_read_engine] = lambda: replica
+    headers = auth_headers(user)
+    client.get(DASHBOARD, headers=headers)  # Warms the user cache
+
+    checkouts = []
+    listener = lambda *args: checkouts.append(args)  # noqa: E731
+    event.listen(engine, "checkout", listener)
+    try:
+        security.sync_redis_client.delete(couple_cache_key(user.id))
+        assert client.get(DASHBOARD, headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "checkout", listener)
+        app.dependency_overrides.clear()
+        replica.dispose()
+
+    assert checkouts == []
@@ -0,0 +1,25 @@
+"""X-Forwarded-* handling with the default TRUSTED_PROXIES"""
+import asyncio
+
+from app.config import settings
+from app.core.proxy import TrustedProxyMiddleware
+
+
+def forwarded_client(peer: str, forwarded_for: str) -> str:
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen.update(scope)
+
+    middleware = TrustedProxyMiddleware(app, trusted_proxies=settings.TRUSTED_PROXIES)
+    scope = {"type": "http", "client": (peer, 1234), "headers": [(b"x-forwarded-for", forwarded_for.encode())]}
+    asyncio.run(middleware(scope, None, None))
+    return seen["client"][0]
+
+
+def test_nginx_on_the_docker_network_is_trusted():
+    assert forwarded_client("172.18.0.5", "198.51.100.7") == "198.51.100.7"
+
+
+def test_direct_clients_cannot_spoof_their_address():
+    assert forwarded_client("203.0.113.9", "198.51.100.7") == "203.0.113.9"
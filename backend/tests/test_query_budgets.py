@@ -0,0 +1,65 @@
+"""Query-count budgets of the endpoints that used to issue one query per row"""
+from datetime import date
+from decimal import Decimal
+
+from app.models.budget import Budget
+from app.models.couple import Couple
+from app.models.transaction import Transaction
+
+
+def test_get_budgets(client, db, user, auth_headers, max_queries):
+    today = date.today()
+    for category in ("食費", "日用品", "交通費"):
+        db.add(Budget(
+            user_id=user.id, scope="personal", budget_type="category", category=category,
+            amount=Decimal("30000"), year=today.year, month=today.month,
+        ))
+    db.commit()
+
+    headers = auth_headers(user)
+    with max_queries("get_budgets"):
+        response = client.get("/api/budgets/", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+
+def test_list_couples(client, db, admin, make_user, auth_headers, max_queries):
+    for _ in range(6):
+        db.add(Couple(user1_id=make_user().id, user2_id=make_user().id))
+    db.commit()
+
+    headers = auth_headers(admin)
+    client.get("/api/admin/couples?limit=1", headers=headers)  # Caches the admin user
+    counts = []
+    for limit in (2, 5):
+        with max_queries("list_couples") as stats:
+            response = client.get(f"/api/admin/couples?limit={limit}", headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()["couples"]) == limit
+        counts.append(stats.count)
+
+    # Partners are joined into the page query, not loaded per row
+    assert counts[0] == counts[1]
+
+
+def test_list_all_transactions(client, db, admin, make_user, auth_headers, max_queries):
+    for _ in range(6):
+        db.add(Transaction(
+            user_id=make_user().id, type="expense", category="食費",
+            amount=Decimal("1200"), date=date.today(),
+        ))
+    db.commit()
+
+    headers = auth_headers(admin)
+    client.get("/api/admin/transactions?limit=1", headers=headers)  # Caches the admin user
+    counts = []
+    for limit in (2, 5):
+        with max_queries("list_all_transactions") as stats:
+            response = client.get(f"/api/admin/transactions?limit={limit}", headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()["transactions"]) == limit
+        counts.append(stats.count)
+
+    # The owner comes from the joined rows, not one lookup per transaction
+    assert counts[0] == counts[1]
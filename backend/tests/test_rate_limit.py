@@ -0,0 +1,71 @@
+"""Redis token-bucket limiter, driven through the middleware"""
+import time
+
+import pytest
+
+from app.config import settings
+from app.core import rate_limit
+from app.core.rate_limit import Policy
+from app.core.security import token_cache_stats, token_subject
+
+ANONYMOUS = "/api/auth/me"
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    """Enable the limiter with an anonymous bucket of `limit` requests per `window` seconds"""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+
+    def limit(requests: int, window: int) -> None:
+        monkeypatch.setattr(rate_limit, "IP_POLICY", Policy("ip", requests, window))
+
+    return limit
+
+
+def test_empty_bucket_answers_429_with_retry_after(client, limited):
+    limited(2, 60)
+
+    remaining = [client.get(ANONYMOUS).headers["RateLimit-Remaining"] for _ in range(2)]
+    assert remaining == ["1", "0"]
+
+    response = client.get(ANONYMOUS)
+    assert response.status_code == 429
+    # One token refills every 30 seconds
+    assert response.headers["Retry-After"] == "30"
+    assert response.headers["RateLimit-Policy"] == "2;w=60"
+
+
+def test_bucket_refills_over_time(client, limited):
+    limited(2, 1)
+
+    for _ in range(2):
+        assert client.get(ANONYMOUS).status_code != 429
+    assert client.get(ANONYMOUS).status_code == 429
+
+    time.sleep(0.6)  # Refills 1.2 tokens
+    assert client.get(ANONYMOUS).status_code != 429
+
+
+def test_fails_open_when_redis_errors(client, limited, monkeypatch):
+    limited(1, 60)
+
+    def unavailable():
+        async def script(keys, args):
+            raise ConnectionError("Redis is down")
+        return script
+
+    monkeypatch.setattr(rate_limit, "_get_script", unavailable)
+
+    for _ in range(3):
+        response = client.get(ANONYMOUS)
+        assert response.status_code != 429
+        assert "RateLimit-Remaining" not in response.headers
+
+
+def test_token_subject_leaves_token_cache_stats_alone(user, auth_headers):
+    token = auth_headers(user)["Authorization"].split()[1]
+    before = token_cache_stats()
+
+    assert token_subject(token) == str(user.id)
+    assert token_subject(token) == str(user.id)
+    assert token_cache_stats() == before
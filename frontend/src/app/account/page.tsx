@@ -139,9 +139,9 @@ export default function AccountPage() {
 
   const getAvatarUrl = () => {
     if (!localUser?.picture_url) return null;
-    // If it's a local upload, prepend API URL
+    // If it's a local upload, prepend API URL (large variant for this page)
     if (localUser.picture_url.startsWith('/uploads/')) {
-      return `${API_URL}${localUser.picture_url}`;
+      return `${API_URL}${localUser.picture_variants?.['256.webp'] ?? localUser.picture_url}`;
     }
     // External URL (e.g., Google)
     return localUser.picture_url;
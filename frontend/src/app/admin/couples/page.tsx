@@ -14,10 +14,15 @@ export default function AdminCouplesPage() {
   const [user, setUser] = useState<User | null>(null);
   const [couples, setCouples] = useState<AdminCouple[]>([]);
   const [total, setTotal] = useState(0);
-  const [offset, setOffset] = useState(0);
+  // Start cursor of every page visited so far; the last one is the current page
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [totalEstimated, setTotalEstimated] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const limit = 20;
+  const cursor = cursors[cursors.length - 1];
+  const offset = (cursors.length - 1) * limit;
 
   useEffect(() => {
     fetchCurrentUser();
@@ -27,7 +32,7 @@ export default function AdminCouplesPage() {
     if (user?.is_admin) {
       fetchCouples();
     }
-  }, [user, offset]);
+  }, [user, cursor]);
 
   const fetchCurrentUser = async () => {
     try {
@@ -44,9 +49,11 @@ export default function AdminCouplesPage() {
   const fetchCouples = async () => {
     try {
       setLoading(true);
-      const res = await adminApi.listCouples({ limit, offset });
+      const res = await adminApi.listCouples({ limit, cursor: cursor ?? undefined });
       setCouples(res.data.couples);
       setTotal(res.data.total);
+      setTotalEstimated(res.data.total_estimated);
+      setNextCursor(res.data.next_cursor);
       setLoading(false);
     } catch (error: any) {
       setError('カップル一覧の取得に失敗しました');
@@ -75,7 +82,7 @@ export default function AdminCouplesPage() {
       <div className="mb-8 flex justify-between items-center">
         <div>
           <h1 className="text-3xl font-bold text-gray-900">カップル一覧</h1>
-          <p className="text-gray-600 mt-2">全 {total} カップル</p>
+          <p className="text-gray-600 mt-2">全 {totalEstimated ? '約' : ''}{total} カップル</p>
         </div>
         <Link href="/admin">
           <Button variant="outline">ダッシュボードに戻る</Button>
@@ -134,22 +141,22 @@ export default function AdminCouplesPage() {
           )}
 
           {/* Pagination */}
-          {total > limit && (
+          {(nextCursor || cursors.length > 1) && (
             <div className="flex justify-center gap-2 mt-6">
               <Button
                 variant="outline"
-                onClick={() => setOffset(Math.max(0, offset - limit))}
-                disabled={offset === 0}
+                onClick={() => setCursors(cursors.slice(0, -1))}
+                disabled={cursors.length === 1}
               >
                 前へ
               </Button>
               <span className="py-2 px-4 text-sm text-gray-600">
-                {offset + 1} - {Math.min(offset + limit, total)} / {total}
+                {offset + 1} - {offset + couples.length} / {totalEstimated ? '約' : ''}{total}
               </span>
               <Button
                 variant="outline"
-                onClick={() => setOffset(offset + limit)}
-                disabled={offset + limit >= total}
+                onClick={() => nextCursor && setCursors([...cursors, nextCursor])}
+                disabled={!nextCursor}
               >
                 次へ
               </Button>
@@ -14,11 +14,16 @@ export default function AdminTransactionsPage() {
   const [user, setUser] = useState<User | null>(null);
   const [transactions, setTransactions] = useState<AdminTransaction[]>([]);
   const [total, setTotal] = useState(0);
-  const [offset, setOffset] = useState(0);
+  // Start cursor of every page visited so far; the last one is the current page
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [totalEstimated, setTotalEstimated] = useState(false);
   const [typeFilter, setTypeFilter] = useState<string>('');
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const limit = 20;
+  const cursor = cursors[cursors.length - 1];
+  const offset = (cursors.length - 1) * limit;
 
   useEffect(() => {
     fetchCurrentUser();
@@ -28,7 +33,7 @@ export default function AdminTransactionsPage() {
     if (user?.is_admin) {
       fetchTransactions();
     }
-  }, [user, offset, typeFilter]);
+  }, [user, cursor, typeFilter]);
 
   const fetchCurrentUser = async () => {
     try {
@@ -47,11 +52,13 @@ export default function AdminTransactionsPage() {
       setLoading(true);
       const res = await adminApi.listTransactions({
         limit,
-        offset,
+        cursor: cursor ?? undefined,
         type: typeFilter || undefined,
       });
       setTransactions(res.data.transactions);
       setTotal(res.data.total);
+      setTotalEstimated(res.data.total_estimated);
+      setNextCursor(res.data.next_cursor);
       setLoading(false);
     } catch (error: any) {
       setError('トランザクション一覧の取得に失敗しました');
@@ -87,7 +94,7 @@ export default function AdminTransactionsPage() {
       <div className="mb-8 flex justify-between items-center">
         <div>
           <h1 className="text-3xl font-bold text-gray-900">トランザクション一覧</h1>
-          <p className="text-gray-600 mt-2">全 {total} 件</p>
+          <p className="text-gray-600 mt-2">全 {totalEstimated ? '約' : ''}{total} 件</p>
         </div>
         <Link href="/admin">
           <Button variant="outline">ダッシュボードに戻る</Button>
@@ -98,19 +105,19 @@ export default function AdminTransactionsPage() {
       <div className="mb-6 flex gap-2">
         <Button
           variant={typeFilter === '' ? 'default' : 'outline'}
-          onClick={() => { setTypeFilter(''); setOffset(0); }}
+          onClick={() => { setTypeFilter(''); setCursors([null]); }}
         >
           すべて
         </Button>
         <Button
           variant={typeFilter === 'income' ? 'default' : 'outline'}
-          onClick={() => { setTypeFilter('income'); setOffset(0); }}
+          onClick={() => { setTypeFilter('income'); setCursors([null]); }}
         >
           収入
         </Button>
         <Button
           variant={typeFilter === 'expense' ? 'default' : 'outline'}
-          onClick={() => { setTypeFilter('expense'); setOffset(0); }}
+          onClick={() => { setTypeFilter('expense'); setCursors([null]); }}
         >
           支出
         </Button>
@@ -183,22 +190,22 @@ export default function AdminTransactionsPage() {
           )}
 
           {/* Pagination */}
-          {total > limit && (
+          {(nextCursor || cursors.length > 1) && (
             <div className="flex justify-center gap-2 mt-6">
               <Button
                 variant="outline"
-                onClick={() => setOffset(Math.max(0, offset - limit))}
-                disabled={offset === 0}
+                onClick={() => setCursors(cursors.slice(0, -1))}
+                disabled={cursors.length === 1}
               >
                 前へ
               </Button>
               <span className="py-2 px-4 text-sm text-gray-600">
-                {offset + 1} - {Math.min(offset + limit, total)} / {total}
+                {offset + 1} - {offset + transactions.length} / {totalEstimated ? '約' : ''}{total}
               </span>
               <Button
                 variant="outline"
-                onClick={() => setOffset(offset + limit)}
-                disabled={offset + limit >= total}
+                onClick={() => nextCursor && setCursors([...cursors, nextCursor])}
+                disabled={!nextCursor}
               >
                 次へ
               </Button>
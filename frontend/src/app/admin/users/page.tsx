@@ -16,13 +16,18 @@ export default function AdminUsersPage() {
   const [user, setUser] = useState<User | null>(null);
   const [users, setUsers] = useState<AdminUser[]>([]);
   const [total, setTotal] = useState(0);
-  const [offset, setOffset] = useState(0);
+  // Start cursor of every page visited so far; the last one is the current page
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [totalEstimated, setTotalEstimated] = useState(false);
   const [search, setSearch] = useState('');
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [editingUser, setEditingUser] = useState<AdminUser | null>(null);
   const [showDeleteConfirm, setShowDeleteConfirm] = useState<string | null>(null);
   const limit = 20;
+  const cursor = cursors[cursors.length - 1];
+  const offset = (cursors.length - 1) * limit;
 
   useEffect(() => {
     fetchCurrentUser();
@@ -32,7 +37,7 @@ export default function AdminUsersPage() {
     if (user?.is_admin) {
       fetchUsers();
     }
-  }, [user, offset, search]);
+  }, [user, cursor, search]);
 
   const fetchCurrentUser = async () => {
     try {
@@ -49,9 +54,11 @@ export default function AdminUsersPage() {
   const fetchUsers = async () => {
     try {
       setLoading(true);
-      const res = await adminApi.listUsers({ limit, offset, search: search || undefined });
+      const res = await adminApi.listUsers({ limit, cursor: cursor ?? undefined, search: search || undefined });
       setUsers(res.data.users);
       setTotal(res.data.total);
+      setTotalEstimated(res.data.total_estimated);
+      setNextCursor(res.data.next_cursor);
       setLoading(false);
     } catch (error: any) {
       setError('ユーザー一覧の取得に失敗しました');
@@ -61,7 +68,7 @@ export default function AdminUsersPage() {
 
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault();
-    setOffset(0);
+    setCursors([null]);
     fetchUsers();
   };
 
@@ -108,7 +115,7 @@ export default function AdminUsersPage() {
       <div className="mb-8 flex justify-between items-center">
         <div>
           <h1 className="text-3xl font-bold text-gray-900">ユーザー管理</h1>
-          <p className="text-gray-600 mt-2">全 {total} ユーザー</p>
+          <p className="text-gray-600 mt-2">全 {totalEstimated ? '約' : ''}{total} ユーザー</p>
         </div>
         <Link href="/admin">
           <Button variant="outline">ダッシュボードに戻る</Button>
@@ -129,7 +136,7 @@ export default function AdminUsersPage() {
           {search && (
             <Button type="button" variant="outline" onClick={() => {
               setSearch('');
-              setOffset(0);
+              setCursors([null]);
             }}>
               クリア
             </Button>
@@ -258,22 +265,22 @@ export default function AdminUsersPage() {
           )}
 
           {/* Pagination */}
-          {total > limit && (
+          {(nextCursor || cursors.length > 1) && (
             <div className="flex justify-center gap-2 mt-6">
               <Button
                 variant="outline"
-                onClick={() => setOffset(Math.max(0, offset - limit))}
-                disabled={offset === 0}
+                onClick={() => setCursors(cursors.slice(0, -1))}
+                disabled={cursors.length === 1}
               >
                 前へ
               </Button>
               <span className="py-2 px-4 text-sm text-gray-600">
-                {offset + 1} - {Math.min(offset + limit, total)} / {total}
+                {offset + 1} - {offset + users.length} / {totalEstimated ? '約' : ''}{total}
               </span>
               <Button
                 variant="outline"
-                onClick={() => setOffset(offset + limit)}
-                disabled={offset + limit >= total}
+                onClick={() => nextCursor && setCursors([...cursors, nextCursor])}
+                disabled={!nextCursor}
               >
                 次へ
               </Button>
@@ -173,6 +173,8 @@ export const coupleApi = {
     start_date?: string;
     end_date?: string;
   }) => api.get('/api/couples/settlement', { params }),
+  getSettlementHistory: (months: number = 12) =>
+    api.get('/api/couples/settlement/history', { params: { months } }),
 };
 
 // Transaction endpoints
@@ -371,8 +373,10 @@ export interface AdminUserUpdate {
 export interface UserListResponse {
   users: AdminUser[];
   total: number;
+  total_estimated: boolean;
   limit: number;
   offset: number;
+  next_cursor: string | null;
 }
 
 export interface AdminCouple {
@@ -387,8 +391,10 @@ export interface AdminCouple {
 export interface CoupleListResponse {
   couples: AdminCouple[];
   total: number;
+  total_estimated: boolean;
   limit: number;
   offset: number;
+  next_cursor: string | null;
 }
 
 export interface AdminTransaction {
@@ -406,8 +412,10 @@ export interface AdminTransaction {
 export interface TransactionListResponse {
   transactions: AdminTransaction[];
   total: number;
+  total_estimated: boolean;
   limit: number;
   offset: number;
+  next_cursor: string | null;
 }
 
 export interface AdminStats {
@@ -416,8 +424,11 @@ export interface AdminStats {
   total_transactions: number;
   users_this_month: number;
   transactions_this_month: number;
-  total_income: number;
-  total_expense: number;
+  // null until the periodic refresh has run (estimated totals)
+  total_income: number | null;
+  total_expense: number | null;
+  estimated: boolean;
+  refreshed_at: string | null;
 }
 
 // Recurring transaction types
@@ -482,7 +493,7 @@ export const adminApi = {
   getStats: () => api.get<AdminStats>('/api/admin/stats'),
 
   // User management
-  listUsers: (params?: { limit?: number; offset?: number; search?: string }) =>
+  listUsers: (params?: { limit?: number; offset?: number; cursor?: string; search?: string }) =>
     api.get<UserListResponse>('/api/admin/users', { params }),
   getUser: (userId: string) => api.get<AdminUser>(`/api/admin/users/${userId}`),
   updateUser: (userId: string, data: AdminUserUpdate) =>
@@ -490,13 +501,14 @@ export const adminApi = {
   deleteUser: (userId: string) => api.delete(`/api/admin/users/${userId}`),
 
   // Couple management
-  listCouples: (params?: { limit?: number; offset?: number }) =>
+  listCouples: (params?: { limit?: number; offset?: number; cursor?: string }) =>
     api.get<CoupleListResponse>('/api/admin/couples', { params }),
 
   // Transaction management
   listTransactions: (params?: {
     limit?: number;
     offset?: number;
+    cursor?: string;
     user_id?: string;
     type?: string;
   }) => api.get<TransactionListResponse>('/api/admin/transactions', { params }),
@@ -3,6 +3,8 @@ export interface User {
   email: string;
   name: string | null;
   picture_url: string | null;
+  // Uploaded avatars only: every size/format, keyed like "256.webp"
+  picture_variants?: Record<string, string> | null;
   is_admin: boolean;
   created_at: string;
   updated_at: string;
@@ -47,6 +49,10 @@ export interface SettlementData {
   i_pay_partner: boolean;
 }
 
+export interface SettlementMonth extends SettlementData {
+  month: string;
+}
+
 export interface TransactionSummary {
   total_income: string;
   total_expense: string;